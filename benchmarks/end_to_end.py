@@ -0,0 +1,128 @@
+# -*- coding: utf-8
+
+"""
+End-to-end benchmark of the Hegelbach agrivoltaics and the Tibnine wastewater biogas models.
+Every model is run for hourly horizons of 1 week, 1 year and 5 years, each run in a fresh Python
+process, and the stages are timed separately:
+- build: input processing and energy system (the build functions of hegelbach_model.py and
+  tibnine_model.py)
+- propagate: flow propagation of owefe.simulation (solves the Hegelbach system without an
+  optimization model)
+- model: solph.Model
+- solve: the LP with CBC
+- results: solph.processing.results and meta_results
+- post-process: the flow sums of all buses (owefe.scenario_store.flow_sums)
+and the peak memory (RSS) of the run is reported. The results are checked against the baselines by
+benchmarks/suite.py.
+
+Run from the repository root (CBC on the PATH):
+    python benchmarks/end_to_end.py             # all models and horizons
+    python benchmarks/end_to_end.py tibnine 1Y  # one run, printed as JSON
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# example directory, module of the build function and start of every model
+MODELS = {
+    "hegelbach": ("agrivoltaics hegelbach", "hegelbach_model", "2018-01-01"),
+    "tibnine": ("wastewater biogas tibnine", "tibnine_model", "2020-01-01"),
+}
+HORIZONS = ("1W", "1Y", "5Y")
+
+
+def run_model(model, horizon, solver="cbc"):
+    # runs all stages of one model in this process, returns {stage: seconds} and the peak RSS [MB]
+    directory, module, start = MODELS[model]
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+    sys.path.insert(0, os.path.join(ROOT, "examples", directory))
+    build = __import__(module).build
+    from oemof import solph
+    from owefe.scenario_store import flow_sums
+    from owefe.scenarios import make_timeindex
+    from owefe.simulation import propagate_flows
+
+    timings = {}
+    clock = time.perf_counter()
+
+    def stage(name):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[name] = now - clock
+        clock = now
+
+    timeindex = make_timeindex(start, horizon, "1h")
+    energysystem = build(timeindex)
+    stage("build")
+    propagate_flows(energysystem)
+    stage("propagate")
+    optimization_model = solph.Model(energysystem)
+    stage("model")
+    optimization_model.solve(solver=solver)
+    stage("solve")
+    results = solph.processing.results(optimization_model)
+    solph.processing.meta_results(optimization_model)
+    stage("results")
+    flow_sums(results)
+    stage("post-process")
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"time_steps": len(timeindex), "timings": timings, "peak_rss": peak_rss}
+
+
+def run(models=tuple(MODELS), horizons=HORIZONS, pattern=None, solver="cbc"):
+
+    r"""
+    Runs the models for the horizons, each in a fresh Python process
+    ----
+    Parameters
+    ----------
+    models: names of the models (keys of MODELS)
+    horizons: model horizons, see owefe.scenarios.make_timeindex
+    pattern: only run the benchmarks whose name contains this string
+    solver: LP solver
+
+    Returns
+    -------
+    timings : dict: {"end_to_end.<model>[<horizon>].<stage>": seconds,
+         "end_to_end.<model>[<horizon>].peak_rss": MB}
+
+    """
+    timings = {}
+    for model in models:
+        for horizon in horizons:
+            name = "end_to_end.{0}[{1}]".format(model, horizon)
+            if pattern is not None and pattern not in name:
+                continue
+            command = [sys.executable, os.path.abspath(__file__), model, horizon,
+                       "--solver", solver]
+            output = subprocess.run(command, check=True, stdout=subprocess.PIPE,
+                                    universal_newlines=True).stdout
+            run_result = json.loads(output.splitlines()[-1])
+            for stage, seconds in run_result["timings"].items():
+                timings["{0}.{1}".format(name, stage)] = seconds
+            timings["{0}.peak_rss".format(name)] = run_result["peak_rss"]
+    return timings
+
+
+def main(argv):
+    if len(argv) >= 2:
+        solver = argv[argv.index("--solver") + 1] if "--solver" in argv else "cbc"
+        # the solver output goes to stderr, the last line of stdout is the result
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        run_result = run_model(argv[0], argv[1], solver)
+        sys.stdout = stdout
+        print(json.dumps(run_result))
+        return
+    print(f"{'benchmark':<50}{'value':>12}")
+    for name, value in run().items():
+        unit = "MB" if name.endswith("peak_rss") else "s"
+        print(f"{name:<50}{value:>10.3f} {unit}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8
+
+"""
+Benchmark of the input normalization shared by the spec functions (src/owefe/specs/timeseries.py).
+For list, np.ndarray, pd.Series and xarray.DataArray inputs of one hourly year it reports
+- whether the normalized array shares memory with the input (zero-copy),
+- the peak memory allocated by each kernel call relative to the size of its result
+  (1.0 means the result is the only full-size allocation, bool masks add 0.125 each),
+- the run time of each kernel call.
+
+Run from the repository root:
+    python benchmarks/input_normalization.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import owefe.specs.photovoltaic_panel as photovoltaic_panel  # noqa: E402
+import owefe.specs.plant as plant  # noqa: E402
+from owefe.specs.timeseries import to_array  # noqa: E402
+
+n = 8760
+
+
+def make_inputs(values):
+    # the same float64 buffer wrapped as every supported input type (the list is a copy)
+    index = pd.date_range("1/1/2018", periods=len(values), freq="h")
+    return {
+        "list": values.tolist(),
+        "ndarray": values,
+        "pd.Series": pd.Series(values, index=index, copy=False),
+        "DataArray": xr.DataArray(values, coords={"time": index}, dims="time"),
+    }
+
+
+def peak_ratio(call, nbytes):
+    # peak traced allocation of one call relative to the size of its result
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / nbytes
+
+
+def main():
+    rng = np.random.default_rng(42)
+    t_air = make_inputs(rng.normal(10, 8, n))
+    t_max = make_inputs(rng.normal(30, 8, n))
+    ghi = make_inputs(np.clip(rng.normal(150, 200, n), 0, None))
+    et_o = make_inputs(-np.abs(rng.normal(2e-4, 1e-4, n)))
+    vwc = make_inputs(rng.normal(0.35, 0.03, n))
+
+    kernels = {
+        "calc_te": lambda kind: plant.calc_te(t_air[kind], t_opt=15, t_base=0, RUE=1.24),
+        "calc_hi": lambda kind: plant.calc_hi(t_max[kind], t_heat=34, t_ext=45),
+        "calc_arid": lambda kind: plant.calc_arid(et_o[kind], vwc[kind], s_water=0.4, rzd=1),
+        "calc_pv_te": lambda kind: photovoltaic_panel.calc_pv_te(
+            t_air[kind], ghi[kind], p_rpv=270, r_ref=1000, n_t=-0.0037, t_c_ref=25, noct=48),
+    }
+
+    print(f"{'input':<11}{'zero-copy':>10}")
+    for kind, series in t_air.items():
+        print(f"{kind:<11}{str(np.shares_memory(to_array(series, 't_air'), t_air['ndarray'])):>10}")
+
+    print()
+    print(f"{'kernel':<11}{'input':<11}{'type out':<11}{'peak/result':>12}{'time [µs]':>11}")
+    for name, kernel in kernels.items():
+        for kind in ("ndarray", "pd.Series", "DataArray", "list"):
+            result = kernel(kind)
+            ratio = peak_ratio(lambda: kernel(kind), n * 8)
+            seconds = min(timeit.repeat(lambda: kernel(kind), number=10, repeat=5)) / 10
+            print(f"{name:<11}{kind:<11}{type(result).__name__:<11}{ratio:>12.2f}"
+                  f"{seconds * 1e6:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8
+
+"""
+Benchmark of the spec kernels (plant, photovoltaic panel, digester, constructed wetland, digester
+demand) for hourly series of 1, 10 and 100 years (8 760, 87 600 and 876 000 time steps). The
+digester kernels compute one design per time step (a sweep over a retention time series), the other
+kernels take the synthetic weather and flow series of the Hegelbach and Tibnine case studies. Every
+kernel is timed as the best of several repeats; the results are checked against the baselines by
+benchmarks/suite.py.
+
+Run from the repository root:
+    python benchmarks/kernels.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import owefe.digester_demand as digester_demand  # noqa: E402
+import owefe.specs.constructedwetlands as constructedwetlands  # noqa: E402
+import owefe.specs.digester_CSTR as digester_CSTR  # noqa: E402
+import owefe.specs.photovoltaic_panel as photovoltaic_panel  # noqa: E402
+import owefe.specs.plant as plant  # noqa: E402
+
+SIZES = (8760, 87600, 876000)
+
+# parameters of the Hegelbach wheat and pv modules and of the Tibnine feedstock
+WHEAT = {"t_base": 0, "t_opt": 15, "RUE": 1.24, "t_heat": 34, "t_ext": 45, "s_water": 0.4, "rzd": 1}
+PV_MODULE = {"p_rpv": 270, "r_ref": 1000, "n_t": -0.0037, "t_c_ref": 25, "noct": 48}
+FEEDSTOCK = {"design_mass_flow": 1100, "sludge_density": 997, "sludge_specific_gravity": 1.02,
+             "dry_solid_concentration": 0.15, "volatile_solid_concentration": 0.7,
+             "biomethane_potential": 0.3403}
+
+
+def synthetic_inputs(n, seed=42):
+    # hourly series with seasonal and daily cycles covering all kernel branches
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n)
+    index = pd.date_range("1/1/2018", periods=n, freq="h")
+    season = np.cos(2 * np.pi * hours / 8760)
+    day = np.cos(2 * np.pi * hours / 24)
+    t_air = pd.Series(10 - 12 * season - 6 * day + rng.normal(0, 3, n), index=index)
+    flow = pd.Series(1100 * (1 + 0.2 * season) + rng.normal(0, 50, n), index=index).clip(lower=1)
+    return {
+        "t_air": t_air,
+        "t_max": t_air.resample("D").max().reindex(index, method="ffill") + 20,
+        "ghi": pd.Series(np.clip(-600 * day * (1 - 0.5 * season) + rng.normal(0, 50, n), 0, None),
+                         index=index),
+        "et_o": pd.Series(-np.abs(2e-4 * (1 - day) + rng.normal(0, 5e-5, n)) - 1e-6, index=index),
+        "vwc": pd.Series(0.35 + 0.05 * season + rng.normal(0, 0.01, n), index=index),
+        "influent": flow,
+        "effluent": flow * 0.95,
+        "retention_time": 20 + 10 * (1 + season),
+    }
+
+
+def cases(inputs):
+    # name: callable of one kernel call
+    return {
+        "plant.calc_te": lambda: plant.calc_te(inputs["t_air"], WHEAT["t_opt"], WHEAT["t_base"],
+                                               WHEAT["RUE"]),
+        "plant.calc_hi": lambda: plant.calc_hi(inputs["t_max"], WHEAT["t_heat"], WHEAT["t_ext"]),
+        "plant.calc_arid": lambda: plant.calc_arid(inputs["et_o"], inputs["vwc"], WHEAT["s_water"],
+                                                   WHEAT["rzd"]),
+        "plant.calc_growth": lambda: plant.calc_growth(inputs["t_air"], inputs["t_max"],
+                                                       inputs["et_o"], inputs["vwc"], **WHEAT),
+        "photovoltaic_panel.calc_pv_te": lambda: photovoltaic_panel.calc_pv_te(
+            inputs["t_air"], inputs["ghi"], **PV_MODULE),
+        "digester_CSTR.sweep": lambda: digester_CSTR.Digester.sweep(
+            retention_time=inputs["retention_time"], **FEEDSTOCK),
+        "constructedwetlands.calc_effluent_series":
+            lambda: constructedwetlands.calc_effluent_series(inputs["influent"],
+                                                             inputs["effluent"], window=96),
+        "digester_demand.calc_heat_demand": lambda: digester_demand.calc_heat_demand(
+            inputs["t_air"], heat_transfer_coefficient=0.6, temp_digester=37, surface_area=500,
+            heat_capacity=4200, average_mass_flow=1100),
+        "digester_demand.calc_electricity_demand": lambda: digester_demand.calc_electricity_demand(
+            inputs["influent"] / 1017, active_volume=800),
+    }
+
+
+def best_of(call, repeat=5, min_time=0.05):
+    # best time of one call [s]; fast calls are repeated in loops of at least min_time
+    number = 1
+    while True:
+        seconds = timeit.timeit(call, number=number)
+        if seconds >= min_time or number >= 10 ** 6:
+            break
+        number *= 10
+    return min([seconds] + timeit.repeat(call, number=number, repeat=repeat - 1)) / number
+
+
+def run(sizes=SIZES, pattern=None, repeat=5):
+
+    r"""
+    Times all kernels for series of the given lengths
+    ----
+    Parameters
+    ----------
+    sizes: numbers of time steps
+    pattern: only time the benchmarks whose name contains this string
+    repeat: number of repeats, the best one is reported
+
+    Returns
+    -------
+    timings : dict:
+         {"kernels.<module>.<kernel>[<steps>]": seconds per call}
+
+    """
+    timings = {}
+    for n in sizes:
+        for name, call in cases(synthetic_inputs(n)).items():
+            key = "kernels.{0}[{1}]".format(name, n)
+            if pattern is None or pattern in key:
+                timings[key] = best_of(call, repeat)
+    return timings
+
+
+def main():
+    print(f"{'benchmark':<60}{'time [ms]':>12}")
+    for name, seconds in run().items():
+        print(f"{name:<60}{seconds * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8
+
+"""
+Micro-benchmark of the plant growth kernels in src/owefe/specs/plant.py.
+Compares the vectorized calc_te, calc_hi and calc_arid against Python loop implementations
+for hourly series of 1, 10 and 100 years (8 760, 87 600 and 876 000 time steps).
+
+Run from the repository root:
+    python benchmarks/plant_kernels.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import owefe.specs.plant as plant  # noqa: E402
+
+# parameters of the Hegelbach wheat case study
+t_base = 0
+t_opt = 15
+RUE = 1.24
+t_heat = 34
+t_ext = 45
+s_water = 0.4
+rzd = 1
+
+sizes = [8760, 87600, 876000]
+
+
+def calc_te_loop(t_air, t_opt, t_base, RUE):
+    # reference: former implementation of plant.calc_te
+    c_wh_to_mj = 3.6*10**(-3)
+    te = []
+    for t in t_air:
+        if t < t_base:
+            te.append(0)
+        elif t_base <= t <= t_opt:
+            te.append((t-t_base)/(t_opt-t_base) * RUE * c_wh_to_mj)
+        elif t > t_opt:
+            te.append(1 * RUE * c_wh_to_mj)
+    return te
+
+
+def calc_hi_loop(t_max, t_heat, t_ext):
+    # reference: former implementation of plant.calc_hi
+    hi = []
+    for t in t_max:
+        if t <= t_heat:
+            hi.append(1)
+        elif t_heat < t <= t_ext:
+            hi.append((t-t_heat)/(t_ext-t_heat))
+        elif t > t_ext:
+            hi.append(0)
+    return hi
+
+
+def calc_arid_loop(et_o, vwc, s_water, rzd):
+    # reference: element-wise loop (the former implementation iterated over all et_o x vwc pairs)
+    wi = []
+    for e, m in zip(et_o, vwc):
+        wi.append(1-s_water*(1 - min(abs(e), (0.096/24)*m*rzd)/abs(e)))
+    return wi
+
+
+def synthetic_temperature(n, seed=42):
+    # hourly air temperature [°C] with seasonal and daily cycle, covering all kernel branches
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n)
+    t_air = 10 - 12 * np.cos(2 * np.pi * hours / 8760) - 6 * np.cos(2 * np.pi * hours / 24) \
+        + rng.normal(0, 3, n)
+    return pd.Series(t_air, index=pd.date_range("1/1/2018", periods=n, freq="h"))
+
+
+def synthetic_soil_water(n, seed=42):
+    # hourly potential evapotranspiration [m] (ERA5 sign convention) and root zone water content
+    # [m³/m³]
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n)
+    et_o = -np.abs(2e-4 * (1 - np.cos(2 * np.pi * hours / 24)) + rng.normal(0, 5e-5, n)) - 1e-6
+    vwc = 0.35 + 0.05 * np.cos(2 * np.pi * hours / 8760) + rng.normal(0, 0.01, n)
+    return pd.Series(et_o), pd.Series(vwc)
+
+
+def best_of(stmt, repeat=3):
+    return min(timeit.repeat(stmt, number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'kernel':<10}{'steps':>10}{'loop [s]':>12}{'numpy [s]':>12}{'speedup':>10}")
+    for n in sizes:
+        t_air = synthetic_temperature(n)
+        t_max = t_air.resample("D").max().reindex(t_air.index, method="ffill") + 20
+        et_o, vwc = synthetic_soil_water(n)
+
+        np.testing.assert_allclose(plant.calc_te(t_air, t_opt, t_base, RUE),
+                                   calc_te_loop(t_air, t_opt, t_base, RUE))
+        np.testing.assert_allclose(plant.calc_hi(t_max, t_heat, t_ext),
+                                   calc_hi_loop(t_max, t_heat, t_ext))
+        np.testing.assert_allclose(plant.calc_arid(et_o, vwc, s_water, rzd),
+                                   calc_arid_loop(et_o, vwc, s_water, rzd))
+
+        cases = [
+            ("calc_te", lambda: calc_te_loop(t_air, t_opt, t_base, RUE),
+             lambda: plant.calc_te(t_air, t_opt, t_base, RUE)),
+            ("calc_hi", lambda: calc_hi_loop(t_max, t_heat, t_ext),
+             lambda: plant.calc_hi(t_max, t_heat, t_ext)),
+            ("calc_arid", lambda: calc_arid_loop(et_o, vwc, s_water, rzd),
+             lambda: plant.calc_arid(et_o, vwc, s_water, rzd)),
+        ]
+        for name, loop, vectorized in cases:
+            t_loop = best_of(loop)
+            t_vec = best_of(vectorized)
+            print(f"{name:<10}{n:>10}{t_loop:>12.4f}{t_vec:>12.5f}{t_loop / t_vec:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
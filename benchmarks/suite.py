@@ -0,0 +1,149 @@
+# -*- coding: utf-8
+
+"""
+Benchmark suite of OWEFE: the spec kernels (benchmarks/kernels.py) and the end-to-end runs of the
+Hegelbach and Tibnine models (benchmarks/end_to_end.py), checked against stored baselines. A
+benchmark regresses if it takes more than (1 + threshold) times its baseline; differences below
+NOISE_FLOOR seconds (per benchmark group) are ignored. A "threshold" in the entry of a benchmark
+overrides the default, e.g. for the short, noisy 1 week runs. The baselines
+(benchmarks/baselines.json) hold the results of one machine, so they have to be saved again on the
+machine the suite is checked on (--save), e.g. before a change. The exit code is 1 if a benchmark
+regressed.
+
+Run from the repository root (CBC on the PATH):
+    python benchmarks/suite.py                        # all benchmarks, compared with the baselines
+    python benchmarks/suite.py -k tibnine --horizons 1W 1Y
+    python benchmarks/suite.py --save                 # store the results as new baselines
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import end_to_end
+import kernels
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# default relative threshold and the absolute differences [s] that count as noise
+THRESHOLD = 0.3
+NOISE_FLOOR = {"kernels": 1e-4, "end_to_end": 0.05}
+
+
+def machine():
+    # description of this machine, stored with the baselines
+    return {"node": platform.node(), "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count(),
+            "python": platform.python_version()}
+
+
+def load_baselines(path=BASELINES):
+    if not os.path.exists(path):
+        return {"machine": None, "threshold": THRESHOLD, "benchmarks": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINES, threshold=THRESHOLD):
+    # merges results into the baselines of path, keeping the thresholds set per benchmark
+    baselines = load_baselines(path)
+    baselines["machine"] = machine()
+    baselines.setdefault("threshold", threshold)
+    for name, value in results.items():
+        entry = baselines["benchmarks"].setdefault(name, {})
+        entry["value"] = value
+    baselines["benchmarks"] = dict(sorted(baselines["benchmarks"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, threshold=None):
+
+    r"""
+    Compares benchmark results with their baselines
+    ----
+    Parameters
+    ----------
+    results: dict {benchmark: value}, seconds or peak RSS [MB] for names ending with "peak_rss"
+    baselines: baselines as stored by save_baselines
+    threshold: relative threshold overriding the thresholds of the baselines
+
+    Returns
+    -------
+    rows : list of tuple: (benchmark, value, baseline, ratio, status) with status "ok",
+         "REGRESSION", "faster" or "new"
+
+    """
+    rows = []
+    for name, value in results.items():
+        entry = baselines["benchmarks"].get(name)
+        if entry is None:
+            rows.append((name, value, None, None, "new"))
+            continue
+        limit = threshold
+        if limit is None:
+            limit = entry.get("threshold", baselines["threshold"])
+        baseline = entry["value"]
+        ratio = value / baseline if baseline else float("inf")
+        noise = 0 if name.endswith("peak_rss") else NOISE_FLOOR[name.split(".")[0]]
+        if value > baseline * (1 + limit) and value - baseline > noise:
+            status = "REGRESSION"
+        elif value < baseline / (1 + limit) and baseline - value > noise:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, value, baseline, ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OWEFE benchmark suite")
+    parser.add_argument("-k", dest="pattern",
+                        help="only run the benchmarks whose name contains this string")
+    parser.add_argument("--sizes", type=int, nargs="+", default=kernels.SIZES,
+                        help="time steps of the kernels")
+    parser.add_argument("--horizons", nargs="+", default=end_to_end.HORIZONS,
+                        help="horizons of the models")
+    parser.add_argument("--no-kernels", action="store_true", help="skip the kernel benchmarks")
+    parser.add_argument("--no-models", action="store_true", help="skip the end-to-end benchmarks")
+    parser.add_argument("--solver", default="cbc", help="LP solver of the end-to-end benchmarks")
+    parser.add_argument("--baselines", default=BASELINES, help="baseline file")
+    parser.add_argument("--threshold", type=float,
+                        help="relative threshold, overrides the baseline file")
+    parser.add_argument("--save", action="store_true", help="store the results as baselines")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if not args.no_kernels:
+        results.update(kernels.run(args.sizes, args.pattern))
+    if not args.no_models:
+        results.update(end_to_end.run(horizons=args.horizons, pattern=args.pattern,
+                                      solver=args.solver))
+
+    baselines = load_baselines(args.baselines)
+    if baselines["machine"] not in (None, machine()):
+        print("warning: the baselines were measured on another machine: {0}".format(
+            baselines["machine"]))
+    rows = compare(results, baselines, args.threshold)
+    print(f"{'benchmark':<62}{'value':>12}{'baseline':>12}{'ratio':>8}  status")
+    for name, value, baseline, ratio, status in rows:
+        scale, unit = (1, "MB") if name.endswith("peak_rss") else (1e3, "ms")
+        baseline_text = "" if baseline is None else f"{baseline * scale:>9.3f} {unit}"
+        ratio_text = "" if ratio is None else f"{ratio:>7.2f}x"
+        print(f"{name:<62}{value * scale:>9.3f} {unit}{baseline_text:>12}{ratio_text:>8}  {status}")
+
+    if args.save:
+        save_baselines(results, args.baselines)
+        print("Saved {0} baselines to {1}".format(len(results), args.baselines))
+        return 0
+    regressions = [row[0] for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print("{0} benchmark(s) regressed: {1}".format(len(regressions), ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
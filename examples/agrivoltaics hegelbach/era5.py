@@ -1,13 +1,19 @@
 # copied form feedinlib, manipluated to meet OWEFE needs, make sure to have feedinlib environment active
 # when using this script
+# feedinlib (download) and geopandas/shapely (selection by geometry) are imported by the functions
+# that use them, so weather_df_from_era5 reads files with a list area with xarray alone
 
-import geopandas as gpd
 import numpy as np
 import pandas as pd
 import xarray as xr
-from shapely.geometry import Point
 
-from feedinlib.cds_request_tools import get_cds_data_from_datespan_and_position
+# ERA5 variables used by the format functions of each lib
+LIB_VARIABLES = {
+    "pvlib": ["fdir", "ssrd", "t2m", "u10", "v10"],
+    "windpowerlib": ["u100", "v100", "u10", "v10", "sp", "t2m", "fsr"],
+}
+# the format functions move the time stamps of ERA5 (end of the interval) back by these offsets
+LIB_TIME_SHIFT = {"pvlib": pd.Timedelta(minutes=30), "windpowerlib": pd.Timedelta(minutes=60)}
 
 
 def get_era5_data_from_datespan_and_position(
@@ -74,7 +80,10 @@ def get_era5_data_from_datespan_and_position(
             "10u",
             "10v",
         ]
-    get_cds_data_from_datespan_and_position(**locals())
+    arguments = dict(locals())
+    from feedinlib.cds_request_tools import get_cds_data_from_datespan_and_position
+
+    get_cds_data_from_datespan_and_position(**arguments)
 
 
 def format_windpowerlib(ds):
@@ -260,16 +269,52 @@ def select_area(ds, lon, lat, g_step=0.25):
     if select_point is True:
         answer = ds.sel(latitude=lat, longitude=lon, method="nearest")
     else:
-        answer = ds.where(
-            (lat_s < ds.latitude)
-            & (ds.latitude <= lat_n)
-            & (lon_w < ds.longitude)
-            & (ds.longitude <= lon_e)
+        # indexing instead of masking with ds.where, so only the grid points of the area are read
+        latitude = ds.latitude.values
+        longitude = ds.longitude.values
+        answer = ds.isel(
+            latitude=np.flatnonzero((lat_s < latitude) & (latitude <= lat_n)),
+            longitude=np.flatnonzero((lon_w < longitude) & (longitude <= lon_e)),
         )
 
     return answer
 
 
+def select_time(ds, start=None, end=None, shift=pd.Timedelta(0)):
+    """
+    Select the time steps from start to end from dataset.
+    Parameters
+    -----------
+    ds : xarray.Dataset
+        Dataset with ERA5 weather data.
+    start : None or anything `pandas.to_datetime` can convert to a timestamp
+        First time step, None for the first one of the dataset. Dates given as
+        strings include their whole period, like "2018-06" all of June.
+    end : None or anything `pandas.to_datetime` can convert to a timestamp
+        Last time step, None for the last one of the dataset.
+    shift : pd.Timedelta
+        Offset by which the time stamps are moved back after the selection
+        (see LIB_TIME_SHIFT); start and end are moved forward by it.
+    Returns
+    -------
+    xarray.Dataset
+        Dataset containing the selected time steps.
+    """
+    bounds = []
+    for bound, side in ((start, "start_time"), (end, "end_time")):
+        if bound is not None:
+            if isinstance(bound, str):
+                # dates like "2018-06" cover the whole period, as in df[start:end]
+                bound = getattr(pd.Period(bound), side)
+            bound = pd.Timestamp(bound)
+            # the time stamps of ERA5 are UTC without time zone
+            if bound.tzinfo is not None:
+                bound = bound.tz_convert("UTC").tz_localize(None)
+            bound = bound + shift
+        bounds.append(bound)
+    return ds.sel(time=slice(*bounds))
+
+
 def select_geometry(ds, area):
     """
     Select data for given geometry from dataset.
@@ -284,6 +329,18 @@ def select_geometry(ds, area):
     xarray.Dataset
         Dataset containing selection for specified location or area.
     """  # noqa: E501
+    import geopandas as gpd
+    from shapely.geometry import Point
+
+    # only the grid points within the bounding box of the area are candidates
+    lon_w, lat_s, lon_e, lat_n = area.bounds
+    latitude = ds.latitude.values
+    longitude = ds.longitude.values
+    ds = ds.isel(
+        latitude=np.flatnonzero((lat_s <= latitude) & (latitude <= lat_n)),
+        longitude=np.flatnonzero((lon_w <= longitude) & (longitude <= lon_e)),
+    )
+
     geometry = []
     lon_vals = []
     lat_vals = []
@@ -329,11 +386,14 @@ def select_geometry(ds, area):
 
 
 def weather_df_from_era5(
-    era5_netcdf_filename, lib, start=None, end=None, area=None
+    era5_netcdf_filename, lib, start=None, end=None, area=None, chunks=None
 ):
     """
     Gets ERA5 weather data from netcdf file and converts it to a pandas
     dataframe as required by the spcified lib.
+    The file is opened lazily and the variables of the lib, the time span and
+    the area are selected before any data is read, so the memory use depends
+    on the requested data and not on the size of the file.
     Parameters
     -----------
     era5_netcdf_filename : str
@@ -353,6 +413,10 @@ def weather_df_from_era5(
         If you want data for an area you can provide a shape of this area or
         specify a rectangular area giving a list of the
         form [(lon west, lon east), (lat south, lat north)].
+    chunks : None or dict
+        Dask chunks the selection is read in, e.g. {"time": 744} (requires
+        dask). By default the selection is read at once without dask, which
+        is faster for the windows of single sites.
     Returns
     -------
     pd.DataFrame
@@ -361,25 +425,27 @@ def weather_df_from_era5(
         dataframe is a datetime index. Otherwise the index is a multiindex
         with time, latitude and longitude levels.
     """  # noqa: E501
-    ds = xr.open_dataset(era5_netcdf_filename)
-
-    if area is not None:
-        if isinstance(area, list):
-            ds = select_area(ds, area[0], area[1])
-        else:
-            ds = select_geometry(ds, area)
-            if ds is None:
-                return pd.DataFrame()
-
-    if lib == "windpowerlib":
-        df = format_windpowerlib(ds)
-    elif lib == "pvlib":
-        df = format_pvlib(ds)
-    else:
+    if lib not in LIB_VARIABLES:
         raise ValueError(
             "Unknown value for `lib`. "
             "It must be either 'pvlib' or 'windpowerlib'."
         )
+    with xr.open_dataset(era5_netcdf_filename, chunks=chunks) as ds:
+        ds = ds[LIB_VARIABLES[lib]]
+        ds = select_time(ds, start, end, LIB_TIME_SHIFT[lib])
+
+        if area is not None:
+            if isinstance(area, list):
+                ds = select_area(ds, area[0], area[1])
+            else:
+                ds = select_geometry(ds, area)
+                if ds is None:
+                    return pd.DataFrame()
+
+        if lib == "windpowerlib":
+            df = format_windpowerlib(ds)
+        else:
+            df = format_pvlib(ds)
 
     # drop latitude and longitude from index in case a single location
     # is given in parameter `area`
@@ -0,0 +1,133 @@
+# ************* Hegelbach Agrivoltaics Model ************
+'''
+   General description
+   ----------------------
+   The iWEFEs of the Hegelbach agrivoltaics (APV) plant as importable build function, shared by
+   main_apv_hegelbach.py, the headless scenario runs and the benchmarks (benchmarks/end_to_end.py).
+
+   Timestep: hour (other resolutions average the hourly input data)
+            Input: global horizontal irradiance [W/m²], air temperature [°C], potential
+            evapotranspiration [m], root zone soil moisture [m³/m³]
+
+   Data
+   ------
+   ERA5_pvlib_2018.csv, t_air_below_apv_calibrated_2018.csv, apv_temp_daily_max_H.csv, era5_et0.csv,
+   era5_vwc.csv (time series for latitude = 47.9, longitude = 9.1)
+'''
+
+import os
+
+import pandas as pd
+from oemof import solph
+
+import owefe.specs.photovoltaic_panel as photovoltaic_panel
+import owefe.specs.plant as plant
+from owefe.scenarios import fit_profiles
+
+# directory of the hourly input data of one year
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# SolarWorld SW 270 duo bifacial PV (Schindele et al. 2020), n_t: Maleki et al. (2015), Ismail et
+# al. (2013)
+PV_MODULE = {"p_rpv": 270, "r_ref": 1000, "n_t": -0.0037, "t_c_ref": 25, "noct": 48}
+# wheat Batten, species parameters of the simple crop model
+WHEAT = {"t_base": 0, "t_opt": 15, "RUE": 1.24, "t_heat": 34, "t_ext": 45, "s_water": 0.4, "rzd": 1}
+# looked up in the APV_geometry result files: ground irradiance [Wh/m²a] relative to the module
+# irradiance, and 1 (front) + back to front ratio of the bifacial modules
+SHADING_FACTOR = 836447.4/1195402
+BIFACIAL_FACTOR = 1 + 0.126485
+
+
+def read_inputs(data_dir=DATA_DIR):
+    # hourly input year: ghi and t_air above the modules, t_air and its daily maximum below them,
+    # pev and vwc_rzd
+    def column(file_name, name):
+        return pd.read_csv(os.path.join(data_dir, file_name), usecols=[name])[name].to_numpy()
+
+    climate = pd.read_csv(os.path.join(data_dir, "ERA5_pvlib_2018.csv"), usecols=["ghi", "t_air"])
+    return pd.DataFrame({
+        "ghi": climate["ghi"].to_numpy()[:8760],
+        "t_air": climate["t_air"].to_numpy()[:8760],
+        "t_air_apv": column("t_air_below_apv_calibrated_2018.csv", "t_air"),
+        "t_max_apv": column("apv_temp_daily_max_H.csv", "t_air"),
+        "pev": column("era5_et0.csv", "pev"),
+        "vwc_rzd": column("era5_vwc.csv", "vwc_rzd"),
+    })
+
+
+def create_energysystem(date_time_index, ghi, pv_conversion_factor, growth_factor,
+                        inverter_efficiency=0.9, bifacial_factor=BIFACIAL_FACTOR,
+                        shading_factor=SHADING_FACTOR):
+    # builds the iWEFEs for the irradiance ghi, the conversion factors of the pv modules and the
+    # plant (one value per time step) and the geometry factors of the APV plant
+    energysystem = solph.EnergySystem(timeindex=date_time_index)
+
+    # solar energy on the modules and on the ground, DC and AC electricity, biomass
+    bsem = solph.Bus(label="solar energy bus module")
+    bseg = solph.Bus(label="solar energy bus ground")
+    bedc = solph.Bus(label="DC electricity bus")
+    beac = solph.Bus(label="AC electricity bus")
+    bb = solph.Bus(label="biomass bus")
+    energysystem.add(bsem, bseg, bedc, beac, bb)
+
+    # solar radiation on the modules and irradiance on the ground
+    energysystem.add(solph.Source(label="Sun_module", outputs={bsem: solph.Flow(
+        fix=ghi, nominal_value=bifacial_factor)}))
+    energysystem.add(solph.Source(label="Sun_ground", outputs={bseg: solph.Flow(
+        fix=ghi, nominal_value=shading_factor)}))
+
+    energysystem.add(solph.Transformer(
+        label="Photovoltaic Panels",
+        inputs={bsem: solph.Flow()},
+        outputs={bedc: solph.Flow()},
+        conversion_factors={bedc: pv_conversion_factor},
+    ))
+    # inverter Huawei SUN2000-36KTL; efficiency: 0.986; 0.9 also covers further losses
+    energysystem.add(solph.Transformer(
+        label="Inverter",
+        inputs={bedc: solph.Flow()},
+        outputs={beac: solph.Flow()},
+        conversion_factors={beac: inverter_efficiency},
+    ))
+    energysystem.add(solph.Transformer(
+        label="Plant",
+        inputs={bseg: solph.Flow()},
+        conversion_factors={bb: growth_factor},
+        outputs={bb: solph.Flow()},
+    ))
+
+    # grid and biomass harvest
+    energysystem.add(solph.Sink(label="grid", inputs={beac: solph.Flow()}))
+    energysystem.add(solph.Sink(label="harvest", inputs={bb: solph.Flow()}))
+    return energysystem
+
+
+def build(timeindex, n_pv=720, inverter_efficiency=0.9, bifacial_factor=BIFACIAL_FACTOR,
+          shading_factor=SHADING_FACTOR, data_dir=DATA_DIR):
+
+    r"""
+    Computes the pv and plant conversion factors and builds the Hegelbach iWEFEs for a time index
+    ----
+    Parameters
+    ----------
+    timeindex: pd.DatetimeIndex of the model; the hourly input year is repeated and averaged to fit
+        it
+    n_pv: number of pv modules
+    inverter_efficiency: efficiency of the inverter including further losses
+    bifacial_factor: irradiance on the bifacial modules relative to ghi
+    shading_factor: irradiance on the ground below the modules relative to ghi
+    data_dir: directory of the input files
+
+    Returns
+    -------
+    energysystem : solph.EnergySystem
+
+    """
+    data = fit_profiles(read_inputs(data_dir), timeindex)
+    pv_te = photovoltaic_panel.calc_pv_te(t_air=data["t_air"], ghi=data["ghi"], **PV_MODULE)
+    growth = plant.calc_growth(t_air=data["t_air_apv"], t_max=data["t_max_apv"], et_o=data["pev"],
+                               vwc=data["vwc_rzd"], **WHEAT)
+    return create_energysystem(timeindex, data["ghi"].to_numpy(), pv_te.to_numpy() * n_pv,
+                               growth["growth_factor"].to_numpy(),
+                               inverter_efficiency=inverter_efficiency,
+                               bifacial_factor=bifacial_factor, shading_factor=shading_factor)
@@ -1,26 +1,26 @@
 # Basic Agrivoltaics Model (Version 0.2) - Case Study of Hegelbach
-import math
-
 from oemof.tools import logger
 from oemof import solph
 
 import logging
 import os
 import pandas as pd
-import pprint as pp
-import numpy as np
 
 try:
     import matplotlib.pyplot as plt
 except ImportError:
     plt = None
 
-# changing cwd to use the function from the main file
-os.chdir("../../src")
-import src.specs.plant as plant
-import src.specs.photovoltaic_panel as photovoltaic_panel
+# OWEFE modules (install the package with 'pip install -e .')
+import owefe.specs.plant as plant
+import owefe.specs.photovoltaic_panel as photovoltaic_panel
+from owefe.simulation import simulate
+from owefe.results import save_results
+from owefe.cache import ResultCache
+from hegelbach_model import create_energysystem
 
-os.chdir("../examples/agrivoltaics hegelbach")
+# the input files are read from the directory of this script
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 
 # *********************************************************************************************
@@ -31,6 +31,8 @@ solver = "cbc"
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 8760
 solver_verbose = False  # show/hide solver output
+persist_results = False  # store the results in a run directory of their own
+use_cache = False  # reuse the results of an identical earlier run (see owefe.cache)
 
 # initiate the logger (see the API docs for more information)
 logger.define_logging(
@@ -43,8 +45,6 @@ print(number_of_time_steps)
 logging.info("Initialize the iWEFEs system")
 date_time_index = pd.date_range(
     "1/1/2018", periods=number_of_time_steps, freq="H")
-
-energysystem = solph.EnergySystem(timeindex=date_time_index)
 print(date_time_index)
 
 # *********************************************************************************************
@@ -135,165 +135,59 @@ bifacial_factor = 1+back_front_ratio  # radiance ratio on bifacial module 1 (fro
 # *********************************************************************************************
 logging.info("Create iWEFEs elements")
 
-# The bus objects were assigned to variables which makes it easier to connect
-# components to these buses (see below).
-
-# create solar energy bus on module
-bsem = solph.Bus(label="solar energy bus module")
-
-# create solar energy bus on ground
-bseg = solph.Bus(label="solar energy bus ground")
-
-# create plant internal bus 1
-bp1 = solph.Bus(label="plant internal bus 1")
-
-# create plant internal bus 2
-bp2 = solph.Bus(label="plant internal bus 2")
-
-# create DC electricity bus
-bedc = solph.Bus(label="DC electricity bus")
-
-# create AC electricity bus
-beac = solph.Bus(label="AC electricity bus")
-
-# create Biomass Bus
-bb = solph.Bus(label="biomass bus")
-
-# add buses to the iWEFEs
-energysystem.add(bsem, bseg, bp1, bp2, bedc, beac, bb)
-
-# Resources
-
-# solar radiation from the sun
-energysystem.add(
-    solph.Source(
-        label="Sun_module",
-        outputs={bsem: solph.Flow(fix=climate_df["ghi"], nominal_value=bifacial_factor)})),
-
-# irradiance on ground
-energysystem.add(
-    solph.Source(
-        label="Sun_ground",
-        outputs={bseg: solph.Flow(fix=climate_df["ghi"], nominal_value=shading_factor)})),
-
 # Photovoltaic Panels
 pv_te = photovoltaic_panel.calc_pv_te(
     t_air=climate_df["t_air"], ghi=climate_df["ghi"], p_rpv=p_rpv, r_ref=r_ref, n_t=n_t, t_c_ref=t_c_ref, noct=noct)
-energysystem.add(
-    solph.Transformer(
-        label="Photovoltaic Panels",
-        inputs={bsem: solph.Flow()},
-        outputs={bedc: solph.Flow()},
-        conversion_factors={bedc: pv_te*n_pv},
-    )
-)
-
-# Inverter
-energysystem.add(
-    solph.Transformer(
-        label="Inverter",
-        inputs={bedc: solph.Flow()},
-        outputs={beac: solph.Flow()},
-        conversion_factors={beac: inverter_efficiency},
-    )
-)
 
 # Plant
-# we have subdivided the plant in various sub-transformers
-# to model the various environmental impacts on the plant's biomass production rate
-# Transformer P1: Temperature and RUE impact on biomass growth rate
-
-ti = plant.calc_te(t_air=apv_temp["t_air"], t_opt=t_opt, t_base=t_base, RUE=RUE)
-energysystem.add(
-    solph.Transformer(
-        label="Plant_ti",
-        inputs={bseg: solph.Flow()},
-        conversion_factors={bp1: ti},
-        outputs={bp1: solph.Flow()},
-    )
-)
-
-# Transformer P2: Heat effect on biomass growth rate
-hi = plant.calc_hi(t_max=apv_temp_D_max_H["t_air"], t_heat=t_heat, t_ext=t_ext)
-energysystem.add(
-    solph.Transformer(
-        label="Plant_hi",
-        inputs={bp1: solph.Flow()},
-        conversion_factors={bp2: hi},
-        outputs={bp2: solph.Flow()},
-    )
-)
-
-
-# Transformer P3: Aridity impact on biomass growth rate
-wi = plant.calc_arid(et_o=et0_df["pev"], vwc=soil_moisture_df["vwc_rzd"], s_water=s_water, rzd=rzd)
-energysystem.add(
-    solph.Transformer(
-        label="Plant_arid",
-        inputs={bp2: solph.Flow()},
-        conversion_factors={bb: wi},
-        outputs={bb: solph.Flow()},
-    )
-)
-
-# Sinks
-# grid
-energysystem.add(solph.Sink(label="grid", inputs={beac: solph.Flow()}))
-
-# biomass harvest
-energysystem.add(solph.Sink(label="harvest", inputs={bb: solph.Flow()}))
+# the environmental impacts on the plant's biomass production rate are combined in one conversion
+# factor: temperature and RUE impact (ti), heat effect (hi) and aridity impact (wi) on the biomass
+# growth rate; the single factors are kept in plant_factors for reporting
+plant_factors = plant.calc_growth(
+    t_air=apv_temp["t_air"], t_max=apv_temp_D_max_H["t_air"], et_o=et0_df["pev"],
+    vwc=soil_moisture_df["vwc_rzd"], t_opt=t_opt, t_base=t_base, RUE=RUE, t_heat=t_heat,
+    t_ext=t_ext, s_water=s_water, rzd=rzd)
+
+# the iWEFEs (sun on the modules and the ground, pv panels, inverter, plant, grid and harvest) are
+# defined in hegelbach_model.py, which also builds them for the benchmarks and headless runs
+energysystem = create_energysystem(
+    date_time_index, climate_df["ghi"], pv_te*n_pv, plant_factors["growth_factor"].to_numpy(),
+    inverter_efficiency=inverter_efficiency, bifacial_factor=bifacial_factor,
+    shading_factor=shading_factor)
 
 
 ##########################################################################
 # Simulate the iWEFEs and plot the results
 ##########################################################################
 
-logging.info("Optimise the energy system")
-
-# initialise the operational model
-model = solph.Model(energysystem)
+logging.info("Simulate the iWEFEs")
 
 # This is for debugging only. It is not(!) necessary to solve the problem and
 # should be set to false to save time and disc space in normal use. For
 # debugging the timesteps should be set to 3, to increase the readability of
 # the lp-file.
 if debug:
+    model = solph.Model(energysystem)
     filename = os.path.join(
         solph.helpers.extend_basic_path("lp_files"), "basic_example.lp"
     )
     logging.info("Store lp-file in {0}.".format(filename))
     model.write(filename, io_options={"symbolic_solver_labels": True})
 
-# if tee_switch is true solver messages will be displayed
-logging.info("Solve the optimization problem")
-model.solve(solver=solver, solve_kwargs={"tee": solver_verbose})
-
-logging.info("Store the energy system with the results.")
-
-# The processing module of the outputlib can be used to extract the results
-# from the model transfer them into a homogeneous structured dictionary.
-
-# add result files
-energysystem.results["main"] = solph.processing.results(model)
-energysystem.results["meta"] = solph.processing.meta_results(model)
-
-# The default path is the '.oemof' folder in your $HOME directory.
-# The default filename is 'es_dump.oemof'.
-# You can omit the attributes (as None is the default value) for testing cases.
-# You should use unique names/folders for valuable results to avoid
-# overwriting.
-
-# store energy system with results
-energysystem.dump(dpath=None, filename=None)
-
-# ****************************************************************************
-# ********** PART 2 - Processing the results *********************************
-# ****************************************************************************
-
-logging.info("**** The script can be divided into two parts here.")
-logging.info("Restore the energy system and the results.")
-energysystem = solph.EnergySystem()
-energysystem.restore(dpath=None, filename=None)
+# the iWEFEs only consists of fixed sources, transformers and free sinks, so its flows are
+# propagated directly; the optimization model is only built and solved if the system has degrees of
+# freedom (results and meta results are added to energysystem.results)
+if use_cache:
+    cache = ResultCache()
+    cache.simulate(energysystem, solver=solver, solve_kwargs={"tee": solver_verbose})
+    logging.info("Result cache: {0}".format(cache.stats()))
+else:
+    simulate(energysystem, solver=solver, solve_kwargs={"tee": solver_verbose})
+
+# the results stay in memory (energysystem.results); they are only written to disk, into a
+# directory of their own, if persist_results is set
+if persist_results:
+    logging.info("Store the results in {0}".format(save_results(energysystem)))
 
 # define an alias for shorter calls below (optional)
 results = energysystem.results["main"]
@@ -315,6 +209,9 @@ biomass_production = biomass_bus["sequences"].sum(axis=0)
 biomass_growth_period = biomass_bus["sequences"].loc["2018-01-01 00:00:00":"2018-07-31 12:00:00", :]
 biomass_harvest = biomass_growth_period.sum(axis=0) * HI
 
+print("********* Mean plant impact factors *********")
+print(plant_factors.mean(axis=0))
+
 comb_sum = pd.concat([electricity_production, biomass_production, biomass_harvest], axis=0)
 dfcomb = pd.DataFrame(comb_sum, columns=["Value"])
 dfcomb.to_csv("production.csv", index=True)
@@ -344,40 +241,41 @@ print("----------")
 
 # plot electricity production from solar input and electricity demand
 
-fig, ax = plt.subplots(figsize=(10, 5))
-electricity_bus["sequences"].plot(
-    ax=ax, kind="line", drawstyle="steps-post"
-)
-solar_bus_module["sequences"].plot(
-    ax=ax, kind="line", drawstyle="steps-post"
-)
-solar_bus_ground["sequences"].plot(
-    ax=ax, kind="line", drawstyle="steps-post"
-)
-plt.legend(
-    loc="upper center",
-    prop={"size": 8},
-    bbox_to_anchor=(0.5, 1.3),
-    ncol=3,
-)
-fig.subplots_adjust(top=0.8)
-plt.title("Electricity Production and Demand")
-plt.xlabel("Time Period [h]")
-plt.ylabel("Energy [kW]")
-plt.show()
-
-fig, ax = plt.subplots(figsize=(10, 5))
-biomass_bus["sequences"].plot(
-    ax=ax, kind="line", drawstyle="steps-post"
-)
-plt.legend(
-    loc="upper center",
-    prop={"size": 8},
-    bbox_to_anchor=(0.5, 1.3),
-    ncol=3,
-)
-fig.subplots_adjust(top=0.8)
-plt.title("Biomass Rate")
-plt.xlabel("Time Period [h]")
-plt.ylabel("[g/(h*m²)]")
-plt.show()
\ No newline at end of file
+if plt is not None:
+    fig, ax = plt.subplots(figsize=(10, 5))
+    electricity_bus["sequences"].plot(
+        ax=ax, kind="line", drawstyle="steps-post"
+    )
+    solar_bus_module["sequences"].plot(
+        ax=ax, kind="line", drawstyle="steps-post"
+    )
+    solar_bus_ground["sequences"].plot(
+        ax=ax, kind="line", drawstyle="steps-post"
+    )
+    plt.legend(
+        loc="upper center",
+        prop={"size": 8},
+        bbox_to_anchor=(0.5, 1.3),
+        ncol=3,
+    )
+    fig.subplots_adjust(top=0.8)
+    plt.title("Electricity Production and Demand")
+    plt.xlabel("Time Period [h]")
+    plt.ylabel("Energy [kW]")
+    plt.show()
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    biomass_bus["sequences"].plot(
+        ax=ax, kind="line", drawstyle="steps-post"
+    )
+    plt.legend(
+        loc="upper center",
+        prop={"size": 8},
+        bbox_to_anchor=(0.5, 1.3),
+        ncol=3,
+    )
+    fig.subplots_adjust(top=0.8)
+    plt.title("Biomass Rate")
+    plt.xlabel("Time Period [h]")
+    plt.ylabel("[g/(h*m²)]")
+    plt.show()
@@ -9,6 +9,10 @@ from feedinlib import era5
 from feedinlib import Photovoltaic
 from shapely.geometry import Point
 
+# OWEFE modules (install the package with 'pip install -e .')
+import owefe.specs.plant as plant
+from owefe.results import save_results
+
 # ERA5
 # set start and end date (end date will be included
 # in the time period for which data is downloaded)
@@ -49,12 +53,8 @@ try:
 except ImportError:
     plt = None
 
-# changing cwd to use the function from the main file
-os.chdir("../../src")
-
-import src.specs.plant as plant
-
-os.chdir("../examples/APV Hegelbach")
+# the input files are read from the directory of this script
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 # *********************************************************************************************
 # set up oemof.solph
@@ -64,6 +64,7 @@ solver = "cbc"
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 24
 solver_verbose = False  # show/hide solver output
+persist_results = False  # store the results in a run directory of their own
 
 # initiate the logger (see the API docs for more information)
 logger.define_logging(
@@ -185,23 +186,10 @@ logging.info("Store the iWEFEs with the results.")
 energysystem.results["main"] = solph.processing.results(model)
 energysystem.results["meta"] = solph.processing.meta_results(model)
 
-# The default path is the '.oemof' folder in your $HOME directory.
-# The default filename is 'es_dump.oemof'.
-# You can omit the attributes (as None is the default value) for testing cases.
-# You should use unique names/folders for valuable results to avoid
-# overwriting.
-
-# store energy system with results
-energysystem.dump(dpath=None, filename=None)
-
-# ****************************************************************************
-# ********** PART 2 - Processing the results *********************************
-# ****************************************************************************
-
-logging.info("**** The script can be divided into two parts here.")
-logging.info("Restore the energy system and the results.")
-energysystem = solph.EnergySystem()
-energysystem.restore(dpath=None, filename=None)
+# the results stay in memory (energysystem.results); they are only written to disk, into a
+# directory of their own, if persist_results is set
+if persist_results:
+    logging.info("Store the results in {0}".format(save_results(energysystem)))
 
 # define an alias for shorter calls below (optional)
 results = energysystem.results["main"]
@@ -13,11 +13,13 @@ import pprint as pp
 import xarray as xr
 import numpy as np
 
-# changing working directory to use module from source
-os.chdir("../../src")
+# OWEFE modules (install the package with 'pip install -e .')
 
-import src.specs.photovoltaic_panel as photovoltaic_panel
-os.chdir("../examples/photovoltaic reverse osmosis")
+import owefe.specs.photovoltaic_panel as photovoltaic_panel
+from owefe.simulation import simulate
+from owefe.results import save_results
+# the input files are read from the directory of this script
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     import matplotlib.pyplot as plt
@@ -32,6 +34,7 @@ solver = "cbc"
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 24
 solver_verbose = False  # show/hide solver output
+persist_results = False  # store the results in a run directory of their own
 
 # initiate the logger (see the API docs for more information)
 logger.define_logging(
@@ -173,52 +176,29 @@ energysystem.add(solph.Sink(label="electricity production", inputs={bb: solph.Fl
 # Simulate the iWEFEs and plot the results
 ##########################################################################
 
-logging.info("Optimise the energy system")
-
-# initialise the operational model
-model = solph.Model(energysystem)
+logging.info("Simulate the iWEFEs")
 
 # This is for debugging only. It is not(!) necessary to solve the problem and
 # should be set to False to save time and disc space in normal use. For
 # debugging the timesteps should be set to 3, to increase the readability of
 # the lp-file.
 if debug:
+    model = solph.Model(energysystem)
     filename = os.path.join(
         solph.helpers.extend_basic_path("lp_files"), "basic_example.lp"
     )
     logging.info("Store lp-file in {0}.".format(filename))
     model.write(filename, io_options={"symbolic_solver_labels": True})
 
-# if tee_switch is true solver messages will be displayed
-logging.info("Solve the optimization problem")
-model.solve(solver=solver, solve_kwargs={"tee": solver_verbose})
-
-logging.info("Store the energy system with the results.")
-
-# The processing module of the outputlib can be used to extract the results
-# from the model transfer them into a homogeneous structured dictionary.
-
-# add result files
-energysystem.results["main"] = solph.processing.results(model)
-energysystem.results["meta"] = solph.processing.meta_results(model)
-
-# The default path is the '.oemof' folder in your $HOME directory.
-# The default filename is 'es_dump.oemof'.
-# You can omit the attributes (as None is the default value) for testing cases.
-# You should use unique names/folders for valuable results to avoid
-# overwriting.
-
-# store energy system with results
-energysystem.dump(dpath=None, filename=None)
-
-# ****************************************************************************
-# ********** PART 2 - Processing the results *********************************
-# ****************************************************************************
+# the iWEFEs only consists of fixed sources, transformers and free sinks, so its flows are
+# propagated directly; the optimization model is only built and solved if the system has degrees of
+# freedom (results and meta results are added to energysystem.results)
+simulate(energysystem, solver=solver, solve_kwargs={"tee": solver_verbose})
 
-logging.info("**** The script can be divided into two parts here.")
-logging.info("Restore the energy system and the results.")
-energysystem = solph.EnergySystem()
-energysystem.restore(dpath=None, filename=None)
+# the results stay in memory (energysystem.results); they are only written to disk, into a
+# directory of their own, if persist_results is set
+if persist_results:
+    logging.info("Store the results in {0}".format(save_results(energysystem)))
 
 # define an alias for shorter calls below (optional)
 results = energysystem.results["main"]
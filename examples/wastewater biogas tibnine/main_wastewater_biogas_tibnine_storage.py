@@ -1,4 +1,4 @@
-'************* Tibnine Wastewater Biogas Project ************'
+# ************* Tibnine Wastewater Biogas Project ************
 '''
    General description
    ----------------------
@@ -38,20 +38,24 @@ import logging
 import os
 import pandas as pd
 import pprint as pp
-import numpy as np
 
 try:
     import matplotlib.pyplot as plt
 except ImportError:
     plt = None
 
-# changing cwd to use the function from the main file
-os.chdir("../../src/")
-from src.specs.digester_CSTR import Digester
-from digester_demand import HeatCalculation
-from digester_demand import ElectricityCalculation
+# OWEFE modules (install the package with 'pip install -e .')
+from owefe.specs.digester_CSTR import Digester
+from owefe.results import save_results
+from owefe.scenario_store import ScenarioStore
+from owefe.cache import ResultCache
+from owefe import profiling
+from owefe.digester_demand import calc_heat_demand
+from owefe.digester_demand import calc_electricity_demand
+from tibnine_model import create_energysystem
 
-os.chdir("../examples/wastewater biogas tibnine")
+# the input files are read from the directory of this script
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 # *********************************************************************************************
 # set up oemof.solph
@@ -61,6 +65,15 @@ solver = "cbc"
 debug = True  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 8760  # 24 hour * 365 days
 solver_verbose = False  # show/hide solver output
+persist_results = False  # store the results in a run directory of their own
+use_cache = False  # reuse the results of an identical earlier run (see owefe.cache)
+# path of a scenario database (e.g. "tibnine_scenarios.sqlite") to record this run in
+scenario_db = None
+# record time and memory of the phases in profile.json and profile.folded (see owefe.profiling)
+profile = False
+
+if profile:
+    profiling.enable(sample_interval=0.05)
 
 # initiate the logger (see the API docs for more information)
 logger.define_logging(
@@ -74,14 +87,14 @@ logging.info("Initialize the energy system")
 date_time_index = pd.date_range(
     "1/1/2020", periods=number_of_time_steps, freq="H")
 
-energysystem = solph.EnergySystem(timeindex=date_time_index)
 print(date_time_index)
 
 # *********************************************************************************************
 # inputs
 # *********************************************************************************************
 # Read input data file
-data = pd.read_csv(r"ww_biogas_tibnine_raw.csv")
+with profiling.phase("read inputs"):
+    data = pd.read_csv(r"ww_biogas_tibnine_raw.csv")
 # Units of raw data file: dewatered_sludge [kg/h], heat demand [kW],
 # electricity demand [kW], water demand [m³/h], timestep: H
 
@@ -106,23 +119,23 @@ retention_time = 30  # [d]
 temp_digester = 37  # [°C] operation temperature of th digester
 # source all of the above:  El Joauhari et al al. (2021)
 
-# Digester Design
-digester_design = Digester(retention_time, design_mass_flow, sludge_density,
-                 sludge_specific_gravity, dry_solid_concentration, volatile_solid_concentration, biomethane_potential)
-diameter, volume, f_m_cf, surface_area_total, active_volume, organic_loading_rate, design_volumetric_flow = digester_design.compute()
-
-
-for i, r in data.iterrows():
-    heat_demand = HeatCalculation(temp_ambient=r['temperature'], heat_transfer_coefficient=0.6,
-                                  temp_digester=temp_digester, surface_area=surface_area_total,
-                                  heat_capacity=sludge_heat_capacity, average_mass_flow=average_mass_flow)
-    data.loc[i, "heat_demand_digester"] = heat_demand.compute()
-
-data.to_csv("ww_biogas_tibnine_proceed.csv", index=False)
-
-for i, r in data.iterrows():
-    electricity_demand_digester = ElectricityCalculation(average_volumetric_flow=average_volumetric_flow, active_volume=active_volume)
-    data.loc[i, "electricity_demand_digester"] = electricity_demand_digester.compute()
+with profiling.phase("pre-processing"):
+    # Digester Design
+    digester_design = Digester(retention_time, design_mass_flow, sludge_density,
+                               sludge_specific_gravity, dry_solid_concentration,
+                               volatile_solid_concentration, biomethane_potential)
+    (diameter, volume, f_m_cf, surface_area_total, active_volume, organic_loading_rate,
+     design_volumetric_flow) = digester_design.compute()
+
+    # heat and electricity demand of the digester for all time steps at once
+    data["heat_demand_digester"] = calc_heat_demand(temp_ambient=data['temperature'],
+                                                    heat_transfer_coefficient=0.6,
+                                                    temp_digester=temp_digester,
+                                                    surface_area=surface_area_total,
+                                                    heat_capacity=sludge_heat_capacity,
+                                                    average_mass_flow=average_mass_flow)
+    data["electricity_demand_digester"] = calc_electricity_demand(
+        average_volumetric_flow=average_volumetric_flow, active_volume=active_volume)
 
 data.to_csv("ww_biogas_tibnine_proceed.csv", index=False)
 
@@ -178,91 +191,10 @@ a_file.close()
 # *********************************************************************************************
 logging.info("Create iWEFEs objects")
 
-# The bus objects were assigned to variables which makes it easier to connect
-# components to these buses (see below).
-
-# create sludge influent bus
-bsld = solph.Bus(label="sludge")
-
-# create electricity bus
-bel = solph.Bus(label="electricity")
-
-# create methane bus
-bch4 = solph.Bus(label="methane")
-
-# create heat bus
-bheat = solph.Bus(label="heat")
-
-# adding the buses to the energy system
-energysystem.add(bsld, bel, bch4, bheat)
-
-# create excess sink for the biogas bus to allow overproduction
-energysystem.add(solph.Sink(label="excess_biogas", inputs={bch4: solph.Flow()}))
-
-# create excess sink to represent electricity production
-energysystem.add(solph.Sink(label="electricity production", inputs={bel: solph.Flow()}))
-
-# create excess sink to represent heat production
-energysystem.add(solph.Sink(label="excess heat production", inputs={bheat: solph.Flow()}))
-
-# create fixed source object representing domestic sewage
-energysystem.add(
-    solph.Source(
-        label="dewatered_sludge",
-        outputs={bsld: solph.Flow(fix=data["dewatered_sludge"], nominal_value=1)},
-    )
-)
-
-energysystem.add(
-    solph.Sink(
-        label="electricity demand digester",
-        inputs={bel: solph.Flow(fix=data["electricity_demand_digester"], nominal_value=1)},
-    )
-)
-# # create sink object representing the heat demand
-
-
-energysystem.add(
-    solph.Sink(
-        label="heat demand digester",
-        inputs={bheat: solph.Flow(fix=data["heat_demand_digester"], nominal_value=1)},
-    )
-)
-
-# create dewatered sludge storage
-storage = solph.components.GenericStorage(
-    nominal_storage_capacity=1000000,
-    label="dewatered sludge storage",
-    inputs={bsld: solph.Flow()},
-    outputs={bsld: solph.Flow()},
-    loss_rate=0.00,
-    initial_storage_level=None,
-    inflow_conversion_factor=1,
-    outflow_conversion_factor=1,
-)
-
-energysystem.add(storage)
-
-energysystem.add(
-    solph.Transformer(
-        label="anaerobic digester",
-        inputs={bsld: solph.Flow(nominal_value=average_mass_flow)},  # constant inflow for CSTR digester
-        outputs={bch4: solph.Flow()},
-        conversion_factors={bch4: f_m_cf},
-    )
-)
-
-energysystem.add(
-    solph.Transformer(
-        label="CHP",
-        inputs={bch4: solph.Flow()},
-        outputs={bel: solph.Flow(nominal_value=10e5),
-                 bheat: solph.Flow(nominal_value=10e5)},
-        conversion_factors={bel: 0.9*0.35*9.4, bheat: 0.9*0.65*9.4},  # biogas boiler efficiency: 0.9 (BAU, 2021);
-        # biogas engine efficiency 0.35 (BAU, 2021); heat value of methane: 34 MJ/m³ -> 9.4 kWh/m³
-        # thermal conversion factor: 0.65
-    )
-)
+# the iWEFEs are defined in tibnine_model.py, which also builds them for the headless scenario runs
+# (owefe run tibnine_scenarios.json)
+with profiling.phase("build energy system"):
+    energysystem = create_energysystem(date_time_index, data, average_mass_flow, f_m_cf)
 
 ##########################################################################
 # Simulate the iWEFEs and plot the results
@@ -270,50 +202,66 @@ energysystem.add(
 
 logging.info("Simulate the iWEFEs")
 
-# initialise the operational model
-model = solph.Model(energysystem)
-
-# This is for debugging only. It is not(!) necessary to solve the problem and
-# should be set to False to save time and disc space in normal use. For
-# debugging the timesteps should be set to 3, to increase the readability of
-# the lp-file.
-if debug:
-    filename = os.path.join(
-        solph.helpers.extend_basic_path("lp_files"), "ww_biogas_tibnine_proceed.lp"
+# with use_cache, the results of an identical earlier run (same inputs, parameters, solver and
+# versions) are taken from the cache and the model is not built at all
+cache = ResultCache() if use_cache else None
+cache_key = None if cache is None else cache.key(energysystem, solver, {"tee": solver_verbose})
+if cache is not None and cache.get(cache_key, energysystem) is not None:
+    logging.info("Results taken from the cache: {0}".format(cache.stats()))
+else:
+    # initialise the operational model
+    with profiling.phase("build model"):
+        model = solph.Model(energysystem)
+
+    # This is for debugging only. It is not(!) necessary to solve the problem and
+    # should be set to False to save time and disc space in normal use. For
+    # debugging the timesteps should be set to 3, to increase the readability of
+    # the lp-file.
+    if debug:
+        filename = os.path.join(
+            solph.helpers.extend_basic_path("lp_files"), "ww_biogas_tibnine_proceed.lp"
+        )
+        logging.info("Store lp-file in {0}.".format(filename))
+        model.write(filename, io_options={"symbolic_solver_labels": True})
+
+    # if tee_switch is true solver messages will be displayed
+    logging.info("Solve the optimization problem")
+    with profiling.phase("solve"):
+        model.solve(solver=solver, solve_kwargs={"tee": solver_verbose})
+
+    logging.info("Process the results.")
+
+    # The processing module of the outputlib can be used to extract the results
+    # from the model transfer them into a homogeneous structured dictionary.
+
+    # add results to the energy system to make it possible to store them.
+    with profiling.phase("process results"):
+        energysystem.results["main"] = solph.processing.results(model)
+        energysystem.results["meta"] = solph.processing.meta_results(model)
+
+    if cache is not None:
+        cache.put(cache_key, energysystem)
+
+# the results stay in memory (energysystem.results); they are only written to disk, into a
+# directory of their own, if persist_results is set
+results_path = None
+if persist_results:
+    results_path = save_results(energysystem)
+    logging.info("Store the results in {0}".format(results_path))
+
+if scenario_db is not None:
+    run_id = ScenarioStore(scenario_db).add_run(
+        "tibnine",
+        {"retention_time": retention_time, "temp_digester": temp_digester,
+         "design_mass_flow": design_mass_flow, "dry_solid_concentration": dry_solid_concentration,
+         "volatile_solid_concentration": volatile_solid_concentration,
+         "biomethane_potential": biomethane_potential,
+         "number_of_time_steps": number_of_time_steps},
+        design=digester_design.compute(), results=energysystem.results["main"],
+        meta=energysystem.results["meta"],
+        results_path=results_path,
     )
-    logging.info("Store lp-file in {0}.".format(filename))
-    model.write(filename, io_options={"symbolic_solver_labels": True})
-
-# if tee_switch is true solver messages will be displayed
-logging.info("Solve the optimization problem")
-model.solve(solver=solver, solve_kwargs={"tee": solver_verbose})
-
-logging.info("Store the energy system with the results.")
-
-# The processing module of the outputlib can be used to extract the results
-# from the model transfer them into a homogeneous structured dictionary.
-
-# add results to the energy system to make it possible to store them.
-energysystem.results["main"] = solph.processing.results(model)
-energysystem.results["meta"] = solph.processing.meta_results(model)
-
-# The default path is the '.oemof' folder in your $HOME directory.
-# The default filename is 'es_dump.oemof'.
-# You can omit the attributes (as None is the default value) for testing cases.
-# You should use unique names/folders for valuable results to avoid
-# overwriting.
-
-# store energy system with results
-energysystem.dump(dpath=None, filename=None)
-
-# ****************************************************************************
-# ********** PART 2 - Processing the results *********************************
-# ****************************************************************************
-
-logging.info("**** The script can be divided into two parts here.")
-logging.info("Restore the energy system and the results.")
-energysystem = solph.EnergySystem()
-energysystem.restore(dpath=None, filename=None)
+    logging.info("Recorded run {0} in {1}".format(run_id, scenario_db))
 
 # define an alias for shorter calls below (optional)
 results = energysystem.results["main"]
@@ -348,76 +296,77 @@ dewatered_sludge = pd.Series(dewatered_sludge_ls,
 
 
 if plt is not None:
-
-    fig, ax = plt.subplots(figsize=(10,5))
-    sludge_bus["sequences"].plot(
-        ax=ax, kind="line", drawstyle="steps-post", ylim=[0, None]
-    )
-    plt.legend(
-        loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
-    )
-    fig.subplots_adjust(top=0.8, bottom=0.15)
-    plt.title("Dewatered Sludge Bus")
-    plt.xlabel("Time Period")
-    plt.ylabel("Mass Flow [kg/h]")
-    plt.show()
-
-    fig, ax = plt.subplots(figsize=(10,5))
-    storage_sequence_m3.plot(
-        ax=ax, kind="line", drawstyle="steps-post"
-    )
-    plt.legend(
-        loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
-    )
-    fig.subplots_adjust(top=0.8, bottom=0.15)
-    plt.title("Dewatered Sludge Storage")
-    plt.xlabel("Time Period")
-    plt.ylabel("Storage Content [m³]")
-    plt.show()
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    methane_bus["sequences"].plot(
-    ax= ax, kind="line", drawstyle="steps-post", ylim=[0, 10]
-    )
-    plt.legend(
-        loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
-    )
-    fig.subplots_adjust(top=0.8, bottom=0.15)
-    plt.title("Methane_Bus")
-    plt.xlabel("Time Period [h]")
-    plt.ylabel("Methane Production [m³/h]")
-    plt.show()
-    fig, ax = plt.subplots(figsize=(10, 5))
-    electricity_bus["sequences"].plot(
-        ax=ax, kind="line", drawstyle="steps-post", ylim=[0, 70]
-    )
-    electricity_demand.plot(
-       ax=ax, kind="line", drawstyle="steps-post"
-    )
-    plt.legend(
-        loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
-    )
-    fig.subplots_adjust(top=0.8, bottom=0.15)
-    plt.title("Electricity Bus")
-    plt.xlabel("Time Period [h]")
-    plt.ylabel("Electrical Energy [kWh]")
-    plt.show()
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    heat_bus["sequences"].plot(
-        ax=ax, kind="line", drawstyle="steps-post"
-    )
-    plt.legend(
-        loc="upper center",
-        prop={"size": 8},
-        bbox_to_anchor=(0.5, 1.3),
-        ncol=3,
-    )
-    fig.subplots_adjust(top=0.8, bottom=0.15)
-    plt.title("Heat Bus")
-    plt.xlabel("Time Period [h]")
-    plt.ylabel("Heat [kWh]")
-    plt.show()
+    with profiling.phase("plotting"):
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        sludge_bus["sequences"].plot(
+            ax=ax, kind="line", drawstyle="steps-post", ylim=[0, None]
+        )
+        plt.legend(
+            loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
+        )
+        fig.subplots_adjust(top=0.8, bottom=0.15)
+        plt.title("Dewatered Sludge Bus")
+        plt.xlabel("Time Period")
+        plt.ylabel("Mass Flow [kg/h]")
+        plt.show()
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        storage_sequence_m3.plot(
+            ax=ax, kind="line", drawstyle="steps-post"
+        )
+        plt.legend(
+            loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
+        )
+        fig.subplots_adjust(top=0.8, bottom=0.15)
+        plt.title("Dewatered Sludge Storage")
+        plt.xlabel("Time Period")
+        plt.ylabel("Storage Content [m³]")
+        plt.show()
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        methane_bus["sequences"].plot(
+            ax=ax, kind="line", drawstyle="steps-post", ylim=[0, 10]
+        )
+        plt.legend(
+            loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
+        )
+        fig.subplots_adjust(top=0.8, bottom=0.15)
+        plt.title("Methane_Bus")
+        plt.xlabel("Time Period [h]")
+        plt.ylabel("Methane Production [m³/h]")
+        plt.show()
+        fig, ax = plt.subplots(figsize=(10, 5))
+        electricity_bus["sequences"].plot(
+            ax=ax, kind="line", drawstyle="steps-post", ylim=[0, 70]
+        )
+        electricity_demand.plot(
+            ax=ax, kind="line", drawstyle="steps-post"
+        )
+        plt.legend(
+            loc="upper center", prop={"size": 8}, bbox_to_anchor=(0.5, 1.3), ncol=2
+        )
+        fig.subplots_adjust(top=0.8, bottom=0.15)
+        plt.title("Electricity Bus")
+        plt.xlabel("Time Period [h]")
+        plt.ylabel("Electrical Energy [kWh]")
+        plt.show()
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        heat_bus["sequences"].plot(
+            ax=ax, kind="line", drawstyle="steps-post"
+        )
+        plt.legend(
+            loc="upper center",
+            prop={"size": 8},
+            bbox_to_anchor=(0.5, 1.3),
+            ncol=3,
+        )
+        fig.subplots_adjust(top=0.8, bottom=0.15)
+        plt.title("Heat Bus")
+        plt.xlabel("Time Period [h]")
+        plt.ylabel("Heat [kWh]")
+        plt.show()
 
 # ***************************************************************************
 #  print and export the results
@@ -443,4 +392,9 @@ dfcomb = pd.DataFrame(comb_sum, columns=["Value"])
 dfcomb.to_csv("main_results.csv", index=True)
 dfcomb.info()
 print(comb_sum)
-print("----------")
\ No newline at end of file
+print("----------")
+
+if profile:
+    profiling.disable()
+    profiling.write_json("profile.json")
+    profiling.write_folded("profile.folded")
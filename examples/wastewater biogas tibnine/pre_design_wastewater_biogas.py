@@ -0,0 +1,36 @@
+# digester models are part of the owefe package (pip install -e .)
+# Proceeded csv file will be auto generated in the same directory
+
+import pandas as pd
+from owefe.digester_explorer import TIBNINE_FEEDSTOCK
+from owefe.specs.digester_CSTR import Digester
+from owefe.digester_demand import calc_heat_demand
+from owefe.digester_demand import calc_electricity_demand
+
+inpdf = pd.read_csv(r'Your csv file')
+# incoming organic matter flow
+design_flow = inpdf["wastewater"].max()
+# heat capacity of organic matter flow in this case: dewatered sludge assumed to be same as water Cp = 4200 J/kg °C;
+# Source: El Joauhari et al. 2021
+heat_capacity_sludge = 4200
+print(design_flow)
+
+retention_time = 22
+digester_design = Digester(retention_time=retention_time, design_mass_flow=design_flow,
+                           **{name: TIBNINE_FEEDSTOCK[name] for name in Digester.parameters
+                              if name in TIBNINE_FEEDSTOCK})
+diameter, volume, bg_prod, surface_area_total = digester_design.compute()[:4]
+print('surface_area_total: ', round(surface_area_total, 2))
+
+inpdf["heat_demand_digester"] = calc_heat_demand(temp_ambient=inpdf['temperature'],
+                                                 heat_transfer_coefficient=0.6, temp_digester=35,
+                                                 surface_area=surface_area_total,
+                                                 heat_capacity=heat_capacity_sludge,
+                                                 average_mass_flow=design_flow)
+
+inpdf.to_csv("ww_biogas_tibnine_proceed.csv", index=False)
+
+inpdf["electricity_demand_digester"] = calc_electricity_demand(
+    average_volumetric_flow=inpdf['wastewater'], active_volume=volume)
+
+inpdf.to_csv("proceeded csv file", index=False)
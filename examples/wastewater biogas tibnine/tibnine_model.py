@@ -0,0 +1,170 @@
+# ************* Tibnine Wastewater Biogas Model ************
+'''
+   General description
+   ----------------------
+   The iWEFEs of the Tibnine wastewater biogas project as importable build function, shared by
+   main_wastewater_biogas_tibnine_storage.py and the headless runs of the scenario files
+   (owefe run tibnine_scenarios.json).
+
+   Timestep: hour (other resolutions average or repeat the input data)
+            Input: dewatered sludge [kg/h]
+            # Methane CH4  1m3 CH4 = 34 MJ : 3.6 MJ ~ 1 khw (source: IRENA statistics 2016)
+
+   Data
+   ------
+   ww_biogas_tibnine_raw.csv
+'''
+
+import os
+
+import pandas as pd
+from oemof import solph
+
+from owefe.digester_demand import calc_electricity_demand, calc_heat_demand
+from owefe.scenarios import fit_profiles
+from owefe.synthetic import read_inputs, read_settings
+from owefe.specs.digester_CSTR import Digester
+
+# hourly input data of one year
+RAW_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ww_biogas_tibnine_raw.csv")
+
+# CHP conversion factors: biogas boiler efficiency 0.9 (BAU, 2021), biogas engine efficiency 0.35
+# (BAU, 2021), thermal share 0.65, heat value of methane 34 MJ/m³ -> 9.4 kWh/m³
+CHP_ELECTRICITY = 0.9 * 0.35 * 9.4
+CHP_HEAT = 0.9 * 0.65 * 9.4
+
+
+def create_energysystem(date_time_index, data, average_mass_flow, conversion_factor):
+    # builds the iWEFEs for the input data (columns dewatered_sludge, electricity_demand_digester
+    # and heat_demand_digester, one row per time step) and the feed to methane conversion factor of
+    # the digester
+    energysystem = solph.EnergySystem(timeindex=date_time_index)
+
+    # create sludge influent, electricity, methane and heat bus
+    bsld = solph.Bus(label="sludge")
+    bel = solph.Bus(label="electricity")
+    bch4 = solph.Bus(label="methane")
+    bheat = solph.Bus(label="heat")
+    energysystem.add(bsld, bel, bch4, bheat)
+
+    # excess sinks for the biogas overproduction and to represent the electricity and heat
+    # production
+    energysystem.add(solph.Sink(label="excess_biogas", inputs={bch4: solph.Flow()}))
+    energysystem.add(solph.Sink(label="electricity production", inputs={bel: solph.Flow()}))
+    energysystem.add(solph.Sink(label="excess heat production", inputs={bheat: solph.Flow()}))
+
+    # fixed source of the dewatered sludge and the energy demand of the digester
+    energysystem.add(solph.Source(label="dewatered_sludge", outputs={bsld: solph.Flow(
+        fix=data["dewatered_sludge"].to_numpy(), nominal_value=1)}))
+    energysystem.add(solph.Sink(label="electricity demand digester", inputs={bel: solph.Flow(
+        fix=data["electricity_demand_digester"].to_numpy(), nominal_value=1)}))
+    energysystem.add(solph.Sink(label="heat demand digester", inputs={bheat: solph.Flow(
+        fix=data["heat_demand_digester"].to_numpy(), nominal_value=1)}))
+
+    # dewatered sludge storage in front of the digester
+    energysystem.add(solph.components.GenericStorage(
+        nominal_storage_capacity=1000000,
+        label="dewatered sludge storage",
+        inputs={bsld: solph.Flow()},
+        outputs={bsld: solph.Flow()},
+        loss_rate=0.00,
+        initial_storage_level=None,
+        inflow_conversion_factor=1,
+        outflow_conversion_factor=1,
+    ))
+
+    energysystem.add(solph.Transformer(
+        label="anaerobic digester",
+        # constant inflow for CSTR digester
+        inputs={bsld: solph.Flow(nominal_value=average_mass_flow)},
+        outputs={bch4: solph.Flow()},
+        conversion_factors={bch4: conversion_factor},
+    ))
+    energysystem.add(solph.Transformer(
+        label="CHP",
+        inputs={bch4: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=10e5), bheat: solph.Flow(nominal_value=10e5)},
+        conversion_factors={bel: CHP_ELECTRICITY, bheat: CHP_HEAT},
+    ))
+    return energysystem
+
+
+def prepare_inputs(timeindex, retention_time=30, temp_digester=37, sludge_density=997,
+                   sludge_specific_gravity=1.02, sludge_heat_capacity=4200,
+                   dry_solid_concentration=0.15, volatile_solid_concentration=0.7,
+                   biomethane_potential=0.3403, input_file=RAW_DATA):
+
+    r"""
+    Designs the digester and prepares the input data of the Tibnine iWEFEs for a time index
+    ----
+    Parameters
+    ----------
+    timeindex: pd.DatetimeIndex of the model; the input data are repeated and averaged (coarser time
+        steps) or repeated (finer time steps) to fit it
+    retention_time: retention time of the digester [d]
+    temp_digester: operation temperature of the digester [°C]
+    sludge_density, sludge_specific_gravity, sludge_heat_capacity, dry_solid_concentration,
+    volatile_solid_concentration, biomethane_potential: feedstock characteristics (El Joauhari et
+        al. 2021)
+    input_file: hourly input data with the columns dewatered_sludge and temperature, or a parquet
+        file of synthetic inputs of any resolution (owefe generate, the first site of the file is
+        used)
+
+    Returns
+    -------
+    data : pd.DataFrame: dewatered_sludge [kg/h], temperature [°C], heat_demand_digester [kW] and
+         electricity_demand_digester [kW], indexed by timeindex
+    average_mass_flow : float:
+         design mass flow of the digester [kg/h]
+    design : owefe.specs.digester.DigesterDesign:
+         design of the digester
+
+    """
+    if input_file.endswith(".parquet"):
+        raw = read_inputs(input_file, columns=["dewatered_sludge", "temperature"])
+        raw = raw.reset_index(drop=True)
+        freq = read_settings(input_file)["freq"]
+    else:
+        raw = pd.read_csv(input_file, usecols=["dewatered_sludge", "temperature"])
+        freq = "1h"
+    average_mass_flow = raw["dewatered_sludge"].mean()  # [kg/h]
+    # average volumetric flow [m³/h]
+    average_volumetric_flow = average_mass_flow / (sludge_specific_gravity * sludge_density)
+    design = Digester(retention_time, average_mass_flow, sludge_density, sludge_specific_gravity,
+                      dry_solid_concentration, volatile_solid_concentration,
+                      biomethane_potential).compute()
+
+    data = fit_profiles(raw, timeindex, freq=freq)
+    data["heat_demand_digester"] = calc_heat_demand(
+        temp_ambient=data["temperature"], heat_transfer_coefficient=0.6,
+        temp_digester=temp_digester, surface_area=design.surface_area,
+        heat_capacity=sludge_heat_capacity, average_mass_flow=average_mass_flow)
+    data["electricity_demand_digester"] = calc_electricity_demand(
+        average_volumetric_flow=average_volumetric_flow, active_volume=design.active_volume)
+    return data, average_mass_flow, design
+
+
+def build(timeindex, retention_time=30, temp_digester=37, sludge_density=997,
+          sludge_specific_gravity=1.02, sludge_heat_capacity=4200, dry_solid_concentration=0.15,
+          volatile_solid_concentration=0.7, biomethane_potential=0.3403,
+          input_file=RAW_DATA):
+
+    r"""
+    Designs the digester and builds the Tibnine iWEFEs for a time index
+    ----
+    Parameters
+    ----------
+    timeindex, retention_time, temp_digester, sludge_density, sludge_specific_gravity,
+    sludge_heat_capacity, dry_solid_concentration, volatile_solid_concentration,
+    biomethane_potential, input_file: see prepare_inputs()
+
+    Returns
+    -------
+    energysystem : solph.EnergySystem
+
+    """
+    data, average_mass_flow, design = prepare_inputs(
+        timeindex, retention_time, temp_digester, sludge_density, sludge_specific_gravity,
+        sludge_heat_capacity, dry_solid_concentration, volatile_solid_concentration,
+        biomethane_potential, input_file)
+    return create_energysystem(timeindex, data, average_mass_flow, design.conversion_factor)
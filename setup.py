@@ -30,7 +30,7 @@ setup(
     # There are some restrictions on what makes a valid project name
     # specification here:
     # https://packaging.python.org/specifications/core-metadata/#name
-    name="rli_template",  # Required
+    name="owefe",  # Required
     # Versions should comply with PEP 440:
     # https://www.python.org/dev/peps/pep-0440/
     #
@@ -127,7 +127,7 @@ setup(
     #
     # For an analysis of "install_requires" vs pip's requirements files see:
     # https://packaging.python.org/en/latest/requirements.html
-    install_requires=[],  # Optional
+    install_requires=["oemof.solph>=0.4.4,<0.5", "pandas", "numpy", "pyarrow>=6.0.0"],  # Optional
     # List additional groups of dependencies here (e.g. development
     # dependencies). Users will be able to install these using the "extras"
     # syntax, for example:
@@ -136,7 +136,7 @@ setup(
     #
     # Similar to `install_requires` above, these must be valid existing
     # projects.
-    extras_require={"dev": [], "test": []},  # Optional
+    extras_require={"dev": ["flake8", "pylint", "black"], "test": ["pytest"]},  # Optional
     # If there are data files included in your packages that need to be
     # installed, specify them here.
     #
@@ -163,6 +163,11 @@ setup(
     #         'sample=sample:main',
     #     ],
     # },
+    entry_points={
+        "console_scripts": [
+            "owefe=owefe.cli:main",
+        ],
+    },
     # List additional URLs that are relevant to your project as a dict.
     #
     # This field corresponds to the "Project-URL" metadata fields:
@@ -0,0 +1,47 @@
+# -*- coding: utf-8
+
+"""
+OWEFE - Open Water-Energy-Food-Environment nexus models based on oemof.solph.
+This file is part of the project OWEFE;
+The submodules are imported on first access, so `import owefe` and the spec modules load without
+oemof, Pyomo or pandas; the optimization modules pull in oemof.solph only when they are used.
+
+    >>> import owefe
+    >>> owefe.specs.plant.calc_te(t_air, t_base=5, t_opt=20)  # imports owefe.specs.plant
+    >>> owefe.simulation.simulate(energysystem)  # imports oemof.solph
+"""
+
+import importlib
+
+__version__ = "0.0.0"
+
+# submodules imported on first attribute access
+SUBMODULES = (
+    "aggregation",
+    "cache",
+    "cli",
+    "digester_demand",
+    "digester_explorer",
+    "parametric_model",
+    "profiling",
+    "results",
+    "rolling_horizon",
+    "scenarios",
+    "scenario_runner",
+    "scenario_store",
+    "simulation",
+    "specs",
+    "synthetic",
+)
+
+__all__ = ["__version__", *SUBMODULES]
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,365 @@
+# -*- coding: utf-8
+
+"""
+This module reduces iWEFE models to typical periods.
+This file is part of the project OWEFE;
+aggregate_periods() cuts the input time series into periods (e.g. days), clusters them with
+k-medoids and keeps one medoid period per cluster, weighted by the number of periods it represents.
+The reduced energy system is built on the typical periods only. solve_typical_periods() weights the
+costs of each typical period, links the storages across the original period sequence and
+disaggregates the results back to the full index.
+
+    ********** Storage linking ************
+    Following Kotzur et al. (2018), the storage content within a typical period (intra-period
+    content) starts at zero in every typical period; an inter-period level is carried along the
+    original sequence of periods:
+    inter[p + 1] = inter[p] * (1 - loss_rate) ** period_hours + intra[k(p), end]
+    with k(p) the typical period of period p. The storage bounds are applied to inter[p] plus the
+    minimum and maximum intra-period content of k(p), the lower bound with inter[p] decayed over the
+    whole period, so the content in hour t of period p, inter[p] * decay(t) + intra[k(p), t], stays
+    within the bounds. All occurrences of a typical period share its operation, so the costs are an
+    upper bound of those of the full model.
+
+    ********** Example ************
+    >>> data = pd.read_csv("ww_biogas_tibnine_raw.csv")
+    >>> inputs = data[["dewatered_sludge", "temperature", "demand_electricity"]]
+    >>> timeindex = pd.date_range("1/1/2020", periods=8760, freq="H")
+    >>> typical = aggregate_periods(inputs, n_periods=12, period_length=24, timeindex=timeindex)
+    >>> energysystem = create_energysystem(typical.timeindex, typical.profiles)  # 12 * 24 steps
+    >>> results = solve_typical_periods(energysystem, typical)  # results on the 8760 steps
+    >>> typical.error  # normalised RMSE of the inputs
+
+aggregate_energysystem() reduces an energy system built on the full time index instead, from the
+time series of its nodes and flows; scenario files select it with an "aggregation" entry (see
+owefe.scenarios).
+"""
+
+from collections import abc, namedtuple
+import logging
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from pyomo.environ import Block, Constraint, Var
+
+from .simulation import timeincrement
+
+
+class TypicalPeriods(namedtuple("TypicalPeriods", [
+        "profiles", "weights", "assignment", "period_length", "timeindex", "full_index", "error"])):
+    r"""
+    Typical periods of aggregate_periods
+    ----
+    Fields
+    ----------
+    profiles: pd.DataFrame with the input columns of all typical periods one after the other,
+        indexed by timeindex
+    weights: number of original periods represented by each typical period
+    assignment: typical period of every original period
+    period_length: number of time steps per period
+    timeindex: time index of the reduced model (the first n_periods * period_length steps of
+        full_index)
+    full_index: time index of the original time series
+    error: normalised root mean square error of the represented inputs per column
+    """
+    __slots__ = ()
+
+    def disaggregate(self, values):
+        # maps values of the typical periods (first axis n_periods * period_length) to the original
+        # periods
+        values = np.asarray(values)
+        periods = values.reshape((len(self.weights), self.period_length) + values.shape[1:])
+        return periods[self.assignment].reshape((-1,) + values.shape[1:])
+
+
+def aggregate_periods(data, n_periods, period_length=24, timeindex=None, seed=0, max_iter=100):
+
+    r"""
+    Selects typical periods of the input time series by k-medoids clustering
+    ----
+    Parameters
+    ----------
+    data: pd.DataFrame of input time series; all columns are clustered together, each scaled to
+        [0, 1]
+    n_periods: number of typical periods
+    period_length: number of time steps per period (24 for typical days of hourly data)
+    timeindex: pd.DatetimeIndex of data, defaults to data.index
+    seed: seed of the k-medoids++ initialisation
+    max_iter: maximum number of medoid updates
+
+    Returns
+    -------
+    typical : TypicalPeriods
+
+    """
+    timeindex = data.index if timeindex is None else timeindex
+    values = data.to_numpy(dtype=np.float64)
+    if len(values) % period_length:
+        raise ValueError(f"Length of data ({len(values)}) is not a multiple of period_length "
+                         f"({period_length})")
+    n_original = len(values) // period_length
+    if not 0 < n_periods <= n_original:
+        raise ValueError(f"Argument 'n_periods' must be between 1 and the number of periods "
+                         f"({n_original})")
+
+    span = values.max(axis=0) - values.min(axis=0)
+    scaled = (values - values.min(axis=0)) / np.where(span > 0, span, 1)
+    vectors = scaled.reshape(n_original, -1)
+    medoids, assignment = _k_medoids(vectors, n_periods, np.random.default_rng(seed), max_iter)
+
+    order = np.argsort(medoids)  # keep the typical periods in chronological order
+    medoids = medoids[order]
+    assignment = np.argsort(order)[assignment]
+    profiles = values.reshape(n_original, period_length, -1)[medoids].reshape(-1, values.shape[1])
+    reduced_index = timeindex[:len(profiles)]
+
+    represented = profiles.reshape(n_periods, period_length, -1)[assignment].reshape(values.shape)
+    rmse = np.sqrt(np.mean((represented - values) ** 2, axis=0))
+    error = pd.Series(rmse / np.where(span > 0, span, 1), index=data.columns, name="nrmse")
+    logging.info("Aggregated {0} periods to {1} typical periods, max. NRMSE {2:.3f}".format(
+        n_original, n_periods, error.max()))
+    profiles = pd.DataFrame(profiles, index=reduced_index, columns=data.columns)
+    return TypicalPeriods(profiles=profiles, weights=np.bincount(assignment, minlength=n_periods),
+                          assignment=assignment, period_length=period_length,
+                          timeindex=reduced_index, full_index=timeindex, error=error)
+
+
+def aggregate_energysystem(energysystem, n_periods, period_length=24, seed=0, max_iter=100):
+
+    r"""
+    Reduces an energy system built on the full time index to typical periods, in place
+    All time series of the nodes and their output flows (e.g. fixed profiles, variable costs,
+    conversion factors) are clustered together and replaced by their values in the typical periods.
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem; its time index becomes the time index of the typical periods
+    n_periods, period_length, seed, max_iter: see aggregate_periods()
+
+    Returns
+    -------
+    typical : TypicalPeriods:
+         to be passed to solve_typical_periods() with the reduced energysystem
+
+    """
+    n = len(energysystem.timeindex)
+    series = {}
+    targets = []  # (attribute dict, name) of every time series
+    for node in energysystem.nodes:
+        containers = [vars(node)]
+        containers += [value for value in vars(node).values() if isinstance(value, dict)]
+        containers += [vars(flow) for flow in node.outputs.values()]
+        for container in containers:
+            for name, value in container.items():
+                if _is_time_series(value, n):
+                    series[len(targets)] = np.asarray(value, dtype=np.float64)
+                    targets.append((container, name))
+    if not targets:
+        series[0] = np.zeros(n)  # no time series, all periods are alike
+
+    typical = aggregate_periods(pd.DataFrame(series, index=energysystem.timeindex), n_periods,
+                                period_length, seed=seed, max_iter=max_iter)
+    for position, (container, name) in enumerate(targets):
+        container[name] = typical.profiles[position].to_numpy()
+    energysystem.timeindex = typical.timeindex
+    return typical
+
+
+def solve_typical_periods(energysystem, typical, solver="cbc", solve_kwargs=None):
+
+    r"""
+    Solves an energy system built on typical periods and disaggregates its results
+    Costs of each typical period are weighted by the number of periods it represents. Balanced
+    storages (solph default) end the original horizon at their initial level, unbalanced ones end
+    freely.
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem with time index typical.timeindex
+    typical: TypicalPeriods returned by aggregate_periods
+    solver: solver passed to solph.Model.solve
+    solve_kwargs: keyword arguments passed to solph.Model.solve
+
+    Returns
+    -------
+    results : dict in the format of solph.processing.results on typical.full_index; the meta results
+         in energysystem.results["meta"] contain the aggregation settings and errors under
+         "aggregation"
+
+    """
+    storages = [nd for nd in energysystem.nodes if isinstance(nd, solph.components.GenericStorage)]
+    for storage in storages:
+        if storage.investment is not None:
+            raise ValueError(f"Storage {storage.label} with investment cannot be linked across "
+                             "typical periods")
+    balanced = {storage: storage.balanced for storage in storages}
+    for storage in storages:
+        storage.balanced = False
+
+    try:
+        # typical periods consist of time steps of equal duration
+        hours = float(timeincrement(energysystem)[0])
+        weighting = np.repeat(typical.weights, typical.period_length).astype(np.float64) * hours
+        model = solph.Model(energysystem, objective_weighting=weighting)
+        if storages:
+            _link_storages(model, storages, balanced, typical, hours)
+        model.solve(solver=solver, solve_kwargs=solve_kwargs or {})
+
+        # solph.processing reads every variable of the model, so the linking block is removed after
+        # reading it
+        inter_content = {}
+        if storages:
+            block = model.TypicalPeriodStorageBlock
+            periods = range(len(typical.assignment) + 1)
+            inter_content = {
+                storage: np.array([block.inter_content[storage, p].value for p in periods])
+                for storage in storages}
+            model.del_component(block)
+    finally:
+        # the storages keep their settings for further runs of the energy system
+        for storage, flag in balanced.items():
+            storage.balanced = flag
+
+    results = {}
+    for key, result in solph.processing.results(model).items():
+        sequences = result["sequences"]
+        values = typical.disaggregate(sequences.to_numpy())
+        results[key] = {"scalars": result["scalars"],
+                        "sequences": pd.DataFrame(values, index=typical.full_index,
+                                                  columns=sequences.columns)}
+    for storage, inter in inter_content.items():
+        decay = (1 - storage.loss_rate[0]) ** (hours * np.arange(1, typical.period_length + 1))
+        intra = results[storage, None]["sequences"]["storage_content"].to_numpy()
+        levels = np.repeat(inter[:-1], typical.period_length)
+        results[storage, None]["sequences"]["storage_content"] = (
+            levels * np.tile(decay, len(typical.assignment)) + intra)
+
+    if energysystem.results is None:
+        energysystem.results = {}
+    energysystem.results["main"] = results
+    energysystem.results["meta"] = solph.processing.meta_results(model)
+    energysystem.results["meta"]["aggregation"] = {
+        "typical_periods": len(typical.weights),
+        "period_length": typical.period_length,
+        "time_steps": len(typical.full_index),
+        "input_error": typical.error.to_dict(),
+    }
+    return results
+
+
+def _link_storages(model, storages, balanced, typical, hours):
+    # replaces the storage balance across typical period boundaries by the inter-period level
+    length = typical.period_length
+    n_original = len(typical.assignment)
+    storage_block = model.GenericStorageBlock
+    block = Block()
+    model.add_component("TypicalPeriodStorageBlock", block)
+    block.inter_content = Var(storages, range(n_original + 1))
+    block.intra_max = Var(storages, range(len(typical.weights)), bounds=(0, None))
+    block.intra_min = Var(storages, range(len(typical.weights)), bounds=(None, 0))
+
+    for storage in storages:
+        # intra-period contents start at zero and may become negative
+        storage_block.init_content[storage].fix(0)
+        for t in model.TIMESTEPS:
+            storage_block.storage_content[storage, t].setlb(None)
+            storage_block.storage_content[storage, t].setub(None)
+        for j in range(1, len(typical.weights)):
+            storage_block.balance[storage, j * length].deactivate()
+
+    def _period_start_rule(block, storage, j):
+        # storage balance of the first time step of typical period j
+        t = j * length
+        inflow = model.flow[list(storage.inputs)[0], storage, t]
+        outflow = model.flow[storage, list(storage.outputs)[0], t]
+        expr = storage_block.storage_content[storage, t]
+        expr += (storage.fixed_losses_relative[t] * storage.nominal_storage_capacity
+                 * model.timeincrement[t])
+        expr += storage.fixed_losses_absolute[t] * model.timeincrement[t]
+        expr += -inflow * storage.inflow_conversion_factor[t] * model.timeincrement[t]
+        expr += outflow / storage.outflow_conversion_factor[t] * model.timeincrement[t]
+        return expr == 0
+
+    block.period_start = Constraint(storages, range(1, len(typical.weights)),
+                                    rule=_period_start_rule)
+
+    def _intra_max_rule(block, storage, t):
+        return storage_block.storage_content[storage, t] <= block.intra_max[storage, t // length]
+
+    def _intra_min_rule(block, storage, t):
+        return storage_block.storage_content[storage, t] >= block.intra_min[storage, t // length]
+
+    block.intra_max_bound = Constraint(storages, model.TIMESTEPS, rule=_intra_max_rule)
+    block.intra_min_bound = Constraint(storages, model.TIMESTEPS, rule=_intra_min_rule)
+
+    def _inter_rule(block, storage, p):
+        end = storage_block.storage_content[storage, typical.assignment[p] * length + length - 1]
+        decay = (1 - storage.loss_rate[0]) ** (hours * length)
+        return block.inter_content[storage, p + 1] == block.inter_content[storage, p] * decay + end
+
+    def _upper_rule(block, storage, p):
+        capacity = storage.nominal_storage_capacity * storage.max_storage_level[0]
+        intra_max = block.intra_max[storage, typical.assignment[p]]
+        return block.inter_content[storage, p] + intra_max <= capacity
+
+    def _lower_rule(block, storage, p):
+        # the inter-period level has decayed the most at the end of the period
+        capacity = storage.nominal_storage_capacity * storage.min_storage_level[0]
+        decay = (1 - storage.loss_rate[0]) ** (hours * length)
+        intra_min = block.intra_min[storage, typical.assignment[p]]
+        return block.inter_content[storage, p] * decay + intra_min >= capacity
+
+    def _end_rule(block, storage):
+        capacity = storage.nominal_storage_capacity
+        lower = block.inter_content[storage, n_original] >= capacity * storage.min_storage_level[0]
+        return lower if not balanced[storage] else (
+            block.inter_content[storage, n_original] == block.inter_content[storage, 0])
+
+    def _start_rule(block, storage):
+        capacity = storage.nominal_storage_capacity
+        if storage.initial_storage_level is None:
+            return block.inter_content[storage, 0] >= capacity * storage.min_storage_level[0]
+        return block.inter_content[storage, 0] == storage.initial_storage_level * capacity
+
+    block.inter_balance = Constraint(storages, range(n_original), rule=_inter_rule)
+    block.inter_upper = Constraint(storages, range(n_original), rule=_upper_rule)
+    block.inter_lower = Constraint(storages, range(n_original), rule=_lower_rule)
+    block.inter_end = Constraint(storages, rule=_end_rule)
+    block.inter_start = Constraint(storages, rule=_start_rule)
+
+
+def _is_time_series(value, n):
+    # sequences of n values; scalars are wrapped by solph in sequences without a length of their own
+    if isinstance(value, str) or hasattr(value, "default"):
+        return False
+    return isinstance(value, (abc.Sequence, np.ndarray, pd.Series)) and len(value) == n
+
+
+def _k_medoids(vectors, n_clusters, rng, max_iter):
+    # alternating k-medoids with k-medoids++ initialisation on squared euclidean distances
+    squared = np.einsum("ij,ij->i", vectors, vectors)
+    distances = np.maximum(squared[:, None] + squared[None, :] - 2 * vectors @ vectors.T, 0)
+    np.fill_diagonal(distances, 0)  # rounding leaves self-distances of about 1e-15
+    medoids = [int(rng.integers(len(vectors)))]
+    for _ in range(1, n_clusters):
+        nearest = distances[:, medoids].min(axis=1)
+        nearest[medoids] = 0  # a period is chosen as medoid only once
+        if nearest.sum() > 0:
+            medoids.append(int(rng.choice(len(vectors), p=nearest / nearest.sum())))
+        else:
+            medoids.append(int(rng.choice(np.setdiff1d(np.arange(len(vectors)), medoids))))
+    medoids = np.array(medoids)
+
+    for _ in range(max_iter):
+        assignment = distances[:, medoids].argmin(axis=1)
+        assignment[medoids] = np.arange(n_clusters)
+        updated = medoids.copy()
+        for j in range(n_clusters):
+            members = np.flatnonzero(assignment == j)
+            updated[j] = members[distances[np.ix_(members, members)].sum(axis=1).argmin()]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+    assignment = distances[:, medoids].argmin(axis=1)
+    assignment[medoids] = np.arange(n_clusters)
+    return medoids, assignment
@@ -0,0 +1,235 @@
+# -*- coding: utf-8
+
+"""
+This module caches the results of iWEFE runs on disk, addressed by the content of the energy system.
+This file is part of the project OWEFE;
+The cache key is a SHA-256 digest of everything the results depend on: the time index, the type,
+label and parameters of every node, all flow parameters including the input time series (fix, min,
+max, costs), the solver and its options, a digest of the OWEFE source files and the version of
+oemof.solph. A run with an unchanged system returns the stored results without building the solph
+model. Entries are evicted least recently used first once the cache exceeds its size limit.
+The key only sees the energy system a model builds, not the code that builds it: functions passed
+as parameters are referenced by name, and edits to a main script or model module outside the
+package are not noticed if they leave the energy system unchanged. Clear the cache after such
+edits.
+
+    >>> cache = ResultCache()
+    >>> results = cache.simulate(energysystem, solver="cbc")  # instead of simulation.simulate
+    >>> cache.stats()
+    {'hits': 1, 'misses': 0, 'entries': 12, 'size': 48211345}
+"""
+
+import datetime
+import functools
+import hashlib
+import logging
+import numbers
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from oemof.network.network import Node
+from oemof.solph.plumbing import _Sequence
+
+from .simulation import simulate
+
+# default directory of the cache
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".oemof", "cache")
+
+# file extension of the cache entries
+SUFFIX = ".results.pkl"
+
+
+class ResultCache:
+    r"""
+    Content-addressed cache of energy system results on disk
+    ----
+    Parameters
+    ----------
+    cache_dir: directory of the cache entries, defaults to CACHE_DIR
+    max_size: maximum total size of the entries in bytes; the least recently used entries are
+        removed beyond it
+    """
+
+    def __init__(self, cache_dir=None, max_size=2 * 1024 ** 3):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, energysystem, solver="cbc", solve_kwargs=None):
+        # cache key of an energy system solved with solver and solve_kwargs; TypeError for
+        # parameters of a type the key cannot be derived from
+        digest = hashlib.sha256()
+        _update(digest, ("owefe", _source_digest(), "oemof.solph", solph.__version__, solver,
+                         solve_kwargs or {}))
+        _update(digest, energysystem.timeindex)
+        for node in sorted(energysystem.nodes, key=lambda nd: str(nd.label)):
+            _update(digest, (type(node).__name__, str(node.label), vars(node)))
+        flows = sorted(energysystem.flows().items(),
+                       key=lambda item: (str(item[0][0].label), str(item[0][1].label)))
+        for (source, target), flow in flows:
+            _update(digest, (str(source.label), str(target.label), vars(flow)))
+        return digest.hexdigest()
+
+    def get(self, key, energysystem):
+
+        r"""
+        Returns cached results for the nodes of energysystem and stores them in energysystem.results
+        ----
+        Parameters
+        ----------
+        key: cache key, see key()
+        energysystem: solph.EnergySystem the results belong to
+
+        Returns
+        -------
+        results : dict in the format of solph.processing.results, or None if the key is not cached
+
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        os.utime(path)  # the modification time marks the last use for the eviction
+        self.hits += 1
+        nodes = {str(nd.label): nd for nd in energysystem.nodes}
+        results = {(nodes[source], None if target is None else nodes[target]): result
+                   for (source, target), result in entry["main"].items()}
+        if energysystem.results is None:
+            energysystem.results = {}
+        energysystem.results["main"] = results
+        energysystem.results["meta"] = entry["meta"]
+        return results
+
+    def put(self, key, energysystem):
+        # stores the results of energysystem.results under key and evicts old entries beyond
+        # max_size
+        entry = {
+            "main": {(str(n1.label), None if n2 is None else str(n2.label)): result
+                     for (n1, n2), result in energysystem.results["main"].items()},
+            "meta": energysystem.results["meta"],
+        }
+        handle, temporary = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self._path(key))  # atomic, concurrent runs never read partial entries
+        self.evict()
+
+    def simulate(self, energysystem, solver="cbc", solve_kwargs=None):
+        # simulation.simulate with cached results
+        key = self.key(energysystem, solver, solve_kwargs)
+        results = self.get(key, energysystem)
+        if results is not None:
+            logging.info("Results of {0} taken from the cache".format(key[:12]))
+            return results
+        results = simulate(energysystem, solver=solver, solve_kwargs=solve_kwargs)
+        self.put(key, energysystem)
+        return results
+
+    def evict(self):
+        # removes the least recently used entries until the cache fits into max_size
+        entries = self._entries()
+        size = sum(entry.st_size for _, entry in entries)
+        for path, entry in sorted(entries, key=lambda item: item[1].st_mtime):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # removed by another process
+            size -= entry.st_size
+
+    def clear(self):
+        for path, _ in self._entries():
+            os.remove(path)
+
+    def stats(self):
+        # hit and miss counts of this cache object and the current entries on disk
+        entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "entries": len(entries),
+                "size": sum(entry.st_size for _, entry in entries)}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + SUFFIX)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((path, os.stat(path)))
+                except FileNotFoundError:
+                    pass
+        return entries
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest():
+    # digest of the source files of the owefe package; its version number is not raised with every
+    # change of the code
+    package = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(os.path.join(directory, name) for directory, _, names in os.walk(package)
+                   for name in names if name.endswith(".py"))
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, package).replace(os.sep, "/").encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _update(digest, value):
+    # feeds a value into the digest in a type-tagged, order-stable way
+    if value is None or isinstance(value, (bool, str, numbers.Number)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, Node):
+        digest.update(f"node:{value.label};".encode())  # nodes are referenced by label only
+    elif isinstance(value, _Sequence):
+        _update(digest, ("sequence", value.default))
+    elif isinstance(value, pd.DatetimeIndex):
+        digest.update(b"index:")
+        digest.update(value.asi8.tobytes())
+    elif isinstance(value, (np.ndarray, pd.Series)) or (
+            isinstance(value, (list, tuple)) and value
+            and all(isinstance(v, numbers.Number) for v in value)):
+        array = np.ascontiguousarray(value, dtype=np.float64)
+        digest.update(f"array{array.shape}:".encode())
+        digest.update(array.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        items = sorted(value.items(), key=lambda item: str(
+            item[0].label if isinstance(item[0], Node) else item[0]))
+        for k, v in items:
+            _update(digest, k)
+            _update(digest, v)
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"(")
+        for v in value:
+            _update(digest, v)
+        digest.update(b")")
+    elif isinstance(value, (set, frozenset)):
+        _update(digest, ("set", sorted(value, key=repr)))
+    elif isinstance(value, np.generic):
+        _update(digest, value.item())
+    elif isinstance(value, (datetime.date, datetime.timedelta)):
+        # includes pd.Timestamp and pd.Timedelta
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif callable(value) and hasattr(value, "__qualname__"):
+        # functions and classes are referenced by name, their code is not part of the key
+        digest.update(f"callable:{value.__module__}.{value.__qualname__};".encode())
+    elif hasattr(value, "__dict__"):
+        _update(digest, (type(value).__name__, vars(value)))
+    else:
+        # hashing the type name only would return the results of another system
+        raise TypeError("Cannot derive a cache key from a value of type {0}".format(
+            type(value).__name__))
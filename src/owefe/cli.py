@@ -0,0 +1,102 @@
+# -*- coding: utf-8
+
+"""
+This module provides the command line interface of OWEFE.
+This file is part of the project OWEFE;
+The case studies run headless on compute nodes: no plots are shown (matplotlib uses the Agg backend)
+and the timing and result summary is written as JSON.
+
+    $ owefe run tibnine_scenarios.json --jobs 4 --horizon 5Y --resolution 3h --output summary.json
+    $ python -m owefe run tibnine_scenarios.json --profile profile  # profile.json, profile.folded
+    $ owefe generate scale_test.parquet --sites tibnine hegelbach --years 30 --resolution 15min
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+
+def main(argv=None):
+    # entry point of the owefe command, returns the exit code
+    parser = argparse.ArgumentParser(prog="owefe",
+                                     description="Open Water-Energy-Food-Environment nexus models")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run",
+                              help="build, solve and post-process the scenarios of a scenario file")
+    run.add_argument("scenario_file", help="scenario file (JSON, or YAML with PyYAML installed)")
+    run.add_argument("-j", "--jobs", type=int, default=1,
+                     help="number of scenarios solved in parallel")
+    run.add_argument("--horizon", help="model horizon, hours or a duration such as 1W, 8760h or 5Y")
+    run.add_argument("--resolution", help="time step, a pandas frequency such as 1h or 3h")
+    run.add_argument("--solver", help="solver, overrides the scenario file")
+    run.add_argument("-o", "--output", help="file the JSON summary is written to instead of stdout")
+    run.add_argument("--table", help="CSV file the result table is written to")
+    run.add_argument("--profile", metavar="PREFIX",
+                     help="profile the phases, written to PREFIX.json and PREFIX.folded "
+                          "(flame graph input)")
+    run.add_argument("--profile-interval", type=float, default=0.05,
+                     help="seconds between two memory samples while profiling (default: 0.05)")
+    run.add_argument("-v", "--verbose", action="store_true", help="log progress to stderr")
+
+    generate = commands.add_parser("generate",
+                                   help="write synthetic input series for scale tests to parquet")
+    generate.add_argument("output", help="parquet file")
+    generate.add_argument("--sites", nargs="+", default=["tibnine"],
+                          help="sites of owefe.synthetic.SITES")
+    generate.add_argument("--start", default="2020-01-01",
+                          help="first time step (default: 2020-01-01)")
+    generate.add_argument("--years", type=int, default=1, help="number of years (default: 1)")
+    generate.add_argument("--resolution", default="1h",
+                          help="time step, a pandas frequency (default: 1h)")
+    generate.add_argument("--seed", type=int, default=42,
+                          help="seed of the random numbers (default: 42)")
+    generate.add_argument("--float32", action="store_true", help="store the values as float32")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        import numpy as np
+        from .synthetic import write_inputs
+
+        rows = write_inputs(args.output, sites=args.sites, start=args.start, years=args.years,
+                            freq=args.resolution, seed=args.seed,
+                            dtype=np.float32 if args.float32 else np.float64)
+        print("Wrote {0} rows to {1}".format(rows, args.output))
+        return 0
+
+    # headless: plots are rendered without a display and never block
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s-%(levelname)s-%(message)s")
+
+    from . import profiling
+
+    if args.profile:
+        profiling.enable(args.profile_interval)
+    with profiling.phase("import"):
+        from .scenarios import run_scenario_file
+
+    horizon = args.horizon
+    if horizon is not None and horizon.isdigit():
+        horizon = int(horizon)
+    table, summary = run_scenario_file(args.scenario_file, jobs=args.jobs, horizon=horizon,
+                                       resolution=args.resolution, solver=args.solver)
+    if args.profile:
+        profiling.disable()
+        profiling.write_json(args.profile + ".json")
+        profiling.write_folded(args.profile + ".folded")
+    if args.table:
+        table.to_csv(args.table)
+    text = json.dumps(summary, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
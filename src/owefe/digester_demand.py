@@ -0,0 +1,74 @@
+# Following El Joauhari et al. 2021) we assume:
+#            - electrical energy needed to mix the sludge is 5.27- 7.9 W/m³ volumetric flow
+#            - constant power application of 1.2 kW to pump 1 m³/day
+#            (daily electricity demand: 1.2 kW * 24h * 1/m³) using a progressive cavity pump from FlowRox
+#            - constant power to pumped volume ratio
+# SED is the specific energy demand
+# The calc_* functions compute whole time series at once: every argument can be a scalar or an
+# array-like (list, np.ndarray, pd.Series, xarray.DataArray) and the result has the type of the time
+# series argument (temp_ambient or average_volumetric_flow), see specs.timeseries.
+
+import numpy as np
+
+from .specs.timeseries import to_array, wrap_like
+
+
+def calc_heat_demand(temp_ambient, heat_transfer_coefficient, temp_digester, surface_area,
+                     heat_capacity, average_mass_flow):
+    # calculates the heat demand [kWh] of a anaerobic digester for every time step of temp_ambient
+    # average_mass_flow = current mass flow due to steady state operation of the digester [kg/h]
+    temp = temp_ambient if np.isscalar(temp_ambient) else to_array(temp_ambient, "temp_ambient")
+    # conversion factors
+    cf_jtokwh = 1/3600000  # Joule to kWh
+    cf_whtokwh = 1/1000  # Wh to kWh
+    # heating of the incoming sludge and heat loss over the digester surface both scale with the
+    # temperature difference: heat_demand = heating + heat_loss
+    specific_heat_demand = average_mass_flow * heat_capacity * cf_jtokwh \
+        + heat_transfer_coefficient * surface_area * cf_whtokwh  # [kWh/°C]
+    heat_demand = (temp_digester - temp) * specific_heat_demand  # kWh
+    return heat_demand if np.isscalar(temp_ambient) else wrap_like(heat_demand, temp_ambient)
+
+
+def calc_electricity_demand(average_volumetric_flow, active_volume):
+    # calculates the electricity demand of the anaerobic digester for every time step of
+    # average_volumetric_flow
+    flow = average_volumetric_flow if np.isscalar(average_volumetric_flow) \
+        else to_array(average_volumetric_flow, "average_volumetric_flow")
+    sed_mixer = 0.0079 * flow    # [kW] constant power of mixer
+    # of the organic matter in the digester,assuming 7.9 W/m³ & constant filling level
+    sed_pump = 1.2 * 24 * flow  # [kW] constant power of pump
+    # El Joauhari et al. (2021) express pump power requirement
+    # in constant power to apply over 24 hours to pump average daily volumetric flow [kW/m³daily]
+    electricity_demand = sed_mixer + sed_pump  # [kWh] components work constantly over the hour
+    if np.isscalar(average_volumetric_flow):
+        return electricity_demand
+    return wrap_like(electricity_demand, average_volumetric_flow)
+
+
+class HeatCalculation:
+    # calculates the heat demand [kWh] of a anaerobic digester in a specific hour
+    def __init__(self, temp_ambient, heat_transfer_coefficient, temp_digester, surface_area,
+                 heat_capacity, average_mass_flow):
+        self.temp_ambient = temp_ambient
+        self.heat_transfer_coefficient = heat_transfer_coefficient
+        self.temp_digester = temp_digester
+        self.surface_area = surface_area
+        self.heat_capacity = heat_capacity
+        self.average_mass_flow = average_mass_flow
+# average_mass_flow = current mass flow due to steady state operation of the digester, Unit: [kg/h]
+
+    def compute(self):
+        return calc_heat_demand(self.temp_ambient, self.heat_transfer_coefficient,
+                                self.temp_digester, self.surface_area, self.heat_capacity,
+                                self.average_mass_flow)
+
+
+class ElectricityCalculation:
+    # calculates the electricity demand of the anaerobic digester
+    def __init__(self, average_volumetric_flow, active_volume):
+        self.average_volumetric_flow = average_volumetric_flow  # [m³/h]
+        self.average_daily_volumetric_flow = average_volumetric_flow * 24
+        self.active_volume = active_volume
+
+    def compute(self):
+        return calc_electricity_demand(self.average_volumetric_flow, self.active_volume)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8
+
+"""
+This module explores the design space of the anaerobic digesters of OWEFE.
+This file is part of the project OWEFE;
+explore() sweeps digester type x retention time x temperature set-point x feedstock, sizes every
+digester with the digester models in owefe.specs, computes its yearly heat and electricity demand
+with digester_demand and the energy produced by a CHP unit as in the Tibnine example. The design
+points are evaluated in a process pool; pareto_front() selects the designs that yield the most net
+energy for their volume.
+
+    ********** Energy balance of a design ************
+    gas production [m³/a] = conversion factor * sum of mass flow     (basis "mass_flow")
+                          = conversion factor * number of time steps  (basis "hourly")
+    methane production [m³/a] = gas production * methane content     (1 for methane factors)
+    chp input [kWh/a] = methane production * heating value * chp efficiency
+    electricity production [kWh/a] = chp input * electrical share
+    heat production [kWh/a] = chp input * thermal share
+    net energy yield [kWh/a] = electricity production - electricity demand
+                               + heat production - heat demand
+    The basis is the conversion_factor_basis of the digester model. The heat demand is only counted
+    for hours in which the ambient temperature is below the set-point.
+
+    ********** Example ************
+    >>> data = pd.read_csv("examples/wastewater biogas tibnine/ww_biogas_tibnine_raw.csv")
+    >>> designs = explore(["CSTR", "floating_drum"], retention_time=range(15, 41),
+    ...                   temp_digester=[30, 35, 37], feedstocks={"tibnine": TIBNINE_FEEDSTOCK},
+    ...                   mass_flow=data["dewatered_sludge"], temp_ambient=data["temperature"])
+    >>> front = pareto_front(designs)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import itertools
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from .digester_demand import calc_electricity_demand, calc_heat_demand
+from .specs.digester import get_digester
+from .specs.timeseries import to_array
+
+# feedstock of the Tibnine case study (El Joauhari et al. 2021), with the defaults of the
+# floating drum and KT models for the properties the CSTR model does not use
+TIBNINE_FEEDSTOCK = {
+    "sludge_density": 997,  # [kg/m³]
+    "sludge_specific_gravity": 1.02,
+    "sludge_heat_capacity": 4200,  # [J/kg°C]
+    "dry_solid_concentration": 0.15,
+    "volatile_solid_concentration": 0.7,
+    "biomethane_potential": 0.3403,  # [m³/kgVS]
+    "volatile_solid_destruction_rate": 0.5,
+    "specific_gas_production": 0.9,  # [m³/kg destroyed VS]
+    "yield_factor": 10.59,
+}
+
+HEAT_TRANSFER_COEFFICIENT = 0.6  # [W/m²°C] digester wall
+METHANE_HEATING_VALUE = 9.4  # [kWh/m³] 34 MJ/m³
+METHANE_CONTENT = 0.65  # share of methane in biogas
+CHP_EFFICIENCY = 0.9  # biogas boiler efficiency (BAU, 2021)
+CHP_ELECTRICAL_SHARE = 0.35  # biogas engine efficiency (BAU, 2021)
+CHP_THERMAL_SHARE = 0.65
+
+# profiles shared by all design evaluations of a process, set by _init_worker
+_PROFILES = {}
+
+
+def explore(digester_types, retention_time, temp_digester, feedstocks, mass_flow, temp_ambient,
+            processes=None, chunksize=None):
+
+    r"""
+    Evaluates all combinations of digester type, retention time, temperature set-point and feedstock
+    Every digester geometry is computed once per process and reused for all temperature set-points
+    and for feedstocks that only differ in properties the digester model does not use.
+    ----
+    Parameters
+    ----------
+    digester_types: names of digester models, see owefe.specs.digester.DIGESTER_TYPES
+    retention_time: retention times [d]
+    temp_digester: temperature set-points of the digester [°C]
+    feedstocks: dict {name: dict of feedstock properties}, see TIBNINE_FEEDSTOCK
+    mass_flow: feedstock mass flow [kg/h] per time step; its mean is the design mass flow
+    temp_ambient: ambient temperature [°C] per time step
+    processes: number of worker processes, defaults to os.cpu_count(); 1 evaluates in this process
+    chunksize: design points sent to a worker at once, defaults to an even split into 4 chunks per
+        process
+
+    Returns
+    -------
+    designs : pd.DataFrame: one row per design point with the design fields of DigesterDesign and
+         the yearly energy balance
+
+    """
+    mass_flow = to_array(mass_flow, "mass_flow")
+    temp_ambient = to_array(temp_ambient, "temp_ambient")
+    if len(mass_flow) != len(temp_ambient):
+        raise ValueError("Arguments 'mass_flow' and 'temp_ambient' must have the same length")
+    profiles = {
+        "temp_ambient": temp_ambient,
+        "design_mass_flow": float(mass_flow.mean()),
+        "total_mass_flow": float(mass_flow.sum()),
+        "temp_digester": np.unique(np.asarray(temp_digester, dtype=np.float64)),
+    }
+    for digester_type in digester_types:
+        get_digester(digester_type)  # fail early on unknown types
+    # set-points stay inside a task, so one task needs exactly one digester geometry
+    tasks = list(itertools.product(digester_types, feedstocks.items(),
+                                   np.unique(retention_time).tolist()))
+
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, len(tasks)) or 1
+    logging.info("Evaluate {0} digester designs in {1} process(es)".format(
+        len(tasks) * len(profiles["temp_digester"]), processes))
+    if processes == 1:
+        _init_worker(profiles)
+        frames = [_evaluate(task) for task in tasks]
+    else:
+        chunksize = chunksize or max(1, len(tasks) // (4 * processes))
+        with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                 initargs=(profiles,)) as executor:
+            frames = list(executor.map(_evaluate, tasks, chunksize=chunksize))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def pareto_front(designs, objective="net_energy_yield", size="volume"):
+
+    r"""
+    Selects the designs that are not dominated by a smaller design with at least the same objective
+    ----
+    Parameters
+    ----------
+    designs: pd.DataFrame returned by explore()
+    objective: column to maximize
+    size: column to minimize
+
+    Returns
+    -------
+    front : pd.DataFrame:
+         rows of the Pareto front, sorted by increasing size
+
+    """
+    ordered = designs.sort_values([size, objective], ascending=[True, False], kind="mergesort")
+    best_before = np.maximum.accumulate(ordered[objective].to_numpy())
+    # a design is on the front if it improves the best objective of all smaller designs
+    on_front = np.empty(len(ordered), dtype=bool)
+    on_front[:1] = True
+    on_front[1:] = ordered[objective].to_numpy()[1:] > best_before[:-1]
+    return ordered[on_front]
+
+
+def _init_worker(profiles):
+    # stores the profiles once per process instead of sending them with every task
+    _PROFILES.clear()
+    _PROFILES.update(profiles)
+    _design.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _design(digester_type, parameters):
+    # sizes one digester; parameters is a sorted tuple of (name, value) pairs used by the model
+    return get_digester(digester_type)(**dict(parameters)).compute()
+
+
+def _evaluate(task):
+    # energy balance of one digester geometry for all temperature set-points
+    digester_type, (feedstock, properties), retention_time = task
+    digester = get_digester(digester_type)
+    values = dict(properties, retention_time=retention_time,
+                  design_mass_flow=_PROFILES["design_mass_flow"])
+    design = _design(digester_type,
+                     tuple(sorted((name, values[name]) for name in digester.parameters)))
+
+    temp_ambient = _PROFILES["temp_ambient"]
+    temp_digester = _PROFILES["temp_digester"]
+    n = len(temp_ambient)
+
+    heat_demand = calc_heat_demand(temp_ambient=temp_ambient[None, :],
+                                   heat_transfer_coefficient=HEAT_TRANSFER_COEFFICIENT,
+                                   temp_digester=temp_digester[:, None],
+                                   surface_area=design.surface_area,
+                                   heat_capacity=properties["sludge_heat_capacity"],
+                                   average_mass_flow=_PROFILES["design_mass_flow"])
+    heat_demand = np.maximum(heat_demand, 0).sum(axis=1)
+    # volumetric flow of the design is given per day, the demand function expects m³/h
+    electricity_demand = calc_electricity_demand(
+        average_volumetric_flow=design.volumetric_flow / 24, active_volume=design.active_volume) * n
+
+    if digester.conversion_factor_basis == "hourly":
+        gas_production = design.conversion_factor * n
+    else:
+        gas_production = design.conversion_factor * _PROFILES["total_mass_flow"]
+    methane_production = gas_production * (1 if digester.gas == "methane" else METHANE_CONTENT)
+    chp_input = methane_production * METHANE_HEATING_VALUE * CHP_EFFICIENCY
+    electricity_production = chp_input * CHP_ELECTRICAL_SHARE
+    heat_production = chp_input * CHP_THERMAL_SHARE
+
+    frame = pd.DataFrame({
+        "digester_type": digester_type,
+        "feedstock": feedstock,
+        "retention_time": retention_time,
+        "temp_digester": temp_digester,
+        **design._asdict(),
+        "gas_production": gas_production,
+        "methane_production": methane_production,
+        "electricity_production": electricity_production,
+        "heat_production": heat_production,
+        "electricity_demand": electricity_demand,
+        "heat_demand": heat_demand,
+    })
+    frame["net_energy_yield"] = (frame["electricity_production"] - frame["electricity_demand"]
+                                 + frame["heat_production"] - frame["heat_demand"])
+    return frame
@@ -0,0 +1,217 @@
+# -*- coding: utf-8
+
+"""
+This module re-solves one oemof.solph model for changed fixed profiles and conversion factors.
+This file is part of the project OWEFE;
+Parameter studies of the iWEFEs often change only a fixed profile (e.g. "heat demand digester") or a
+conversion factor (e.g. the methane yield of "anaerobic digester"). Building the
+Pyomo model of a yearly system takes longer than solving it, so ParametricModel builds it once and
+updates these inputs in place between the solves:
+
+    ********** Mutable inputs ************
+    profiles: the fixed flow of a source or sink is a fixed variable in solph; set_profile() changes
+        the values it is fixed to.
+    conversion_factors: the relation constraints of a transformer are replaced by constraints with
+        mutable Pyomo parameters; set_conversion_factor() changes the parameter values, the
+        constraints stay.
+
+Persistent solver interfaces (e.g. "gurobi_persistent") keep the model loaded in the solver and only
+receive the changed variables and constraints. For the other solvers the changed coefficients are
+written with the next problem file. MIP solves start from the previous solution where the solver
+supports warm starts.
+
+    >>> model = ParametricModel(energysystem, profiles=["heat demand digester"])
+    >>> for retention_time in range(15, 41):
+    ...     data = tibnine_model.prepare_inputs(timeindex, retention_time=retention_time)[0]
+    ...     model.set_profile("heat demand digester", data["heat_demand_digester"])
+    ...     model.solve(process_results=False)
+    ...     print(retention_time, model.flow("heat", "excess heat production").sum())
+"""
+
+import logging
+import time
+
+import numpy as np
+from oemof import solph
+from oemof.solph.plumbing import sequence
+from pyomo.environ import Block, Constraint, Param, Var
+from pyomo.opt import SolverFactory
+
+from .profiling import phase
+
+
+class ParametricModel:
+    r"""
+    oemof.solph model with mutable fixed profiles and conversion factors
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem
+    profiles: labels of sources or sinks with one fixed flow whose values may change
+    conversion_factors: labels of transformers whose conversion factors may change
+    solver: solver name; persistent interfaces (names ending with "_persistent") keep the model
+        loaded
+    solve_kwargs: keyword arguments passed to the solve call (e.g. {"tee": False})
+    """
+
+    def __init__(self, energysystem, profiles=(), conversion_factors=(), solver="cbc",
+                 solve_kwargs=None):
+        self.energysystem = energysystem
+        self.solver = solver
+        self.solve_kwargs = dict(solve_kwargs or {})
+        self.solve_times = []
+        self._changed_flows = set()  # indices of model.flow and of the parametric relations
+        self._changed_relations = set()
+
+        start = time.perf_counter()
+        nodes = {str(nd.label): nd for nd in energysystem.nodes}
+        with phase("build model"):
+            self.model = solph.Model(energysystem)
+        self._profiles = {label: _fixed_flow(self.model, nodes[label]) for label in profiles}
+        self._transformers = [nodes[label] for label in conversion_factors]
+        if self._transformers:
+            self._add_parametric_relations()
+
+        self._opt = None
+        if solver.endswith("_persistent"):
+            self._opt = SolverFactory(solver)
+            self._opt.set_instance(self.model)
+        self._warmstart = (
+            any(not var.is_continuous() for var in self.model.component_data_objects(Var))
+            and SolverFactory(solver).warm_start_capable()
+        )
+        self.build_time = time.perf_counter() - start
+        logging.info("Built the parametric model in {0:.2f} s".format(self.build_time))
+
+    @property
+    def objective(self):
+        return self.model.objective()
+
+    def set_profile(self, label, values):
+
+        r"""
+        Changes the values a fixed flow is fixed to
+        ----
+        Parameters
+        ----------
+        label: label of a source or sink passed in profiles
+        values: new fixed values per time step (relative to the nominal value, like Flow(fix=...))
+
+        """
+        (source, target), flow = self._profiles[label]
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), len(self.model.TIMESTEPS))
+        flow.fix = sequence(values)
+        for t in self.model.TIMESTEPS:
+            self.model.flow[source, target, t].fix(values[t] * flow.nominal_value)
+            self._changed_flows.add((source, target, t))
+
+    def set_conversion_factor(self, label, value, port=None):
+
+        r"""
+        Changes a conversion factor of a transformer
+        ----
+        Parameters
+        ----------
+        label: label of a transformer passed in conversion_factors
+        value: new conversion factor, scalar or per time step
+        port: label of the input or output bus of the factor; all outputs by default
+
+        """
+        node = next(nd for nd in self._transformers if str(nd.label) == str(label))
+        ports = [p for p in list(node.inputs) + list(node.outputs)
+                 if (str(p.label) == str(port) if port is not None else p in node.outputs)]
+        if not ports:
+            raise ValueError("Transformer {0} has no port {1}".format(label, port))
+        values = np.broadcast_to(np.asarray(value, dtype=np.float64), len(self.model.TIMESTEPS))
+        block = self.model.ParametricRelationBlock
+        for p in ports:
+            node.conversion_factors[p] = sequence(values)
+            for t in self.model.TIMESTEPS:
+                block.conversion_factor[node, p, t] = values[t]
+        self._changed_relations.update(index for index in block.relation if index[0] is node)
+
+    def solve(self, process_results=True):
+
+        r"""
+        Solves the model with the current inputs and stores the results in energysystem.results
+        ----
+        Parameters
+        ----------
+        process_results: collect all results with solph.processing; studies that only need the
+            objective or a few flows (see flow()) skip this step, it takes about as long as writing
+            the problem file
+
+        Returns
+        -------
+        results : dict in the format of solph.processing.results, None if process_results is False
+
+        """
+        start = time.perf_counter()
+        solve_kwargs = dict(self.solve_kwargs)
+        if self._warmstart and self.solve_times:
+            # the previous solution is still loaded in the variables
+            solve_kwargs["warmstart"] = True
+        with phase("solve"):
+            if self._opt is None:
+                self.model.solve(solver=self.solver, solve_kwargs=solve_kwargs)
+            else:
+                for index in self._changed_flows:
+                    self._opt.update_var(self.model.flow[index])
+                relation = getattr(self.model, "ParametricRelationBlock", None)
+                for index in self._changed_relations:
+                    self._opt.remove_constraint(relation.relation[index])
+                    self._opt.add_constraint(relation.relation[index])
+                solver_results = self._opt.solve(self.model, **solve_kwargs)
+                self.model.es.results = solver_results
+                self.model.solver_results = solver_results
+        self._changed_flows.clear()
+        self._changed_relations.clear()
+
+        results = None
+        if process_results:
+            with phase("process results"):
+                results = solph.processing.results(self.model)
+                self.energysystem.results["main"] = results
+                self.energysystem.results["meta"] = solph.processing.meta_results(self.model)
+        self.solve_times.append(time.perf_counter() - start)
+        logging.info("Solved the parametric model in {0:.2f} s".format(self.solve_times[-1]))
+        return results
+
+    def flow(self, source, target):
+        # solved values of the flow between the nodes labelled source and target
+        nodes = {str(nd.label): nd for nd in self.energysystem.nodes}
+        o, i = nodes[str(source)], nodes[str(target)]
+        return np.array([self.model.flow[o, i, t].value for t in self.model.TIMESTEPS],
+                        dtype=np.float64)
+
+    def _add_parametric_relations(self):
+        # replaces the relations of the transformers by relations with mutable conversion factors
+        m = self.model
+        relation = m.Transformer.relation
+        indices = [(n, i, o, t) for (n, i, o, t) in relation if n in self._transformers]
+        for index in indices:
+            relation[index].deactivate()
+
+        block = Block()
+        m.add_component("ParametricRelationBlock", block)
+        ports = [(n, p, t) for n in self._transformers for p in list(n.inputs) + list(n.outputs)
+                 for t in m.TIMESTEPS]
+        block.conversion_factor = Param(ports, mutable=True, initialize={
+            (n, p, t): n.conversion_factors[p][t] for (n, p, t) in ports})
+
+        def _relation_rule(block, n, i, o, t):
+            return (m.flow[i, n, t] * block.conversion_factor[n, o, t]
+                    == m.flow[n, o, t] * block.conversion_factor[n, i, t])
+
+        block.relation = Constraint(indices, rule=_relation_rule)
+
+
+def _fixed_flow(model, node):
+    # the fixed flow of a source or sink as ((source, target), flow)
+    edges = [((node, o), f) for o, f in node.outputs.items()]
+    edges += [((i, node), f) for i, f in node.inputs.items()]
+    fixed = [(edge, flow) for edge, flow in edges if flow.fix[model.TIMESTEPS[1]] is not None]
+    if len(fixed) != 1:
+        raise ValueError("Node {0} must have exactly one fixed flow to be used as profile".format(
+            node.label))
+    return fixed[0]
@@ -0,0 +1,249 @@
+# -*- coding: utf-8
+
+"""
+This module measures where the time and memory of an OWEFE run go.
+This file is part of the project OWEFE;
+The pipeline phases (pre-processing, model build, solve, result processing, plotting) are wrapped in
+phase() context managers. While profiling is disabled, phase() returns one shared no-op context
+manager, so the instrumentation costs a function call per phase. Enabled, every phase records its
+wall time, the resident memory (RSS) of the process at its start and end, the peak RSS while it ran
+(sampled by a background thread) and the peak RSS of the solver processes started so far. Where
+the resource module is missing (Windows), the RSS is read with psutil if it is installed, otherwise
+the memory fields are None.
+
+    ********** Output ************
+    write_json(): list of phases with name, stack (names of the enclosing phases), pid, start (unix
+        time), duration [s], rss_start, rss_end, rss_peak and children_peak_rss [MB]
+    write_folded(): collapsed stacks ("build;solve 123456" per line, self time in µs), readable by
+        flamegraph.pl, speedscope and inferno
+
+    >>> profiling.enable(sample_interval=0.05)
+    >>> with profiling.phase("build model"):
+    ...     model = solph.Model(energysystem)
+    >>> profiling.write_json("profile.json")
+    >>> profiling.write_folded("profile.folded")
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class _Disabled:
+    # shared context manager of the phases while profiling is disabled
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_DISABLED = _Disabled()
+
+
+class Profiler:
+    r"""
+    Records nested phases with their duration and memory use
+    ----
+    Parameters
+    ----------
+    enabled: record phases, otherwise phase() is a no-op
+    sample_interval: seconds between two RSS samples of the background sampler; None samples at the
+        start and end of the phases only
+    """
+
+    def __init__(self, enabled=False, sample_interval=None):
+        self.records = []
+        self._stack = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = None
+        self.enabled = False
+        self.sample_interval = None
+        if enabled:
+            self.enable(sample_interval)
+
+    def enable(self, sample_interval=None):
+        self.disable()
+        self.enabled = True
+        self.sample_interval = sample_interval
+        if sample_interval:
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample, name="owefe-rss-sampler",
+                                             daemon=True)
+            self._sampler.start()
+
+    def disable(self):
+        self.enabled = False
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def phase(self, name):
+        # context manager measuring the phase name, nested in the currently open phases
+        if not self.enabled:
+            return _DISABLED
+        return _Phase(self, name)
+
+    def open_phases(self):
+        # names of the phases currently open, outermost first
+        with self._lock:
+            return [open_phase.name for open_phase in self._stack]
+
+    def drain(self):
+        # returns and removes the records, e.g. to send them from a worker process to the parent
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+    def extend(self, records, stack=()):
+        # adds records of another profiler (e.g. of a worker process), nested below stack
+        with self._lock:
+            self.records.extend(dict(record, stack=list(stack) + record["stack"])
+                                for record in records)
+
+    def as_dict(self):
+        return {"pid": os.getpid(), "phases": list(self.records)}
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def folded(self):
+
+        r"""
+        Returns the phases as collapsed stacks for flame graphs
+        ----
+        Returns
+        -------
+        lines : list of str:
+             "<phase>;<phase>;... <self time in µs>", one line per distinct stack
+
+        """
+        self_time = {}
+        for record in self.records:
+            key = tuple(record["stack"]) + (record["name"],)
+            self_time[key] = self_time.get(key, 0.0) + record["duration"]
+        for record in self.records:
+            if record["stack"]:
+                parent = tuple(record["stack"])
+                self_time[parent] = self_time.get(parent, 0.0) - record["duration"]
+        return ["{0} {1}".format(";".join(key), max(int(round(value * 1e6)), 0))
+                for key, value in self_time.items()]
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def _sample(self):
+        # raises the peak RSS of all open phases
+        while not self._stop.wait(self.sample_interval):
+            rss = current_rss()
+            with self._lock:
+                for open_phase in self._stack:
+                    open_phase.rss_peak = _peak(open_phase.rss_peak, rss)
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "stack", "start", "wall_start", "rss_start", "rss_peak")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.rss_start = self.rss_peak = current_rss()
+        with profiler._lock:
+            self.stack = [open_phase.name for open_phase in profiler._stack]
+            profiler._stack.append(self)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        rss_end = current_rss()
+        profiler = self.profiler
+        with profiler._lock:
+            profiler._stack.remove(self)
+            profiler.records.append({
+                "name": self.name,
+                "stack": self.stack,
+                "pid": os.getpid(),
+                "start": self.wall_start,
+                "duration": duration,
+                "rss_start": self.rss_start,
+                "rss_end": rss_end,
+                "rss_peak": _peak(self.rss_peak, rss_end),
+                "children_peak_rss": children_peak_rss(),
+            })
+        return False
+
+
+def current_rss():
+    # resident memory of this process [MB]; the peak RSS where /proc is not available, None without
+    # the resource module and psutil
+    if resource is None:
+        return None if psutil is None else psutil.Process().memory_info().rss / 2 ** 20
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def children_peak_rss():
+    # peak RSS of the largest terminated child process (e.g. a solver) [MB], None without the
+    # resource module; ru_maxrss is given in kB on Linux
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def _peak(rss, sample):
+    # larger of two RSS values, where either may be None
+    if rss is None or sample is None:
+        return sample if rss is None else rss
+    return max(rss, sample)
+
+
+# profiler of this process, used by the module-level functions below
+PROFILER = Profiler()
+
+
+def phase(name):
+    return PROFILER.phase(name)
+
+
+def enable(sample_interval=None):
+    PROFILER.enable(sample_interval)
+
+
+def disable():
+    PROFILER.disable()
+
+
+def is_enabled():
+    return PROFILER.enabled
+
+
+def write_json(path):
+    PROFILER.write_json(path)
+
+
+def write_folded(path):
+    PROFILER.write_folded(path)
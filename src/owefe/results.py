@@ -0,0 +1,225 @@
+# -*- coding: utf-8
+
+"""
+This module hands the results of an iWEFE run over in memory and stores them on request.
+This file is part of the project OWEFE;
+The main scripts used to pickle the whole energy system with energysystem.dump() and read it back
+with restore() right away, always to the same file in ~/.oemof. The results in energysystem.results
+are used directly instead; save_results() writes them only if a run should be kept, into a directory
+of its own, so parallel runs do not overwrite each other.
+
+    ********** Results table ************
+    results_table() flattens a results dict in one pass into a wide, typed Arrow table: a
+    "timestamp" column and one float64 column per flow and storage variable, named
+    "<from>|<to>|<variable>". Every column carries the labels and the variable as field metadata;
+    scalar results, meta results and run metadata are stored as JSON in the schema metadata.
+    save_results() writes the table to results.parquet, load_results() reads only the requested
+    columns from the memory-mapped file.
+
+    >>> sequences = sequences_frame(energysystem.results["main"])  # flatten once
+    >>> electricity_bus = node_sequences(sequences, "electricity")  # instead of solph.views.node
+"""
+
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# directory holding one subdirectory per stored run
+RESULTS_DIR = os.path.join(os.path.expanduser("~"), ".oemof", "results")
+
+# separator of the node labels and the variable name in the column names
+SEPARATOR = "|"
+
+# file name of the results table in a run directory
+RESULTS_FILE = "results.parquet"
+
+
+def run_directory(run_id=None, base_dir=None):
+    # creates and returns the directory of one run; by default named by time, process and a random
+    # suffix
+    if run_id is None:
+        run_id = "{0}-{1}-{2}".format(time.strftime("%Y%m%d-%H%M%S"), os.getpid(),
+                                      uuid.uuid4().hex[:8])
+    path = os.path.join(base_dir or RESULTS_DIR, run_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def column_name(key, variable):
+    # column name of a result variable of the flow or node key (node, node) or (node, None)
+    return SEPARATOR.join(_labels(key)) + SEPARATOR + str(variable)
+
+
+def sequences_frame(results):
+
+    r"""
+    Joins the sequences of all flows and nodes into one wide DataFrame
+    ----
+    Parameters
+    ----------
+    results: dict in the format of solph.processing.results
+
+    Returns
+    -------
+    sequences : pd.DataFrame:
+         one column per sequence, named by column_name(), with the time index of the results
+
+    """
+    columns = {}
+    index = None
+    for key, result in results.items():
+        sequences = result["sequences"]
+        index = sequences.index if index is None else index
+        for variable in sequences.columns:
+            columns[column_name(key, variable)] = sequences[variable].to_numpy()
+    return pd.DataFrame(columns, index=index)
+
+
+def node_sequences(sequences, label):
+    # columns of a sequences_frame() belonging to the node label, like
+    # solph.views.node(...)["sequences"]
+    selected = sorted(c for c in sequences.columns if label in c.split(SEPARATOR)[:2])
+    return sequences[selected]
+
+
+def scalars_frame(results):
+    # all scalar results in long format (from, to, variable, value)
+    rows = [
+        _labels(key) + (variable, value)
+        for key, result in results.items() for variable, value in result["scalars"].items()
+    ]
+    return pd.DataFrame(rows, columns=["from", "to", "variable", "value"])
+
+
+def results_table(results, meta=None, run_metadata=None):
+
+    r"""
+    Flattens results into one wide, typed Arrow table
+    ----
+    Parameters
+    ----------
+    results: dict in the format of solph.processing.results
+    meta: meta results (energysystem.results["meta"])
+    run_metadata: dict of further information on the run, e.g. scenario parameters
+
+    Returns
+    -------
+    table : pyarrow.Table: "timestamp" and one float64 column per sequence; scalars, meta and run
+         metadata in the schema metadata
+
+    """
+    _require_pyarrow()
+    fields = []
+    arrays = []
+    scalars = []
+    index = None
+    for key, result in results.items():
+        sequences = result["sequences"]
+        index = sequences.index if index is None else index
+        source, target = _labels(key)
+        for variable in sequences.columns:
+            fields.append(pa.field(column_name(key, variable), pa.float64(), metadata={
+                "from": source, "to": target, "variable": str(variable)}))
+            arrays.append(pa.array(sequences[variable].to_numpy(dtype=np.float64),
+                                   type=pa.float64()))
+        scalars.extend([source, target, variable, _json_value(value)]
+                       for variable, value in result["scalars"].items())
+
+    if index is not None:
+        timestamp = pa.timestamp("ns") if isinstance(index, pd.DatetimeIndex) else pa.int64()
+        fields.insert(0, pa.field("timestamp", timestamp))
+        arrays.insert(0, pa.array(index.to_numpy()))
+    metadata = {
+        "owefe.scalars": json.dumps(scalars),
+        "owefe.meta": json.dumps(meta or {}, default=str),
+        "owefe.run": json.dumps(run_metadata or {}, default=str),
+    }
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+
+def save_results(energysystem, run_id=None, base_dir=None, run_metadata=None):
+
+    r"""
+    Stores the results of energysystem.results as results table in a directory of its own
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem with results (see simulation.simulate)
+    run_id: name of the run directory, unique by default
+    base_dir: directory holding the run directories, defaults to RESULTS_DIR
+    run_metadata: dict of further information on the run, e.g. scenario parameters
+
+    Returns
+    -------
+    path : str:
+         directory the results were written to
+
+    """
+    # after solph.Model.solve, energysystem.results is a pyomo SolverResults, whose get() ignores
+    # set items
+    try:
+        meta = energysystem.results["meta"]
+    except KeyError:
+        meta = None
+    table = results_table(energysystem.results["main"], meta, run_metadata)
+    path = run_directory(run_id, base_dir)
+    pq.write_table(table, os.path.join(path, RESULTS_FILE))
+    return path
+
+
+def load_results(path, columns=None):
+
+    r"""
+    Reads stored results; only the requested columns are read from the memory-mapped file
+    ----
+    Parameters
+    ----------
+    path: directory returned by save_results
+    columns: names of the sequence columns to read, all by default
+
+    Returns
+    -------
+    sequences : pd.DataFrame of the requested sequences, indexed by timestamp
+    scalars : pd.DataFrame of the scalar results
+    meta : dict of the meta results, with the run metadata under "run"
+
+    """
+    _require_pyarrow()
+    filename = os.path.join(path, RESULTS_FILE)
+    if columns is not None:
+        columns = ["timestamp"] + [c for c in columns if c != "timestamp"]
+    table = pq.read_table(filename, columns=columns, memory_map=True)
+    metadata = pq.read_schema(filename, memory_map=True).metadata
+    sequences = table.to_pandas().set_index("timestamp")
+    scalars = pd.DataFrame(json.loads(metadata[b"owefe.scalars"]),
+                           columns=["from", "to", "variable", "value"])
+    meta = json.loads(metadata[b"owefe.meta"])
+    meta["run"] = json.loads(metadata[b"owefe.run"])
+    return sequences, scalars, meta
+
+
+def _labels(key):
+    # labels of a flow or node key, "" for None
+    return tuple("" if node is None else str(node.label) for node in key)
+
+
+def _json_value(value):
+    # numpy scalars are not JSON serialisable
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The results table requires pyarrow, install it with "
+                          "'pip install pyarrow'")
@@ -0,0 +1,168 @@
+# -*- coding: utf-8
+
+"""
+This module solves long iWEFE horizons as a sequence of overlapping windows.
+This file is part of the project OWEFE;
+A monolithic solph model over several years needs memory and solver time that grow faster than the
+horizon. solve_rolling_horizon() builds and solves one window at a time: each window is optimised
+over `window + overlap` time steps, its first `window` steps are kept, and the storage contents at
+the end of the kept steps become the initial storage levels of the next window. The kept results are
+stitched into one result dict over the full horizon. Storages built as balanced return to their
+level at the start of the horizon at the end of the last window.
+
+    ********** Example ************
+    >>> def build(steps):
+    ...     energysystem = solph.EnergySystem(timeindex=date_time_index[steps])
+    ...     energysystem.add(..., solph.Source(label="wastewater", outputs={bsld: solph.Flow(
+    ...         fix=data["wastewater"].to_numpy()[steps], nominal_value=1)}), ...)
+    ...     return energysystem
+    >>> results, window_stats = solve_rolling_horizon(build, len(date_time_index), window=24 * 7,
+    ...                                               overlap=24)
+"""
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from oemof.solph.plumbing import sequence
+
+from .profiling import Profiler, children_peak_rss, phase
+from .simulation import _sequence_to_array, simulate, timeincrement
+
+
+def solve_rolling_horizon(build_energysystem, number_of_time_steps, window, overlap=0,
+                          energysystem=None, solver="cbc", solve_kwargs=None, sample_interval=0.05):
+
+    r"""
+    Solves an energy system window by window and stitches the results
+    ----
+    Parameters
+    ----------
+    build_energysystem: callable(steps) returning a solph.EnergySystem for the time steps of the
+        slice `steps`; all windows must contain nodes with the same labels; solph reads sequences by
+        position, so pass the window of a profile as array (e.g.
+        data["wastewater"].to_numpy()[steps])
+    number_of_time_steps: length of the full horizon
+    window: number of time steps kept from each window (e.g. 24 * 7 for weekly windows)
+    overlap: number of look-ahead time steps solved in addition and discarded (e.g. 24 for one day)
+    energysystem: optional solph.EnergySystem over the full horizon; if given, the results are keyed
+        by its nodes and stored in energysystem.results like after a single solve; the objective of
+        the meta results is the variable costs of the stitched flows (the overlaps are not
+        counted)
+    solver: solver passed to simulate()
+    solve_kwargs: keyword arguments passed to solph.Model.solve
+    sample_interval: seconds between two samples of the memory (RSS) of this process while a window
+        is built and solved; None samples at the start and end of the windows only
+
+    Returns
+    -------
+    results : dict in the format of solph.processing.results over the full horizon, keyed by the
+         nodes of energysystem or, if it is not given, of the first window
+    window_stats : pd.DataFrame: one row per window with start, stop, time_steps, wall_time [s],
+         objective (including the overlap), peak_rss [MB] of this process while the window was built
+         and solved, and solver_peak_rss [MB] of the largest solver process so far (the operating
+         system keeps no peak per solver run); the memory columns are None where it cannot be
+         measured (see profiling)
+
+    """
+    if window < 1 or overlap < 0:
+        raise ValueError("Argument 'window' must be positive and 'overlap' must not be negative")
+    nodes = None if energysystem is None else {str(nd.label): nd for nd in energysystem.nodes}
+    pieces = {}
+    scalars = {}
+    storage_levels = {}
+    # balanced flags of the storages and their levels at the start of the horizon
+    balanced = {}
+    start_levels = {}
+    stats = []
+    for start in range(0, number_of_time_steps, window):
+        stop = min(start + window, number_of_time_steps)
+        steps = slice(start, min(stop + overlap, number_of_time_steps))
+        last = stop == number_of_time_steps
+        wall_time = time.perf_counter()
+
+        memory = Profiler(enabled=True, sample_interval=sample_interval)
+        with phase("window {0}-{1}".format(start, stop)), memory.phase("window"):
+            with phase("build energy system"):
+                window_system = build_energysystem(steps)
+            storages = [nd for nd in window_system.nodes
+                        if isinstance(nd, solph.components.GenericStorage)]
+            for storage in storages:
+                if start == 0:
+                    balanced[storage.label] = storage.balanced
+                    start_levels[storage.label] = storage.initial_storage_level
+                else:
+                    storage.initial_storage_level = storage_levels[storage.label]
+                if not last:
+                    # windows end open; their contents are handed over instead of balanced
+                    storage.balanced = False
+                elif start > 0 and balanced[storage.label]:
+                    # the last window ends at the level the horizon started with
+                    storage.balanced = False
+                    _fix_last_level(storage, start_levels[storage.label],
+                                    steps.stop - steps.start)
+            results = simulate(window_system, solver=solver, solve_kwargs=solve_kwargs)
+        memory.disable()
+
+        if nodes is None:
+            nodes = {str(nd.label): nd for nd in window_system.nodes}
+        for (n1, n2), result in results.items():
+            key = (nodes[str(n1.label)], None if n2 is None else nodes[str(n2.label)])
+            pieces.setdefault(key, []).append(result["sequences"].iloc[:stop - start])
+            scalars.setdefault(key, result["scalars"])
+        for storage in storages:
+            content = results[storage, None]["sequences"]["storage_content"].iloc[stop - start - 1]
+            storage_levels[storage.label] = content / storage.nominal_storage_capacity
+            if start_levels[storage.label] is None:
+                # free initial level, chosen by the solver in the first window
+                init_content = results[storage, None]["scalars"]["init_content"]
+                start_levels[storage.label] = init_content / storage.nominal_storage_capacity
+
+        stats.append({
+            "start": start,
+            "stop": stop,
+            "time_steps": steps.stop - steps.start,
+            "wall_time": time.perf_counter() - wall_time,
+            "objective": window_system.results["meta"]["objective"],
+            "peak_rss": memory.records[-1]["rss_peak"],
+            "solver_peak_rss": children_peak_rss(),
+        })
+        peak_rss = stats[-1]["peak_rss"]
+        logging.info("Solved window {0}-{1} in {2:.2f} s, peak RSS {3} MB".format(
+            start, stop, stats[-1]["wall_time"], "n/a" if peak_rss is None else round(peak_rss)))
+
+    results = {key: {"scalars": scalars[key], "sequences": pd.concat(frames)}
+               for key, frames in pieces.items()}
+    window_stats = pd.DataFrame(stats)
+    if energysystem is not None:
+        if energysystem.results is None:
+            energysystem.results = {}
+        energysystem.results["main"] = results
+        energysystem.results["meta"] = {
+            "objective": _variable_costs(energysystem, results, number_of_time_steps),
+            "problem": {"Name": "rolling horizon", "Number of windows": len(window_stats)},
+            "solver": {"Status": "ok", "Wall time": window_stats["wall_time"].sum()},
+        }
+    return results, window_stats
+
+
+def _fix_last_level(storage, level, n):
+    # bounds the storage level of the last of n time steps to level
+    min_level = _sequence_to_array(storage.min_storage_level, n).copy()
+    max_level = _sequence_to_array(storage.max_storage_level, n).copy()
+    min_level[-1] = max_level[-1] = level
+    storage.min_storage_level = sequence(min_level)
+    storage.max_storage_level = sequence(max_level)
+
+
+def _variable_costs(energysystem, results, n):
+    # variable costs of the stitched flows, weighted with the durations of the time steps
+    hours = timeincrement(energysystem)
+    objective = 0
+    for key, flow in energysystem.flows().items():
+        if key in results:
+            costs = _sequence_to_array(flow.variable_costs, n)
+            objective += float(np.dot(costs * hours, results[key]["sequences"]["flow"]))
+    return objective
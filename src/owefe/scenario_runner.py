@@ -0,0 +1,241 @@
+# -*- coding: utf-8
+
+"""
+This module runs many OWEFE scenarios in a process pool.
+This file is part of the project OWEFE;
+The main scripts are written for one run at a time: they change the working directory, write log, LP
+and result files with fixed names and show their plots. run_scenarios() builds and solves any number
+of model configurations in parallel instead. Every worker process gets a temporary directory of its
+own, which holds the temporary LP and solution files of its solver runs and its log file
+(worker.log), so workers never write to the same file. If profiling is enabled in this process, the
+workers profile their scenarios too and send the phases back with the results. Figures are drawn
+with a non-interactive matplotlib backend. Each task only sends the scenario parameters to the
+worker; the build function and shared inputs are passed to every worker once. Scenarios are
+independent, so the throughput grows with the number of processes until the cores are used up.
+
+    ********** Example ************
+    >>> def build(retention_time, temp_digester):  # module-level, so it can be sent to the workers
+    ...     energysystem = solph.EnergySystem(timeindex=date_time_index)
+    ...     ...
+    ...     return energysystem
+    >>> scenarios = {f"rt{rt}-t{t}": {"retention_time": rt, "temp_digester": t}
+    ...              for rt in (20, 30, 40) for t in (30, 37)}
+    >>> table = run_scenarios(build, scenarios, processes=4)
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from . import profiling
+from .aggregation import aggregate_energysystem, solve_typical_periods
+from .scenario_store import flow_sums
+from .simulation import simulate, timeincrement
+
+# build function, solver and metrics of a worker process, set by _configure
+_WORKER = {}
+
+# columns of the result table set by the runner; scenario parameters must not use these names
+ROW_FIELDS = ("scenario", "objective", "build_time", "solve_time", "wall_time", "worker", "error")
+
+
+def run_scenarios(build, scenarios, processes=None, solver="cbc", solve_kwargs=None, metrics=None,
+                  progress=None, store=None, store_scenario="scenarios", keep_directories=False,
+                  aggregation=None):
+
+    r"""
+    Builds and solves scenarios in worker processes and gathers their results in one table
+    ----
+    Parameters
+    ----------
+    build: module-level callable(**parameters) returning a solph.EnergySystem; large inputs should
+        be bound with functools.partial, they are sent to every worker only once
+    scenarios: dict {name: dict of parameters} or list of parameter dicts (named by their position);
+        the parameter names must differ from ROW_FIELDS and from the flow sums and metrics
+        (ValueError, raised before the run or with the first solved scenario)
+    processes: number of worker processes, defaults to os.cpu_count(); 1 runs the scenarios in this
+        process
+    solver: solver passed to simulate()
+    solve_kwargs: keyword arguments passed to solph.Model.solve
+    metrics: optional module-level callable(energysystem) returning a dict of further scalar
+        results; the metric names must differ from ROW_FIELDS
+    progress: optional callable(done, total, row) called in this process after every finished
+        scenario
+    store: optional ScenarioStore the finished scenarios are recorded in (by this process only)
+    store_scenario: scenario name of the runs in the store
+    keep_directories: keep the temporary directories of the workers (with their log files) after the
+        run
+    aggregation: optional keyword arguments of aggregation.aggregate_energysystem (e.g.
+        {"n_periods": 12, "period_length": 24}); the scenarios are then solved on typical periods
+        of their time series
+
+    Returns
+    -------
+    table : pd.DataFrame: one row per scenario, indexed by its name, with the parameters, objective,
+         build_time, solve_time, wall_time [s], worker (process id), error (None if the scenario was
+         solved), the totals of all flows at buses over the horizon (flow times step duration,
+         named "<from>|<to>", see scenario_store.flow_sums) and the metrics
+
+    """
+    if not isinstance(scenarios, dict):
+        scenarios = dict(enumerate(scenarios))
+    tasks = list(scenarios.items())
+    for name, parameters in tasks:
+        reserved = sorted(set(parameters) & set(ROW_FIELDS))
+        if reserved:
+            raise ValueError("Parameters {0} of scenario {1!r} are named like columns of the "
+                             "result table".format(reserved, name))
+    total = len(tasks)
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, total) or 1
+    logging.info("Run {0} scenario(s) in {1} process(es)".format(total, processes))
+
+    rows = {}
+    start = time.perf_counter()
+
+    def finished(row):
+        records = row.pop("_profile", None)
+        if records:
+            profiling.PROFILER.extend(records, stack=profiling.PROFILER.open_phases())
+        _check_names(row)
+        rows[row["scenario"]] = row
+        logging.info("Scenario {0}/{1} {2!r} {3} in {4:.2f} s ({5:.1f} s elapsed)".format(
+            len(rows), total, row["scenario"], "failed" if row["error"] else "solved",
+            row["wall_time"], time.perf_counter() - start))
+        if store is not None:
+            values = {k: v for k, v in _flatten(row).items()
+                      if k not in ("scenario", "objective", "error", *row["parameters"])}
+            store.add_run(store_scenario, row["parameters"], meta={"objective": row["objective"]},
+                          metrics=values)
+        if progress is not None:
+            progress(len(rows), total, row)
+
+    if processes == 1:
+        _configure(build, solver, solve_kwargs, metrics, aggregation)
+        for task in tasks:
+            finished(_run(task))
+    else:
+        parent = tempfile.mkdtemp(prefix="owefe-scenarios-")
+        # workers profile with the sample interval of this process, None if profiling is disabled
+        profile = (profiling.PROFILER.sample_interval or 0) if profiling.is_enabled() else None
+        try:
+            with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                     initargs=(parent, build, solver, solve_kwargs, metrics,
+                                               profile, aggregation)) as executor:
+                futures = [executor.submit(_run, task) for task in tasks]
+                try:
+                    for future in as_completed(futures):
+                        finished(future.result())
+                except ValueError:
+                    # the names collide in every scenario, do not wait for the pending ones
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            if keep_directories:
+                logging.info("Worker directories kept in {0}".format(parent))
+            else:
+                shutil.rmtree(parent, ignore_errors=True)
+
+    table = pd.DataFrame([_flatten(rows[name]) for name, _ in tasks if name in rows])
+    return table.set_index("scenario") if len(table) else table
+
+
+def worker_directory():
+    # temporary directory of the current worker process, for files a build function has to write
+    return _WORKER.get("directory") or tempfile.gettempdir()
+
+
+def _configure(build, solver, solve_kwargs, metrics, aggregation=None):
+    _WORKER.update(build=build, solver=solver, solve_kwargs=solve_kwargs, metrics=metrics,
+                   aggregation=aggregation)
+
+
+def _init_worker(parent, build, solver, solve_kwargs, metrics, profile=None, aggregation=None):
+    # isolates the worker: own temporary directory for the solver files, own log file, no
+    # interactive plots
+    directory = tempfile.mkdtemp(prefix="worker-{0}-".format(os.getpid()), dir=parent)
+    tempfile.tempdir = directory
+    os.environ["TMPDIR"] = directory
+    os.environ["MPLBACKEND"] = "Agg"
+    try:
+        from pyomo.common.tempfiles import TempfileManager
+        TempfileManager.tempdir = directory
+    except ImportError:
+        pass
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.FileHandler(os.path.join(directory, "worker.log"))
+    handler.setFormatter(logging.Formatter("%(asctime)s-%(levelname)s-%(message)s"))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+    _WORKER["directory"] = directory
+    _configure(build, solver, solve_kwargs, metrics, aggregation)
+    if profile is not None:
+        profiling.enable(profile or None)
+        _WORKER["forward_profile"] = True
+
+
+def _run(task):
+    # builds and solves one scenario; errors are reported in the row instead of stopping the pool
+    name, parameters = task
+    row = {"scenario": name, "parameters": parameters, "objective": None, "build_time": None,
+           "solve_time": None, "wall_time": None, "worker": os.getpid(), "error": None,
+           "results": {}}
+    start = time.perf_counter()
+    try:
+        with profiling.phase("scenario {0}".format(name)):
+            with profiling.phase("build energy system"):
+                energysystem = _WORKER["build"](**parameters)
+            row["build_time"] = time.perf_counter() - start
+            if _WORKER["aggregation"]:
+                with profiling.phase("aggregate"):
+                    typical = aggregate_energysystem(energysystem, **_WORKER["aggregation"])
+                results = solve_typical_periods(energysystem, typical, solver=_WORKER["solver"],
+                                                solve_kwargs=_WORKER["solve_kwargs"])
+                hours = typical.disaggregate(timeincrement(energysystem))
+            else:
+                results = simulate(energysystem, solver=_WORKER["solver"],
+                                   solve_kwargs=_WORKER["solve_kwargs"])
+                hours = timeincrement(energysystem)
+            row["solve_time"] = time.perf_counter() - start - row["build_time"]
+            row["objective"] = energysystem.results["meta"]["objective"]
+            with profiling.phase("metrics"):
+                row["results"].update(flow_sums(results, hours))
+                if _WORKER["metrics"] is not None:
+                    row["results"].update(_WORKER["metrics"](energysystem))
+    except Exception as error:
+        logging.exception("Scenario {0!r} failed".format(name))
+        row["error"] = "{0}: {1}".format(type(error).__name__, error)
+    row["wall_time"] = time.perf_counter() - start
+    if _WORKER.get("forward_profile"):
+        # the phases of a worker are recorded by the profiler of the parent process
+        row["_profile"] = profiling.PROFILER.drain()
+    return row
+
+
+def _check_names(row):
+    # the results of the first solved scenario show the names of the flow sums and metrics; they
+    # are the same for all scenarios, so a collision stops the run at once
+    reserved = sorted(set(row["results"]) & set(ROW_FIELDS))
+    if reserved:
+        raise ValueError("Metrics {0} are named like columns of the result table".format(reserved))
+    collisions = sorted(set(row["parameters"]) & set(row["results"]))
+    if collisions:
+        raise ValueError("Parameters {0} of scenario {1!r} are named like results (flow sums or "
+                         "metrics)".format(collisions, row["scenario"]))
+
+
+def _flatten(row):
+    # parameters, flow sums and metrics become columns of their own
+    row = dict(row)
+    parameters, results = row.pop("parameters"), row.pop("results")
+    return {"scenario": row.pop("scenario"), **parameters, **row, **results}
@@ -0,0 +1,214 @@
+# -*- coding: utf-8
+
+"""
+This module records the scenario runs of OWEFE in a local SQLite database.
+This file is part of the project OWEFE;
+Every run stores its input parameters, design outputs (e.g. of the digester specs) and the sums of
+all flows at its buses, instead of overwriting production.csv, main_results.csv or
+Digester_Dimension.csv of the previous run. Parameters and outputs are kept in long tables indexed
+by (name, value), so questions such as "top 10 runs by methane yield" are answered from the index
+without scanning all runs.
+
+    ********** Tables ************
+    runs: run_id, scenario, created (unix time), objective, results_path (see results.save_results)
+    parameters: run_id, name, value (numeric parameters) or text (other parameters)
+    metrics: run_id, name, value; design outputs are named "design.<field>", flow sums "<from>|<to>"
+
+    ********** Concurrent writers ************
+    The database runs in WAL mode and every run is written in one short transaction. Each process
+    opens its own ScenarioStore (connections are not shared across processes); writers wait for each
+    other up to `timeout` seconds.
+
+    >>> store = ScenarioStore("tibnine_scenarios.sqlite")
+    >>> store.add_run("tibnine", {"retention_time": 30, "temp_digester": 37},
+    ...               design=digester_design, results=energysystem.results["main"],
+    ...               meta=energysystem.results["meta"])
+    >>> store.top("anaerobic digester|methane", n=10)
+"""
+
+import numbers
+import os
+import sqlite3
+import time
+
+import pandas as pd
+from oemof import solph
+
+from .results import SEPARATOR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    scenario TEXT NOT NULL,
+    created REAL NOT NULL,
+    objective REAL,
+    results_path TEXT
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    value REAL,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (scenario);
+CREATE INDEX IF NOT EXISTS parameters_name_value ON parameters (name, value);
+CREATE INDEX IF NOT EXISTS parameters_run ON parameters (run_id);
+CREATE INDEX IF NOT EXISTS metrics_name_value ON metrics (name, value);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id);
+"""
+
+
+class ScenarioStore:
+    r"""
+    SQLite database of scenario runs
+    ----
+    Parameters
+    ----------
+    path: database file, created if it does not exist
+    timeout: seconds a writer waits for the lock held by another process
+    """
+
+    def __init__(self, path, timeout=60):
+        self.path = path
+        self.timeout = timeout
+        self._connection = None
+        self._pid = None
+
+    @property
+    def connection(self):
+        # one connection per process; a store inherited by a forked worker opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __getstate__(self):
+        # the store can be passed to worker processes, they reconnect on first use
+        return {"path": self.path, "timeout": self.timeout, "_connection": None, "_pid": None}
+
+    def add_run(self, scenario, parameters, design=None, results=None, meta=None, metrics=None,
+                results_path=None, hours=1):
+
+        r"""
+        Records one run
+        ----
+        Parameters
+        ----------
+        scenario: name of the case study or scenario family, e.g. "tibnine"
+        parameters: dict of input parameters; numbers are stored as values, everything else as text
+        design: design outputs as dict or namedtuple (e.g. DigesterDesign), stored as metrics
+            "design.<field>"
+        results: dict in the format of solph.processing.results; the flow sums at all buses are
+            stored as metrics
+        hours: duration of the time steps of results in hours, scalar or one value per step
+        meta: meta results, the objective is stored with the run
+        metrics: dict of further scalar outputs
+        results_path: directory the results were stored in, see results.save_results
+
+        Returns
+        -------
+        run_id : int
+
+        """
+        values = dict(metrics or {})
+        if design is not None:
+            design = design._asdict() if hasattr(design, "_asdict") else design
+            values.update({f"design.{name}": value for name, value in design.items()})
+        if results is not None:
+            values.update(flow_sums(results, hours))
+        objective = None if meta is None else meta.get("objective")
+
+        with self.connection as connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (scenario, created, objective, results_path) VALUES (?, ?, ?, ?)",
+                (scenario, time.time(), _number(objective), results_path),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO parameters (run_id, name, value, text) VALUES (?, ?, ?, ?)",
+                [(run_id, name, _number(value), None if _is_number(value) else str(value))
+                 for name, value in parameters.items()],
+            )
+            connection.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, _number(value)) for name, value in values.items()],
+            )
+        return run_id
+
+    def top(self, metric, n=10, ascending=False, scenario=None):
+
+        r"""
+        Returns the runs with the largest (or smallest) value of a metric with their parameters
+        ----
+        Parameters
+        ----------
+        metric: metric name, e.g. "design.volume" or a flow sum "anaerobic digester|methane"
+        n: number of runs
+        ascending: return the smallest values instead
+        scenario: only consider runs of this scenario
+
+        Returns
+        -------
+        runs : pd.DataFrame:
+             one row per run with run_id, scenario, the metric value and one column per parameter
+
+        """
+        order = "ASC" if ascending else "DESC"
+        query = (
+            "SELECT m.run_id, r.scenario, m.value FROM metrics m "
+            "JOIN runs r ON r.run_id = m.run_id "
+            f"WHERE m.name = ? {'AND r.scenario = ?' if scenario else ''} "
+            f"ORDER BY m.value {order} LIMIT ?"
+        )
+        args = (metric, scenario, n) if scenario else (metric, n)
+        runs = pd.read_sql_query(query, self.connection, params=args)
+        runs = runs.rename(columns={"value": metric})
+        return runs.join(self.parameters(runs["run_id"].tolist()), on="run_id")
+
+    def parameters(self, run_ids=None):
+        # parameters of the given (or all) runs, one row per run
+        query = "SELECT run_id, name, COALESCE(value, text) AS value FROM parameters"
+        args = ()
+        if run_ids is not None:
+            query += " WHERE run_id IN ({0})".format(", ".join("?" * len(run_ids)))
+            args = tuple(run_ids)
+        frame = pd.read_sql_query(query, self.connection, params=args)
+        return frame.pivot(index="run_id", columns="name", values="value")
+
+    def query(self, sql, params=()):
+        # runs an arbitrary SQL query on the database
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+
+def flow_sums(results, hours=1):
+    # totals of all flows from or to a bus, named "<from>|<to>"; every flow value is weighted with
+    # the duration of its time step in hours (scalar or one value per step, see
+    # simulation.timeincrement), so the totals do not depend on the resolution
+    return {
+        f"{source.label}{SEPARATOR}{target.label}": float((result["sequences"]["flow"]
+                                                           * hours).sum())
+        for (source, target), result in results.items()
+        if target is not None and "flow" in result["sequences"]
+        and (isinstance(source, solph.Bus) or isinstance(target, solph.Bus))
+    }
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _number(value):
+    # numbers as float for SQLite (numpy scalars are not accepted), others as None
+    return float(value) if _is_number(value) else None
@@ -0,0 +1,258 @@
+# -*- coding: utf-8
+
+"""
+This module runs the scenarios of a scenario file headless and summarises them machine-readably.
+This file is part of the project OWEFE;
+A scenario file replaces the hard-coded settings of the case study scripts (number_of_time_steps,
+solver, input paths). It names a build function, the model horizon and resolution and one or more
+parameter sets:
+
+    ********** Scenario file (JSON) ************
+    {
+        "build": "tibnine_model.py:build",      # file (relative to this file) or module, function
+        "start": "2020-01-01",
+        "horizon": "1Y",                        # hours as number, or a duration like "1W", "5Y"
+        "resolution": "1h",                     # pandas frequency of the time steps
+        "solver": "cbc",
+        "solve_kwargs": {},
+        "metrics": "tibnine_model.py:metrics",  # optional callable(energysystem), further results
+        "aggregation": {"n_periods": 12, "period_length": 24},  # optional, solve on 12 typical days
+        "parameters": {"temp_digester": 37},    # shared by all scenarios
+        "scenarios": {"rt20": {"retention_time": 20}, "rt30": {"retention_time": 30}}
+    }
+
+The build function is called as build(timeindex, **parameters) and returns a solph.EnergySystem. Its
+input profiles can be fitted to the requested horizon and resolution with fit_profiles().
+run_scenario_file() solves the scenarios with scenario_runner.run_scenarios(), on typical periods of
+their time series if the file has an "aggregation" entry (see aggregation.aggregate_energysystem).
+The summary holds the settings, the timing of every phase and the results of every scenario and is
+JSON serialisable.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from .profiling import phase
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# defaults of the scenario file entries
+DEFAULTS = {
+    "start": "2020-01-01",
+    "horizon": 8760,
+    "resolution": "1h",
+    "solver": "cbc",
+    "solve_kwargs": {},
+    "metrics": None,
+    "aggregation": None,
+    "parameters": {},
+    "scenarios": None,
+}
+
+
+def load_scenario_file(path):
+    # reads a scenario file (JSON, or YAML if PyYAML is installed) and fills in the defaults
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yml", ".yaml")):
+            if yaml is None:
+                raise ImportError("YAML scenario files require PyYAML, install it with "
+                                  "'pip install pyyaml'")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if "build" not in spec:
+        raise ValueError(f"Scenario file {path} does not name a build function")
+    return {**DEFAULTS, **spec}
+
+
+def resolve_callable(reference, base_dir=None):
+
+    r"""
+    Imports the function of a reference "module:function" or "file.py:function"
+    ----
+    Parameters
+    ----------
+    reference: module name or path of a Python file, and function name separated by ":"
+    base_dir: directory relative file paths are resolved in
+
+    Returns
+    -------
+    function : callable
+
+    """
+    target, _, name = reference.rpartition(":")
+    if not target or not name:
+        raise ValueError(f"Reference '{reference}' is not of the form 'module:function' or "
+                         "'file.py:function'")
+    if target.endswith(".py"):
+        path = os.path.abspath(os.path.join(base_dir or os.getcwd(), target))
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = sys.modules.get(module_name)
+        if module is None or os.path.abspath(getattr(module, "__file__", "")) != path:
+            # the directory of the file is added to the path so that it can import its neighbours
+            sys.path.insert(0, os.path.dirname(path))
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            # functions must be importable by name for the worker processes
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+    return getattr(module, name)
+
+
+def make_timeindex(start, horizon, resolution):
+
+    r"""
+    Returns the time index of a model horizon
+    ----
+    Parameters
+    ----------
+    start: first time step
+    horizon: number of hours, or a duration such as "1W", "8760h" or "5Y" (calendar years)
+    resolution: pandas frequency of the time steps, e.g. "1h" or "3h"
+
+    Returns
+    -------
+    timeindex : pd.DatetimeIndex:
+         time steps from start up to, but excluding, start + horizon
+
+    """
+    start = pd.Timestamp(start)
+    if isinstance(horizon, str) and horizon[-1] in "yY":
+        end = start + pd.DateOffset(years=int(horizon[:-1] or 1))
+    elif isinstance(horizon, str):
+        end = start + pd.Timedelta(horizon)
+    else:
+        end = start + pd.Timedelta(hours=horizon)
+    timeindex = pd.date_range(start, end, freq=resolution)
+    return timeindex[timeindex < end]
+
+
+def fit_profiles(data, timeindex, freq="1h"):
+
+    r"""
+    Fits profiles of one period (e.g. an hourly year) to a time index of another horizon and
+    resolution
+    The profiles are repeated to cover the horizon, averaged over the time steps of coarser
+    resolutions and repeated over the time steps of finer resolutions, which keeps rates (kg/h, kW)
+    in their unit.
+    ----
+    Parameters
+    ----------
+    data: pd.DataFrame or pd.Series with one row per time step of frequency freq, starting at
+        timeindex[0]
+    timeindex: pd.DatetimeIndex of the model
+    freq: frequency of the rows of data
+
+    Returns
+    -------
+    profiles : pd.DataFrame or pd.Series indexed by timeindex
+
+    """
+    step = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+    end = timeindex[-1] + (timeindex[-1] - timeindex[-2] if len(timeindex) > 1 else step)
+    n = int(np.ceil((end - timeindex[0]) / step))
+    values = data.iloc[np.arange(n) % len(data)]
+    values.index = pd.date_range(timeindex[0], periods=n, freq=step)
+    model_step = timeindex[1] - timeindex[0] if len(timeindex) > 1 else step
+    if model_step == step:
+        return values.reindex(timeindex)
+    if model_step < step:
+        # each row holds for all time steps of the model within its period
+        return values.reindex(timeindex, method="ffill")
+    # mean over the rows of each time step of the model
+    position = np.searchsorted(timeindex.asi8, values.index.asi8, side="right") - 1
+    return values.groupby(position).mean().set_axis(timeindex, axis=0)
+
+
+def run_scenario_file(path, jobs=1, horizon=None, resolution=None, solver=None):
+
+    r"""
+    Builds, solves and post-processes all scenarios of a scenario file
+    ----
+    Parameters
+    ----------
+    path: scenario file
+    jobs: number of worker processes
+    horizon: overrides the horizon of the scenario file
+    resolution: overrides the resolution of the scenario file
+    solver: overrides the solver of the scenario file
+
+    Returns
+    -------
+    table : pd.DataFrame of the scenarios, see scenario_runner.run_scenarios
+    summary : dict: settings, timing ("load", "run" and "total" wall time [s], and per scenario) and
+         results, JSON serialisable
+
+    """
+    from .scenario_runner import run_scenarios
+
+    start = time.perf_counter()
+    with phase("load scenario file"):
+        spec = load_scenario_file(path)
+    settings = {
+        "scenario_file": os.path.abspath(path),
+        "owefe_version": __version__,
+        "start": str(pd.Timestamp(spec["start"])),
+        "horizon": horizon if horizon is not None else spec["horizon"],
+        "resolution": resolution or spec["resolution"],
+        "solver": solver or spec["solver"],
+        "aggregation": spec["aggregation"],
+        "jobs": jobs,
+    }
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with phase("load build function"):
+        build = resolve_callable(spec["build"], base_dir)
+        metrics = resolve_callable(spec["metrics"], base_dir) if spec["metrics"] else None
+    timeindex = make_timeindex(settings["start"], settings["horizon"], settings["resolution"])
+    settings["time_steps"] = len(timeindex)
+    scenarios = {
+        name: {**spec["parameters"], **(overrides or {})}
+        for name, overrides in (spec["scenarios"] or {"base": {}}).items()
+    }
+    load_time = time.perf_counter() - start
+
+    table = run_scenarios(_TimeindexBuild(build, timeindex), scenarios, processes=jobs,
+                          solver=settings["solver"], solve_kwargs=spec["solve_kwargs"],
+                          metrics=metrics, aggregation=spec["aggregation"])
+    total_time = time.perf_counter() - start
+    summary = {
+        **settings,
+        "timing": {"load": load_time, "run": total_time - load_time, "total": total_time},
+        "scenarios": [{"scenario": name, **{k: _json_value(v) for k, v in row.items()}}
+                      for name, row in table.to_dict(orient="index").items()],
+    }
+    summary["failed"] = sum(1 for row in summary["scenarios"] if row.get("error"))
+    return table, summary
+
+
+class _TimeindexBuild:
+    # build(timeindex, **parameters) with a fixed time index, picklable for the worker processes
+
+    def __init__(self, build, timeindex):
+        self.build = build
+        self.timeindex = timeindex
+
+    def __call__(self, **parameters):
+        return self.build(self.timeindex, **parameters)
+
+
+def _json_value(value):
+    # numpy scalars as Python numbers, missing values as None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
@@ -0,0 +1,246 @@
+# -*- coding: utf-8
+
+"""
+This module provides a direct simulation of iWEFEs without building an optimization model.
+This file is part of the project OWEFE;
+Many OWEFE models consist of fixed sources, transformers with given conversion factors and free
+sinks only. Such a system has exactly one feasible operation. simulate() finds it by propagating the
+fixed flows through buses and conversion factors with NumPy and only builds and solves the
+oemof.solph model if the system has real freedom (storages, investments, competing free flows).
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from oemof.solph.plumbing import _Sequence, sequence
+
+from .profiling import phase
+
+# node types whose equations are fully covered by the propagation below; subclasses
+# (e.g. GenericStorage or ExtractionTurbineCHP) add further variables and are solved by the solver
+SIMULATED_NODE_TYPES = (solph.Bus, solph.Source, solph.Sink, solph.Transformer)
+
+# flow attributes that couple the time steps of a flow (limits of its sum, full load time or
+# gradients); the propagation only checks bounds per time step, so such flows go to the solver
+COUPLING_FLOW_ATTRIBUTES = ("summed_max", "summed_min", "full_load_time_max",
+                            "full_load_time_min")
+
+# absolute tolerance for balances and bounds of the propagated flows
+TOLERANCE = 1e-6
+
+
+def simulate(energysystem, solver="cbc", solve_kwargs=None):
+
+    r"""
+    Determines the operation of an energy system and stores the results in energysystem.results
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem with time index
+    solver: solver used if the system has degrees of freedom
+    solve_kwargs: keyword arguments passed to solph.Model.solve (e.g. {"tee": False})
+
+    Returns
+    -------
+    results : dict in the format of solph.processing.results: {(node, node): {"scalars": pd.Series,
+         "sequences": pd.DataFrame}}, usable with solph.views.node; meta results are stored in
+         energysystem.results["meta"]
+
+    """
+    with phase("propagate flows"):
+        flows = propagate_flows(energysystem)
+    if flows is None:
+        logging.info("System has degrees of freedom, solve it with {0}".format(solver))
+        with phase("build model"):
+            model = solph.Model(energysystem)
+        with phase("solve"):
+            model.solve(solver=solver, solve_kwargs=solve_kwargs or {})
+        with phase("process results"):
+            energysystem.results["main"] = solph.processing.results(model)
+            energysystem.results["meta"] = solph.processing.meta_results(model)
+        return energysystem.results["main"]
+
+    logging.info("System is fully determined by its fixed flows, simulate it directly")
+    timeindex = energysystem.timeindex
+    n = len(timeindex)
+    # solph weights the costs of each time step with its duration
+    hours = timeincrement(energysystem)
+    objective = 0
+    results = {}
+    for (o, i), flow in energysystem.flows().items():
+        values = flows[o, i]
+        objective += float(np.dot(_sequence_to_array(flow.variable_costs, n) * hours, values))
+        results[o, i] = {
+            "scalars": pd.Series(dtype=float),
+            "sequences": pd.DataFrame({"flow": values}, index=timeindex),
+        }
+    if energysystem.results is None:
+        energysystem.results = {}
+    energysystem.results["main"] = results
+    energysystem.results["meta"] = {
+        "objective": objective,
+        "problem": {"Name": "simulation", "Number of variables": 0, "Number of constraints": 0},
+        "solver": {"Status": "ok", "Termination condition": "simulated"},
+    }
+    return results
+
+
+def propagate_flows(energysystem):
+
+    r"""
+    Propagates the fixed flows of an energy system through its buses and transformers
+    Transformers tie all their flows to one activity (flow = activity * conversion factor), buses
+    determine their last unknown flow by their balance. The propagation is repeated until no
+    further flow can be determined.
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem with time index
+
+    Returns
+    -------
+    flows : dict {(node, node): np.ndarray} of all flow values,
+         or None if the system has degrees of freedom or its fixed flows are inconsistent
+
+    """
+    n = len(energysystem.timeindex)
+    all_flows = energysystem.flows()
+
+    for node in energysystem.nodes:
+        if type(node) not in SIMULATED_NODE_TYPES:
+            logging.debug("Node {0} of type {1} cannot be simulated".format(
+                node.label, type(node).__name__))
+            return None
+    for (o, i), flow in all_flows.items():
+        if flow.investment is not None or flow.nonconvex is not None or _is_coupled(flow):
+            logging.debug("Flow {0} -> {1} cannot be simulated".format(o.label, i.label))
+            return None
+
+    # fixed flows are known from the start (solph ignores fix without nominal_value)
+    values = {}
+    for key, flow in all_flows.items():
+        fix = _sequence_to_array(flow.fix, n)
+        if fix is not None and flow.nominal_value is not None:
+            values[key] = fix * flow.nominal_value
+
+    transformers = [nd for nd in energysystem.nodes if type(nd) is solph.Transformer]
+    buses = [nd for nd in energysystem.nodes if type(nd) is solph.Bus and nd.balanced]
+    conversion_factors = {
+        t: {port: _sequence_to_array(t.conversion_factors[port], n) for port in _ports(t)}
+        for t in transformers
+    }
+
+    progress = True
+    while progress and len(values) < len(all_flows):
+        progress = False
+        for t in transformers:
+            ports = _ports(t)
+            known = [p for p in ports
+                     if _edge(t, p) in values and np.all(conversion_factors[t][p] != 0)]
+            if not known or all(_edge(t, p) in values for p in ports):
+                continue
+            activity = values[_edge(t, known[0])] / conversion_factors[t][known[0]]
+            for p in ports:
+                values.setdefault(_edge(t, p), activity * conversion_factors[t][p])
+            progress = True
+        for bus in buses:
+            edges = [(src, bus) for src in bus.inputs] + [(bus, dst) for dst in bus.outputs]
+            unknown = [e for e in edges if e not in values]
+            if len(unknown) != 1:
+                continue
+            inflow = sum((values[e] for e in edges if e[1] is bus and e in values), np.zeros(n))
+            outflow = sum((values[e] for e in edges if e[0] is bus and e in values), np.zeros(n))
+            values[unknown[0]] = inflow - outflow if unknown[0][0] is bus else outflow - inflow
+            progress = True
+
+    if len(values) < len(all_flows):
+        return None
+    if not _is_feasible(values, all_flows, transformers, conversion_factors, buses, n):
+        logging.warning("Fixed flows violate balances or flow bounds, leave the system to the "
+                        "solver")
+        return None
+    return values
+
+
+def timeincrement(energysystem):
+
+    r"""
+    Returns the durations of the time steps of an energy system in hours
+    The durations are taken from energysystem.timeincrement or, like solph.Model does, from the
+    frequency of the time index.
+    ----
+    Parameters
+    ----------
+    energysystem: solph.EnergySystem with time index
+
+    Returns
+    -------
+    hours : np.ndarray with one duration [h] per time step
+
+    """
+    n = len(energysystem.timeindex)
+    if energysystem.timeincrement is not None:
+        return _sequence_to_array(sequence(energysystem.timeincrement), n)
+    freq = energysystem.timeindex.freq
+    if freq is None:
+        raise ValueError("The time index of the energy system has no frequency, pass a "
+                         "timeincrement to the energy system")
+    return np.full(n, freq.nanos / 3.6e12)
+
+
+def _ports(transformer):
+    # input and output nodes of a transformer
+    return list(transformer.inputs) + list(transformer.outputs)
+
+
+def _edge(transformer, port):
+    # flow key between a transformer and one of its input or output nodes
+    return (port, transformer) if port in transformer.inputs else (transformer, port)
+
+
+def _is_coupled(flow):
+    # True if a flow has constraints over several time steps
+    if any(getattr(flow, name, None) is not None for name in COUPLING_FLOW_ATTRIBUTES):
+        return True
+    return any(getattr(flow, name, {"ub": [None]})["ub"][0] is not None
+               for name in ("positive_gradient", "negative_gradient"))
+
+
+def _is_feasible(values, all_flows, transformers, conversion_factors, buses, n):
+    # checks flow bounds, transformer relations and bus balances of the propagated flows
+    for key, flow in all_flows.items():
+        if flow.nominal_value is not None and _sequence_to_array(flow.fix, n) is not None:
+            continue  # solph sets no bounds on fixed flows
+        lower = np.zeros(n)
+        upper = np.full(n, np.inf)
+        if flow.nominal_value is not None:
+            lower = _sequence_to_array(flow.min, n) * flow.nominal_value
+            upper = _sequence_to_array(flow.max, n) * flow.nominal_value
+        if np.any(values[key] < lower - TOLERANCE) or np.any(values[key] > upper + TOLERANCE):
+            return False
+    for t in transformers:
+        ports = _ports(t)
+        for p in ports[1:]:
+            lhs = values[_edge(t, ports[0])] * conversion_factors[t][p]
+            rhs = values[_edge(t, p)] * conversion_factors[t][ports[0]]
+            if not np.allclose(lhs, rhs, atol=TOLERANCE):
+                return False
+    for bus in buses:
+        inflow = sum((values[src, bus] for src in bus.inputs), np.zeros(n))
+        outflow = sum((values[bus, dst] for dst in bus.outputs), np.zeros(n))
+        if not np.allclose(inflow, outflow, atol=TOLERANCE):
+            return False
+    return True
+
+
+def _sequence_to_array(seq, n):
+    # converts a solph sequence (scalar or iterable) to a float array of length n, None stays None
+    if isinstance(seq, _Sequence):
+        if seq.default is None:
+            return None
+        return np.full(n, seq.default, dtype=np.float64)
+    if seq is None:
+        return None
+    return np.asarray(seq, dtype=np.float64)[:n]
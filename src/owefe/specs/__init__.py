@@ -0,0 +1,33 @@
+# -*- coding: utf-8
+
+"""
+Component specifications of OWEFE (plants, photovoltaic panels, digesters, constructed wetlands).
+This file is part of the project OWEFE;
+The spec modules only depend on NumPy and are imported on first access, e.g. owefe.specs.plant.
+"""
+
+import importlib
+
+# spec modules imported on first attribute access
+SUBMODULES = (
+    "constructedwetlands",
+    "digester",
+    "digester_CSTR",
+    "digester_KT",
+    "digester_floating_drum",
+    "photovoltaic_panel",
+    "plant",
+    "timeseries",
+)
+
+__all__ = list(SUBMODULES)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
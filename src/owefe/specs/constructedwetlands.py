@@ -0,0 +1,231 @@
+# average COD (influent) from Anaerobic digester in range 1500 to 2000 mg/L (source: Metcalf and Eddy(2004))
+# ratio between BOD / COD (influent) is 0.3 to 0.8
+# ratio between BOD / COD (effluent) is 0.1 to 0.3 -> we take avg ratio: 0.5
+# For plug flow, BOD5 -> first order kinematics
+# K1 -> constant (Reed et al, 1988)
+# Hydraulic retention time 4days is highly effective (source: D. Ghosh et al., 2010)
+# porosity (typically) 0.4 for 25-mm gravel
+# temperature remain constant between 31 - 33 degree Celsius
+# Depth of CW (m) = [1 – 1.8m usually]
+# net discharge is excluding seepage that is 10% of total discharge
+# average nitrate in influent water is assume to 450mg/L (source: case study of FSM in leh town,Ladhak/TUM)
+# cw_area multiplied by 24 to convert into day
+# net evaporation is calculate in mm/day
+# HRT = 4days
+# calc_effluent_series evaluates a wetland of fixed area for every time step of the flow sequences:
+# the hydraulic retention time of a step follows from the pore volume and the current (or HRT-window
+# averaged) discharge, so flow peaks shorten the retention time and raise the effluent
+# concentrations
+
+
+from collections import namedtuple
+import logging
+import math
+
+import numpy as np
+
+from .timeseries import _is_series, to_array
+
+WHO_COD_LIMIT = 250  # [mg/L] WHO allowable COD in the effluent
+WHO_NO3_LIMIT = 50  # [mg/L] WHO guideline value for nitrate
+
+
+class WetlandDesign(namedtuple("WetlandDesign", [
+        "hrt", "cw_area", "BOD_effluent", "COD_effluent", "NO3_effluent", "limiting"])):
+    r"""
+    Sizing results of size_wetland
+    ----
+    Fields
+    ----------
+    hrt: minimum hydraulic retention time [d]
+    cw_area: minimum wetland area [m²]
+    BOD_effluent, COD_effluent, NO3_effluent: effluent concentrations of the sized wetland [mg/L]
+    limiting: name of the target that determines the size ("BOD", "COD" or "NO3"),
+        None if the influent meets all targets without treatment
+    """
+    __slots__ = ()
+
+
+class Constructed_wetlands:
+    def __init__(self, influent, effluent):
+        self.influent = influent
+        self.effluent = effluent
+
+    def compute(self):
+        depth = 0.6
+        porosity = 0.4
+        temperature = 35
+        COD_influent = 1800
+        BOD_influent = COD_influent * 0.5
+        NO3_influent = 450
+        retention_time = 4
+        avg_discharge = (self.influent + self.effluent) / 2
+        cw_area = avg_discharge * retention_time / (porosity * depth)
+        net_evaporation = (self.influent - self.effluent)/(0.001 * cw_area)
+        K1 = 68.6 * porosity ** 4.172 * 1.06 ** (temperature-20)
+        a_1 = 2 * porosity * cw_area * depth
+        a_2 = (2 * self.influent) - (0.001 * net_evaporation * cw_area)
+        a_3 = (a_1/a_2)
+        BOD_effluent = BOD_influent * math.exp(-K1*a_3)
+        COD_effluent = BOD_effluent * 2
+        # second cell correction of the original model: efficiency * BOD_effluent reduces to
+        # BOD_effluent - BOD_influent, which is negative whenever the first cell removes BOD; it is
+        # kept for the results of compute(), calc_effluent_series does not apply it
+        efficiency = (BOD_effluent - BOD_influent) / BOD_effluent
+        BOD_new: float = efficiency * BOD_effluent
+        COD_new = float(BOD_new * 2)
+        if COD_effluent > WHO_COD_LIMIT:
+            logging.warning("COD {0} mg/L is higher than the WHO allowable limit {1} mg/L, one "
+                            "more horizontal subsurface constructed wetland is needed".format(
+                                COD_effluent, WHO_COD_LIMIT))
+            BOD_effluent = BOD_new
+            COD_effluent = COD_new
+            logging.info("New COD is {0} mg/L".format(COD_new))
+        else:
+            logging.info("COD {0} mg/L is within the WHO allowable limit".format(COD_effluent))
+        var4 = -0.126 * 1.008 ** (temperature - 20) * retention_time
+        NO3_effluent = NO3_influent * math.exp(var4)
+        return avg_discharge, cw_area, net_evaporation, BOD_effluent, COD_effluent, NO3_effluent
+
+
+def calc_effluent_series(influent, effluent, cw_area=None, window=None, depth=0.6, porosity=0.4,
+                         temperature=35, COD_influent=1800, NO3_influent=450, retention_time=4,
+                         COD_limit=WHO_COD_LIMIT):
+
+    r"""
+    Calculates the BOD, COD and nitrate effluent of a single wetland cell for every time step
+    With the mean flows and the default area the results equal those of
+    Constructed_wetlands.compute() before its second cell correction; that correction gives
+    negative concentrations and is not applied, so COD_effluent above COD_limit stays as it is and
+    is flagged in the exceedance column.
+    ----
+    Parameters
+    ----------
+    influent: discharge into the wetland per time step as list, np.ndarray, pd.Series or
+        xarray.DataArray
+    effluent: discharge out of the wetland per time step, same length as influent
+    cw_area: wetland area; by default sized for the mean discharge and retention_time like compute()
+    window: number of time steps the discharge is averaged over (e.g. the HRT in hours), None for
+        every step
+    depth, porosity, temperature, COD_influent, NO3_influent, retention_time: see
+        Constructed_wetlands.compute
+    COD_limit: COD effluent limit [mg/L] for the exceedance flag
+
+    Returns
+    -------
+    effluent_quality : pd.DataFrame: columns avg_discharge, hrt, BOD_effluent, COD_effluent,
+         NO3_effluent and exceedance (COD above COD_limit), indexed like influent if it is a
+         pd.Series
+
+    """
+    inflow = to_array(influent, "influent")
+    outflow = to_array(effluent, "effluent")
+    if len(inflow) != len(outflow):
+        raise ValueError("Arguments 'influent' and 'effluent' must have the same length")
+    avg_discharge = (inflow + outflow) / 2
+    if window is not None and window > 1:
+        avg_discharge = _trailing_mean(avg_discharge, int(window))
+    if cw_area is None:
+        cw_area = avg_discharge.mean() * retention_time / (porosity * depth)
+
+    BOD_influent = COD_influent * 0.5
+    K1 = _bod_rate(porosity, temperature)
+    # the area and net evaporation terms of compute() reduce to the retention time of the pore
+    # volume
+    with np.errstate(divide="ignore"):
+        hrt = porosity * depth * cw_area / avg_discharge
+    BOD_effluent = BOD_influent * np.exp(-K1 * hrt)
+    COD_effluent = BOD_effluent * 2
+    NO3_effluent = NO3_influent * np.exp(-_no3_rate(temperature) * hrt)
+
+    import pandas as pd  # only needed for the result table, the spec kernels load without it
+
+    index = influent.index if _is_series(influent) else None
+    return pd.DataFrame({
+        "avg_discharge": avg_discharge,
+        "hrt": hrt,
+        "BOD_effluent": BOD_effluent,
+        "COD_effluent": COD_effluent,
+        "NO3_effluent": NO3_effluent,
+        "exceedance": COD_effluent > COD_limit,
+    }, index=index)
+
+
+def size_wetland(design_flow, temperature, COD_target=WHO_COD_LIMIT, BOD_target=None,
+                 NO3_target=WHO_NO3_LIMIT, depth=0.6, porosity=0.4, COD_influent=1800,
+                 NO3_influent=450):
+
+    r"""
+    Sizes the smallest wetland whose effluent meets the BOD, COD and nitrate targets
+    The first order removal of compute() is inverted per target, hrt = ln(c_influent / c_target) /
+    k(T), and the largest retention time is kept; all arguments are broadcast against each other, so
+    whole grids of design flows and temperatures are sized at once.
+    ----
+    Parameters
+    ----------
+    design_flow: average discharge through the wetland [m³/d], scalar or array
+    temperature: water temperature [°C], scalar or array
+    COD_target: COD effluent limit [mg/L]
+    BOD_target: BOD5 effluent limit [mg/L], None to only require COD_target (BOD = COD / 2)
+    NO3_target: nitrate effluent limit [mg/L], None to ignore nitrate
+    depth, porosity, COD_influent, NO3_influent: see Constructed_wetlands.compute
+
+    Returns
+    -------
+    design : WetlandDesign with fields of the broadcast shape of the arguments
+
+    """
+    design_flow = np.asarray(design_flow, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    BOD_influent = COD_influent * 0.5
+    bod_rate = _bod_rate(porosity, temperature)
+    no3_rate = _no3_rate(temperature)
+
+    # retention time required by each target; targets above the influent need no treatment
+    targets = {"BOD": np.inf if BOD_target is None else BOD_target, "COD": COD_target / 2,
+               "NO3": np.inf if NO3_target is None else NO3_target}
+    required = np.stack(np.broadcast_arrays(
+        np.log(BOD_influent / np.minimum(targets["BOD"], BOD_influent)) / bod_rate,
+        np.log(BOD_influent / np.minimum(targets["COD"], BOD_influent)) / bod_rate,
+        np.log(NO3_influent / np.minimum(targets["NO3"], NO3_influent)) / no3_rate,
+        design_flow,
+    )[:3])  # design_flow only takes part in the broadcast
+    hrt = required.max(axis=0)
+    cw_area = design_flow * hrt / (porosity * depth)
+    BOD_effluent = BOD_influent * np.exp(-bod_rate * hrt)
+    NO3_effluent = NO3_influent * np.exp(-no3_rate * hrt)
+    # no target is limiting if the influent meets all of them
+    names = np.array(["BOD", "COD", "NO3"], dtype=object)
+    limiting = np.where(hrt > 0, names[required.argmax(axis=0)], None)
+    return WetlandDesign(*(_unwrap(np.asarray(value)) for value in (
+        hrt, cw_area, BOD_effluent, BOD_effluent * 2, NO3_effluent, limiting)))
+
+
+def exceedance_hours(COD_effluent, COD_limit=WHO_COD_LIMIT, step_hours=1):
+    # number of hours in which the COD effluent exceeds the limit
+    return float(np.count_nonzero(to_array(COD_effluent, "COD_effluent") > COD_limit) * step_hours)
+
+
+def _unwrap(value):
+    # 0-d arrays of scalar inputs are returned as scalars
+    return value[()] if value.ndim == 0 else value
+
+
+def _bod_rate(porosity, temperature):
+    # first order BOD5 removal rate K1 [1/d] (Reed et al, 1988)
+    return 68.6 * porosity ** 4.172 * 1.06 ** (temperature - 20)
+
+
+def _no3_rate(temperature):
+    # first order nitrate removal rate [1/d]
+    return 0.126 * 1.008 ** (temperature - 20)
+
+
+def _trailing_mean(values, window):
+    # mean over the last window values of every step; the first steps average over the steps
+    # available
+    cumsum = np.cumsum(values)
+    result = cumsum.copy()
+    result[window:] -= cumsum[:-window]
+    result /= np.minimum(np.arange(1, len(values) + 1), window)
+    return result
@@ -0,0 +1,125 @@
+# -*- coding: utf-8
+
+"""
+This module provides the interface shared by the digester models of OWEFE.
+This file is part of the project OWEFE;
+All digester models (digester_CSTR, digester_KT, digester_floating_drum) derive from BaseDigester.
+Their compute() accepts scalars or arrays for every constructor argument, evaluates all designs in
+one vectorized pass and returns a DigesterDesign with named fields.
+
+    ********** Design sweep ************
+    >>> from owefe.specs import digester_CSTR
+    >>> design = digester_CSTR.Digester.sweep(
+    ...     retention_time=np.arange(15, 41)[:, None],
+    ...     design_mass_flow=np.linspace(20, 60, 400)[None, :],
+    ...     sludge_density=997, sludge_specific_gravity=1.02, dry_solid_concentration=0.15,
+    ...     volatile_solid_concentration=0.7, biomethane_potential=0.3403)
+    >>> design.volume.shape
+    (26, 400)
+"""
+
+import abc
+from collections import namedtuple
+import importlib
+
+import numpy as np
+
+# module names of the digester models, see get_digester
+DIGESTER_TYPES = {
+    "CSTR": "digester_CSTR",
+    "KT": "digester_KT",
+    "floating_drum": "digester_floating_drum",
+}
+
+
+class DigesterDesign(namedtuple("DigesterDesign", [
+        "diameter", "volume", "conversion_factor", "surface_area", "active_volume", "olr",
+        "volumetric_flow"])):
+    r"""
+    Design results of a digester model
+    The field order matches the former 7-tuple of compute(), so tuple unpacking keeps working.
+    ----
+    Fields
+    ----------
+    diameter: digester diameter [m]
+    volume: total digester volume [m³]
+    conversion_factor: feedstock to biogas/methane conversion factor
+    surface_area: total surface area [m²]
+    active_volume: active (filled up) volume [m³]
+    olr: organic loading rate [kg vs/m³.d]
+    volumetric_flow: design volumetric flow [m³/d]
+    """
+    __slots__ = ()
+
+    def to_frame(self):
+        # flattens the designs to one row per design point
+        import pandas as pd
+
+        return pd.DataFrame({field: np.ravel(value) for field, value in self._asdict().items()})
+
+
+class BaseDigester(abc.ABC):
+    r"""
+    Common interface of the digester models
+    Subclasses store their constructor arguments as attributes, list their names in `parameters` and
+    implement compute() with NumPy operations, so that every argument may be an array. `gas` names
+    the product of the conversion factor ("methane" or "biogas"); `conversion_factor_basis` states
+    whether it is given per kg of feedstock ("mass_flow", [m³/kg]) or per hour of operation
+    ("hourly", [m³/h]).
+    """
+
+    parameters = ()
+    gas = "biogas"
+    conversion_factor_basis = "mass_flow"
+
+    @abc.abstractmethod
+    def compute(self):
+        # DigesterDesign of the constructor arguments, see design_result
+        ...
+
+    def design_parameters(self):
+        # constructor arguments of this digester as dict
+        return {name: getattr(self, name) for name in self.parameters}
+
+    @classmethod
+    def sweep(cls, **parameters):
+
+        r"""
+        Computes the designs for all combinations of broadcast parameter arrays in one call
+        ----
+        Parameters
+        ----------
+        parameters: constructor arguments of the digester model as scalars or arrays; arrays are
+            broadcast against each other (e.g. shapes (n, 1) and (1, m) give an n x m grid)
+
+        Returns
+        -------
+        design : DigesterDesign whose fields all have the broadcast shape of the parameters
+
+        """
+        missing = set(cls.parameters) - set(parameters)
+        if missing:
+            raise TypeError(f"{cls.__module__}.{cls.__name__}.sweep() misses parameters "
+                            f"{sorted(missing)}")
+        arrays = np.broadcast_arrays(*(np.asarray(parameters[name], dtype=np.float64)
+                                       for name in cls.parameters))
+        return cls(**dict(zip(cls.parameters, arrays))).compute()
+
+
+def get_digester(digester_type):
+    # returns the digester class registered in DIGESTER_TYPES under digester_type
+    try:
+        module = DIGESTER_TYPES[digester_type]
+    except KeyError:
+        raise ValueError(f"Unknown digester type '{digester_type}', choose from "
+                         f"{sorted(DIGESTER_TYPES)}")
+    return importlib.import_module(f"{__package__}.{module}").Digester
+
+
+def design_result(**fields):
+    # collects the fields of a DigesterDesign; 0-d arrays of scalar inputs are returned as scalars
+    values = {}
+    for field in DigesterDesign._fields:
+        value = np.asarray(fields[field], dtype=np.float64)
+        values[field] = value[()] if value.ndim == 0 else value
+    return DigesterDesign(**values)
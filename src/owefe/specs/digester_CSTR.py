@@ -34,8 +34,17 @@
 
 import math
 
+import numpy as np
+
+from .digester import BaseDigester, design_result
+
+
+class Digester(BaseDigester):
+    gas = "methane"
+    conversion_factor_basis = "mass_flow"
+    parameters = ("retention_time", "design_mass_flow", "sludge_density", "sludge_specific_gravity",
+                  "dry_solid_concentration", "volatile_solid_concentration", "biomethane_potential")
 
-class Digester:
     def __init__(self, retention_time, design_mass_flow, sludge_density,
                  sludge_specific_gravity, dry_solid_concentration, volatile_solid_concentration, biomethane_potential):
         self.retention_time = retention_time
@@ -54,7 +63,7 @@ class Digester:
         # digester volume
         volume_total = volumetric_flow * self.retention_time
         # digester geometry
-        radius = (volume_total/(2*math.pi))**(1/3)  # rearranged cylindric volume formula;
+        radius = np.cbrt(volume_total/(2*math.pi))  # rearranged cylindric volume formula;
         # assuming a fixed active depth : radius ratio of 2:1 (El Jouahari et al. 2021)
         diameter = 2*radius
         active_depth = 2*radius
@@ -66,7 +75,7 @@ class Digester:
         roof_area = math.pi * radius**2
         # Floor Area
         cone_height = 0.2*radius
-        generatrix = (cone_height**2+radius**2)**(1/2)
+        generatrix = np.sqrt(cone_height**2+radius**2)
         floor_area = math.pi*radius*generatrix
         surface_area_total = wall_area+roof_area+floor_area
 
@@ -77,4 +86,6 @@ class Digester:
 
         # feedstock to biogas conversion factor; calculation over BMP (Biomethane potential)
         f_b_cf = self.dry_solid_concentration * self.volatile_solid_concentration * self.biomethane_potential
-        return diameter, volume_total, f_b_cf, surface_area_total, active_volume, olr, volumetric_flow
+        return design_result(diameter=diameter, volume=volume_total, conversion_factor=f_b_cf,
+                             surface_area=surface_area_total, active_volume=active_volume, olr=olr,
+                             volumetric_flow=volumetric_flow)
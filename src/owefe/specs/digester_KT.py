@@ -50,16 +50,26 @@
 import math
 import numpy as np
 
+from .digester import BaseDigester, design_result
+from .timeseries import wrap_like
+
+
+class Digester(BaseDigester):
+    gas = "biogas"
+    conversion_factor_basis = "hourly"
+    parameters = ("retention_time", "design_mass_flow", "sludge_density", "sludge_specific_gravity",
+                  "yield_factor")
 
-class Digester:
     def __init__(self, retention_time, design_mass_flow, sludge_density, sludge_specific_gravity, yield_factor):
         self.retention_time = retention_time
         self.design_mass_flow = design_mass_flow
         self.sludge_density = sludge_density
         self.sludge_specific_gravity = sludge_specific_gravity
-        self.yield_factor = yield_factor
-        if self.retention_time > 30:  # retention_time in days
-            self.yield_factor = 10.59
+        # retention_time in days; element-wise to allow arrays of retention times, scalar inputs
+        # keep a float yield factor
+        yield_factor = np.where(np.asarray(retention_time) > 30, 10.59, yield_factor)
+        self.yield_factor = (float(yield_factor) if yield_factor.ndim == 0
+                             else wrap_like(yield_factor, retention_time))
 
         # Unit: [m³/days] Multiply by 24 to convert hour to days
 
@@ -75,7 +85,7 @@ class Digester:
         diameter = 1.5 * total_height_digester
         radius = diameter / 2
         volume_total = (math.pi * radius ** 2 * height2) + (1 / 3 * math.pi * radius ** 2 * height1)
-        surface_area_cone = math.pi * radius * (radius + math.sqrt(height1 ** 2 + radius ** 2))
+        surface_area_cone = math.pi * radius * (radius + np.sqrt(height1 ** 2 + radius ** 2))
         surface_area_cylinder_overground = 2 * math.pi * radius * height2
         floor_area = math.pi * radius ** 2
         surface_area_total = surface_area_cylinder_overground + surface_area_cone + floor_area
@@ -83,4 +93,7 @@ class Digester:
         total_vs_loading = 0.8 * total_dry_solids  # [kg/h], total volatile solid loading
         olr = total_vs_loading / filled_up_volume * 24  # [kg vs/m³.d], organic loading rate
         conversion_factor = (volume_total * self.yield_factor * 0.2 * 0.8) / 1000  # [m³/h] formula explained above
-        return diameter, volume_total,conversion_factor, surface_area_total, filled_up_volume, olr, volumetric_flow
+        return design_result(diameter=diameter, volume=volume_total,
+                             conversion_factor=conversion_factor, surface_area=surface_area_total,
+                             active_volume=filled_up_volume, olr=olr,
+                             volumetric_flow=volumetric_flow)
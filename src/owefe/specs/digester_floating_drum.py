@@ -49,8 +49,16 @@
 import math
 import numpy as np
 
+from .digester import BaseDigester, design_result
+
+
+class Digester(BaseDigester):
+    gas = "biogas"
+    conversion_factor_basis = "mass_flow"
+    parameters = ("retention_time", "design_mass_flow", "volatile_solid_destruction_rate",
+                  "sludge_density", "sludge_specific_gravity", "dry_solid_concentration",
+                  "volatile_solid_concentration", "specific_gas_production")
 
-class Digester:
     def __init__(self, retention_time, design_mass_flow, volatile_solid_destruction_rate, sludge_density,
                  sludge_specific_gravity, dry_solid_concentration, volatile_solid_concentration,
                  specific_gas_production):
@@ -77,7 +85,7 @@ class Digester:
         diameter = 1.5 * total_height_digester
         radius = diameter / 2
         volume_total = (math.pi * radius ** 2 * height2) + (1 / 3 * math.pi * radius ** 2 * height1)
-        surface_area_cone = math.pi * radius * (radius + math.sqrt(height1 ** 2 + radius ** 2))
+        surface_area_cone = math.pi * radius * (radius + np.sqrt(height1 ** 2 + radius ** 2))
         surface_area_cylinder_overground = 2 * math.pi * radius * height2
         floor_area = math.pi * radius ** 2
         surface_area_total = surface_area_cylinder_overground + surface_area_cone + floor_area
@@ -91,4 +99,6 @@ class Digester:
         f_b_cf = self.dry_solid_concentration * self.volatile_solid_concentration\
                  * self.volatile_solid_destruction_rate * self.specific_gas_production  # formula explained above
 
-        return diameter, volume_total, f_b_cf, surface_area_total, filled_up_volume, olr, volumetric_flow
+        return design_result(diameter=diameter, volume=volume_total, conversion_factor=f_b_cf,
+                             surface_area=surface_area_total, active_volume=filled_up_volume,
+                             olr=olr, volumetric_flow=volumetric_flow)
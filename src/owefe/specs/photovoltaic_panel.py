@@ -0,0 +1,139 @@
+# -*- coding: utf-8
+
+"""
+This module provides functions to simulate the electricity production by photovoltaic panels.
+This file is part of the project OWEFE;
+The function for calculating energy generated by photovoltaic panels is inspired from Maleki et al. (2015)
+
+"""
+
+import numpy as np
+
+from .timeseries import to_array, wrap_like
+
+
+def calc_pv_te(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct):
+
+    r"""
+    Calculates the temperature factor influencing solar energy production
+    ----
+    Parameters
+    ----------
+    t_air: ambient air temperature as pd.series, np.ndarray, xarray.DataArray or list
+    p_rpv: rated Power of photovoltaic panel
+    r_ref: solar radiation at reference conditions
+    n_t: temperature coefficient of photovoltaic panel
+    t_c_ref: cell temperature at reference conditions
+    noct: normal operating cell temperature
+    ghi: global horizontal irradiance, same length as t_air
+    Returns
+    -------
+    pv_te : float values in the type of t_air (list, np.ndarray, pd.Series or xarray.DataArray):
+         temperature coefficients for calculating solar energy production
+
+    """
+    # Check if input arguments have proper type and length
+    temp = to_array(t_air, "t_air")
+    irradiance = to_array(ghi, "ghi")
+    if temp.shape != irradiance.shape:
+        raise ValueError(f"Arguments 't_air' {temp.shape} and 'ghi' {irradiance.shape} must have "
+                         "the same length!")
+    # t_c = t_air + ((noct-20)/800)*ghi; pv_te = p_rpv*(1/r_ref)*(1+n_t*(t_c-t_c_ref))
+    # (computed in place, the result is the only allocated array)
+    pv_te = np.multiply(irradiance, (noct-20)/800)
+    pv_te += temp
+    pv_te -= t_c_ref
+    pv_te *= n_t
+    pv_te += 1
+    pv_te *= p_rpv*(1/r_ref)
+    return wrap_like(pv_te, t_air)
+
+
+def calc_pv_te_batch(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct, dtype=np.float64,
+                     chunk_size=None):
+
+    r"""
+    Calculates the temperature factor for a batch of photovoltaic panel types at once
+    Panel parameters are given as scalars or arrays of equal length (one entry per panel type)
+    and are broadcast against the climate time series.
+    ----
+    Parameters
+    ----------
+    t_air: ambient air temperature as pd.series, np.ndarray, xarray.DataArray or list
+    ghi: global horizontal irradiance, same length as t_air
+    p_rpv: rated Power of photovoltaic panels
+    r_ref: solar radiation at reference conditions
+    n_t: temperature coefficients of photovoltaic panels
+    t_c_ref: cell temperatures at reference conditions
+    noct: normal operating cell temperatures
+    dtype: np.float64 (default) or np.float32 to halve the memory of the result
+    chunk_size: number of panel types evaluated per step, bounds the temporary memory;
+        None chooses it to keep temporaries around 2**20 values
+
+    Returns
+    -------
+    pv_te : np.ndarray of shape (panel types, time steps):
+         temperature factors of each panel type
+
+    Example
+    -------
+    >>> modules = pd.read_csv("module_datasheets.csv")  # columns p_rpv, n_t, t_c_ref, noct
+    >>> pv_te = calc_pv_te_batch(climate_df["t_air"], climate_df["ghi"], r_ref=1000,
+    ...                          **modules[["p_rpv", "n_t", "t_c_ref", "noct"]].to_dict("series"))
+    >>> annual_yield = pv_te @ climate_df["ghi"].to_numpy()
+
+    """
+    t_air, ghi, parameters = _prepare_batch(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct, dtype)
+    n_modules = len(parameters[0])
+    pv_te = np.empty((n_modules, len(t_air)), dtype=dtype)
+    if chunk_size is None:
+        chunk_size = max(1, 2**20 // max(1, len(t_air)))
+    for start, block in _iter_batch(t_air, ghi, parameters, chunk_size):
+        pv_te[start:start + len(block)] = block
+    return pv_te
+
+
+def calc_pv_te_chunks(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct, chunk_size, dtype=np.float64):
+
+    r"""
+    Yields the temperature factors of a batch of photovoltaic panel types chunk by chunk
+    Use this instead of calc_pv_te_batch if the full (panel types x time steps) matrix does not fit
+    into memory, e.g. to reduce each chunk to annual sums directly.
+    ----
+    Parameters
+    ----------
+    see calc_pv_te_batch; chunk_size is the number of panel types per chunk
+
+    Yields
+    -------
+    start, pv_te : index of the first panel type in the chunk and np.ndarray of shape (chunk, time
+        steps)
+
+    """
+    t_air, ghi, parameters = _prepare_batch(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct, dtype)
+    yield from _iter_batch(t_air, ghi, parameters, chunk_size)
+
+
+def _prepare_batch(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct, dtype):
+    # converts the climate series and broadcasts the panel parameters to 1-d arrays of equal length
+    t_air = to_array(t_air, "t_air", dtype=dtype)
+    ghi = to_array(ghi, "ghi", dtype=dtype)
+    if t_air.ndim != 1 or t_air.shape != ghi.shape:
+        raise ValueError(f"Arguments 't_air' {t_air.shape} and 'ghi' {ghi.shape} must be series of "
+                         "equal length!")
+    parameters = np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=dtype))
+                                       for p in (p_rpv, r_ref, n_t, t_c_ref, noct)))
+    if parameters[0].ndim != 1:
+        raise ValueError("Panel parameters must be scalars or 1-d arrays!")
+    return t_air, ghi, parameters
+
+
+def _iter_batch(t_air, ghi, parameters, chunk_size):
+    # evaluates calc_pv_te for chunks of panel types:
+    # pv_te = p_rpv/r_ref * (1 + n_t*(t_air + (noct-20)/800*ghi - t_c_ref))
+    p_rpv, r_ref, n_t, t_c_ref, noct = parameters
+    for start in range(0, len(p_rpv), chunk_size):
+        m = slice(start, start + chunk_size)
+        t_c = t_air + ((noct[m, None] - 20) / 800) * ghi
+        block = (p_rpv[m, None] / r_ref[m, None]) * (1 + n_t[m, None] * (t_c - t_c_ref[m, None]))
+        yield start, block
@@ -0,0 +1,196 @@
+# -*- coding: utf-8
+
+"""
+This module provides functions to simulate the growth of plants.
+This file is part of the project OWEFE;
+It is inspired by oemof thermal, in detail by following module:
+oemof-thermal/src/oemof/thermal/compression_heatpumps_and_chillers.py
+(SPDX-License-Identifier of source module: MIT)
+"""
+
+import numpy as np
+
+from .timeseries import _is_series, to_array, wrap_like
+
+
+def calc_te(t_air, t_opt, t_base, RUE):
+
+    r"""
+    Calculates the temperature on the biomass rate
+    ----
+    Parameters
+    ----------
+    t_air: ambient temperature as pd.series, np.ndarray, xarray.DataArray or list
+    t_opt: optimum temperature for biomass growth
+    t_base: base temperature for biomass growth
+    RUE: Radiation use efficiency (above ground only and without respiration
+    c_wh_to_mj: conversion factor Watt Hours (WH) to Mega Joules (MJ)
+    Returns
+    -------
+    te : float values in the type of t_air (list, np.ndarray, pd.Series or xarray.DataArray):
+         temperature coefficients for calculating biomass rate
+
+    """
+    # Introduce conversion factor Watt Hours (WH) to Mega Joules (MJ)
+    c_wh_to_mj = 3.6*10**(-3)
+    # Check if input arguments have proper type and length
+    temp = to_array(t_air, "t_air")
+    # Calculate te: 0 below t_base, linear increase up to t_opt, saturated above t_opt
+    # (computed in place, the result is the only allocated array)
+    te = np.subtract(temp, t_base)
+    te /= t_opt - t_base
+    np.clip(te, 0, 1, out=te)
+    te *= RUE * c_wh_to_mj
+    return wrap_like(te, t_air)
+
+
+def calc_arid(et_o, vwc, s_water, rzd):
+
+    r"""
+    Calculates the soil water availability impact on the biomass rate
+    arid factor derived from simple crop model and Woli et al. (2012), divided by 24 to transform to hourly values
+    ----
+    Parameters
+    ----------
+    et_o: potential evapotranspiration as pd.series, np.ndarray, xarray.DataArray or list
+    vwc: volumetric water content, same length as et_o
+    s_water: sensitivity of RUE to the ARID index
+    rzd: root zone depth
+
+    Returns
+    -------
+    wi : float values in the type of et_o (list, np.ndarray, pd.Series or xarray.DataArray):
+         aridity factor affecting the biomass rate
+
+    """
+
+    # Check if input arguments have proper type and length
+    evaporation = to_array(et_o, "et_o")
+    water_content = to_array(vwc, "vwc")
+    if evaporation.shape != water_content.shape:
+        raise ValueError(f"Arguments 'et_o' {evaporation.shape} and 'vwc' {water_content.shape} "
+                         f"must have the same length!")
+    # Calculate arid per time step: ratio of available soil water to evaporative demand;
+    # no evaporative demand (et_o = 0) means no water stress
+    demand = np.abs(evaporation)
+    wi = np.multiply(water_content, (0.096/24) * rzd)
+    np.minimum(demand, wi, out=wi)
+    no_demand = demand == 0
+    np.divide(wi, demand, out=wi, where=~no_demand)
+    wi[no_demand] = 1
+    # wi = 1 - s_water * (1 - ratio)
+    wi *= s_water
+    wi += 1 - s_water
+    return wrap_like(wi, et_o)
+
+
+def calc_arid_stream(et_o_chunks, vwc_chunks, s_water, rzd):
+
+    r"""
+    Calculates the aridity factor chunk by chunk, so long time series never have to be loaded at
+    once
+    The factor only depends on the values of the same time step, thus the concatenated
+    chunks are identical to calc_arid applied to the full series.
+    ----
+    Parameters
+    ----------
+    et_o_chunks: iterable of potential evapotranspiration chunks (e.g. pd.read_csv(...,
+        chunksize=8760))
+    vwc_chunks: iterable of volumetric water content chunks, paired with et_o_chunks
+    s_water: sensitivity of RUE to the ARID index
+    rzd: root zone depth
+
+    Yields
+    -------
+    wi : np.ndarray of float64 per chunk:
+         aridity factor affecting the biomass rate
+
+    Example
+    -------
+    >>> et_o = (c["pev"] for c in pd.read_csv("era5_et0.csv", usecols=["pev"], chunksize=8760))
+    >>> vwc = (c["vwc_rzd"]
+    ...        for c in pd.read_csv("era5_vwc.csv", usecols=["vwc_rzd"], chunksize=8760))
+    >>> wi = np.concatenate(list(calc_arid_stream(et_o, vwc, s_water=0.4, rzd=1)))
+
+    """
+    sentinel = object()
+    et_o_chunks = iter(et_o_chunks)
+    vwc_chunks = iter(vwc_chunks)
+    while True:
+        e = next(et_o_chunks, sentinel)
+        m = next(vwc_chunks, sentinel)
+        if e is sentinel and m is sentinel:
+            return
+        if e is sentinel or m is sentinel:
+            raise ValueError("Arguments 'et_o_chunks' and 'vwc_chunks' yield a different number of "
+                             "chunks!")
+        yield calc_arid(e, m, s_water, rzd)
+
+
+def calc_hi(t_max, t_heat, t_ext):
+
+    r"""
+    Calculates the heat impact on the biomass rate
+    ----
+    Parameters
+    ----------
+    t_max: daily maximum temperature as pd.series, np.ndarray, xarray.DataArray or list
+    t_ext: optimum temperature for biomass growth
+    t_heat: threshold temperature when biomass growth rate starts to be reduced by heat stress
+
+    Returns
+    -------
+    hi : float values in the type of t_max (list, np.ndarray, pd.Series or xarray.DataArray):
+         temperature coefficients for calculating biomass rate
+
+    """
+    # Check if input arguments have proper type and length
+    temp = to_array(t_max, "t_max")
+    # Calculate hi: 1 up to t_heat, linear section up to t_ext, 0 above t_ext (nan stays nan)
+    hi = np.subtract(temp, t_heat)
+    hi /= t_ext - t_heat
+    np.putmask(hi, temp <= t_heat, 1.0)
+    np.putmask(hi, temp > t_ext, 0.0)
+    return wrap_like(hi, t_max)
+
+
+def calc_growth(t_air, t_max, et_o, vwc, t_opt, t_base, RUE, t_heat, t_ext, s_water, rzd):
+
+    r"""
+    Calculates the combined impact of temperature, heat and aridity on the biomass rate
+    The product ti * hi * wi replaces the chain of one transformer per impact factor by a single
+    conversion factor, since the chain contains no decisions for the solver.
+    ----
+    Parameters
+    ----------
+    t_air: ambient temperature as pd.series, np.ndarray, xarray.DataArray or list
+    t_max: daily maximum temperature, same length as t_air
+    et_o: potential evapotranspiration, same length as t_air
+    vwc: volumetric water content, same length as t_air
+    t_opt: optimum temperature for biomass growth
+    t_base: base temperature for biomass growth
+    RUE: Radiation use efficiency (above ground only and without respiration
+    t_heat: threshold temperature when biomass growth rate starts to be reduced by heat stress
+    t_ext: extreme temperature when biomass growth rate reaches 0 due to heat stress
+    s_water: sensitivity of RUE to the ARID index
+    rzd: root zone depth
+
+    Returns
+    -------
+    growth : pd.DataFrame with columns ti, hi, wi and growth_factor:
+         impact factors for reporting and their product as conversion factor
+         from solar irradiance to biomass rate; index taken from t_air if it is a pd.Series
+
+    """
+    ti = np.asarray(calc_te(t_air=t_air, t_opt=t_opt, t_base=t_base, RUE=RUE))
+    hi = np.asarray(calc_hi(t_max=t_max, t_heat=t_heat, t_ext=t_ext))
+    wi = np.asarray(calc_arid(et_o=et_o, vwc=vwc, s_water=s_water, rzd=rzd))
+    if not ti.shape == hi.shape == wi.shape:
+        raise ValueError(f"Input series must have the same length, got t_air {ti.shape}, "
+                         f"t_max {hi.shape} and et_o/vwc {wi.shape}!")
+    import pandas as pd  # only needed for the result table, the spec kernels load without it
+
+    index = t_air.index if _is_series(t_air) else None
+    growth = pd.DataFrame({"ti": ti, "hi": hi, "wi": wi, "growth_factor": ti * hi * wi},
+                          index=index)
+    return growth
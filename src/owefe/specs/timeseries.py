@@ -0,0 +1,78 @@
+# -*- coding: utf-8
+
+"""
+This module provides the input normalization shared by the OWEFE spec functions.
+This file is part of the project OWEFE;
+Time series can be passed as list, np.ndarray, pd.Series or xarray.DataArray. The spec functions
+compute on NumPy arrays that share memory with the input wherever possible and return their results
+in the type of the input, so ERA5 arrays do not have to be wrapped into pandas objects first.
+pandas and xarray are not imported here: an input can only be one of their types if the caller has
+imported them already, so the specs load with NumPy alone.
+"""
+
+import sys
+
+import numpy as np
+
+
+def to_array(series, name, dtype=np.float64):
+
+    r"""
+    Returns the values of a time series as np.ndarray without copying them if possible
+    ndarray, pd.Series and xarray.DataArray inputs of the requested dtype are not copied;
+    other dtypes and lists are converted.
+    ----
+    Parameters
+    ----------
+    series: time series as list, np.ndarray, pd.Series or xarray.DataArray
+    name: name of the argument, used in the error message
+    dtype: dtype of the returned array
+
+    Returns
+    -------
+    values : np.ndarray:
+         values of the time series
+
+    """
+    if isinstance(series, (np.ndarray, list)) or _is_series(series) or _is_data_array(series):
+        return np.asarray(series, dtype=dtype)
+    raise TypeError(f"Argument '{name}' is not of type list, np.ndarray, pd.Series or "
+                    "xarray.DataArray!")
+
+
+def wrap_like(values, template):
+
+    r"""
+    Returns computed values in the type of the time series they were computed from
+    pd.Series keep the index and xarray.DataArray keep dims and coords of the template;
+    the values are not copied.
+    ----
+    Parameters
+    ----------
+    values: np.ndarray of the same shape as template
+    template: input time series as list, np.ndarray, pd.Series or xarray.DataArray
+
+    Returns
+    -------
+    result : values as list, np.ndarray, pd.Series or xarray.DataArray
+
+    """
+    if _is_series(template):
+        return sys.modules["pandas"].Series(values, index=template.index, copy=False)
+    if _is_data_array(template):
+        return template.copy(deep=False, data=values)
+    if isinstance(template, list):
+        return values.tolist()
+    return values
+
+
+def _is_series(series):
+    # pandas is only checked if it has already been imported by the caller
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(series, pd.Series)
+
+
+def _is_data_array(series):
+    # xarray is only checked if it has already been imported by the caller
+    xr = sys.modules.get("xarray")
+    return xr is not None and isinstance(series, xr.DataArray)
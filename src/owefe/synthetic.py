@@ -0,0 +1,332 @@
+# -*- coding: utf-8
+
+"""
+This module generates synthetic input series for scale tests of the OWEFE models.
+This file is part of the project OWEFE;
+The case studies come with one year of Tibnine wastewater data (ww_biogas_tibnine_raw.csv) and one
+to two years of Hegelbach ERA5 data. The generator produces series of any length, site and
+resolution with the columns of these files, statistically close to the measured ones: a seasonal and
+a daily cycle, day-to-day anomalies that persist (AR(1) processes of daily values) and hourly noise.
+The same seed, site and start always give the same series, and the first years do not change if more
+years are generated. The series are written to parquet straight from the generated arrays, one row
+group per site and year, so the memory use does not grow with the number of years.
+
+    ********** Columns ************
+    dewatered_sludge [kg/h], temperature [°C], demand_electricity [kW]: as in
+        ww_biogas_tibnine_raw.csv (sludge and electricity demand are daily values)
+    ghi [W/m²], t_air [°C]: as in ERA5_pvlib_*.csv, clear-sky irradiance of the site times a
+        clearness index
+    pev [m]: potential evaporation as in era5_et0.csv (negative: evaporation), accumulated from
+        00 UTC to the time step; the value at 00 UTC is the total of the previous day
+    vwc_rzd [m³/m³]: root zone soil moisture as in era5_vwc.csv
+
+    >>> data = generate("tibnine", start="2020-01-01", years=5, freq="1h", seed=42)
+    >>> write_inputs("scale_test.parquet", sites=["tibnine", "hegelbach"], years=30, freq="15min")
+    >>> data = read_inputs("scale_test.parquet", site="hegelbach", columns=["ghi", "t_air"])
+    >>> freq = read_settings("scale_test.parquet")["freq"]
+"""
+
+from collections import namedtuple
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNS = ("dewatered_sludge", "temperature", "demand_electricity", "ghi", "t_air", "pev",
+           "vwc_rzd")
+
+
+class Site(namedtuple("Site", [
+        "name", "latitude", "longitude", "t_mean", "t_seasonal", "t_daily", "t_noise", "clearness",
+        "clearness_noise", "pev_scale", "vwc_mean", "vwc_seasonal", "vwc_noise", "sludge_mean",
+        "sludge_seasonal", "sludge_noise", "electricity_mean", "electricity_seasonal",
+        "electricity_noise"])):
+    r"""
+    Climate and demand statistics of a site
+    ----
+    Fields
+    ----------
+    name: name of the site, written to the site column and part of the seed
+    latitude, longitude: position [°], the time steps are in UTC
+    t_mean, t_seasonal, t_daily, t_noise: annual mean, seasonal and daily amplitude and standard
+        deviation of the daily anomalies of the air temperature [°C]
+    clearness, clearness_noise: mean and standard deviation of the daily clearness index
+        (ghi / clear-sky ghi)
+    pev_scale: potential evaporation rate at 1000 W/m² and 10 °C [m/h]
+    vwc_mean, vwc_seasonal, vwc_noise: mean, seasonal amplitude and standard deviation of the root
+        zone soil moisture [m³/m³]
+    sludge_mean, sludge_seasonal, sludge_noise: mean dewatered sludge [kg/h], its seasonal amplitude
+        and the standard deviation of its anomalies relative to the mean
+    electricity_mean, electricity_seasonal, electricity_noise: the same for the electricity
+        demand [kW]
+    """
+    __slots__ = ()
+
+
+# fitted to ww_biogas_tibnine_raw.csv and to the ERA5 files of examples/agrivoltaics hegelbach
+SITES = {
+    "tibnine": Site("tibnine", 33.2, 35.4, t_mean=19.1, t_seasonal=8.0, t_daily=4.9, t_noise=2.0,
+                    clearness=0.75, clearness_noise=0.12, pev_scale=1.1e-3, vwc_mean=0.25,
+                    vwc_seasonal=0.08, vwc_noise=0.02, sludge_mean=71.5, sludge_seasonal=0.25,
+                    sludge_noise=0.25, electricity_mean=47.0, electricity_seasonal=0.03,
+                    electricity_noise=0.08),
+    "hegelbach": Site("hegelbach", 47.9, 9.1, t_mean=9.4, t_seasonal=10.0, t_daily=4.0, t_noise=3.0,
+                      clearness=0.65, clearness_noise=0.2, pev_scale=8.5e-4, vwc_mean=0.31,
+                      vwc_seasonal=0.05, vwc_noise=0.02, sludge_mean=71.5, sludge_seasonal=0.25,
+                      sludge_noise=0.25, electricity_mean=47.0, electricity_seasonal=0.03,
+                      electricity_noise=0.08),
+}
+
+# persistence of the daily anomalies from one day to the next
+PERSISTENCE = {"t_air": 0.7, "clearness": 0.3, "vwc_rzd": 0.97, "dewatered_sludge": 0.98,
+               "demand_electricity": 0.95}
+
+
+def generate(site="tibnine", start="2020-01-01", years=1, freq="1h", seed=42, columns=COLUMNS):
+
+    r"""
+    Generates the synthetic input series of one site
+    ----
+    Parameters
+    ----------
+    site: name of a site in SITES or a Site
+    start: first time step (UTC)
+    years: number of years
+    freq: time step, a pandas frequency that divides one day such as 15min, 1h, 3h or 1D; steps
+        above one hour average hourly values, which keeps rates (kg/h, kW, W/m²) in their unit
+    seed: seed of the random numbers
+    columns: columns to return, see COLUMNS
+
+    Returns
+    -------
+    data : pd.DataFrame:
+         one column per series, indexed by the time steps
+
+    """
+    chunks = [chunk for _, chunk in _chunks([site], start, years, freq, seed, columns)]
+    return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+
+def write_inputs(path, sites=("tibnine",), start="2020-01-01", years=1, freq="1h", seed=42,
+                 columns=COLUMNS, dtype=np.float64):
+
+    r"""
+    Writes the synthetic input series of several sites to a parquet file
+    ----
+    Parameters
+    ----------
+    path: parquet file
+    sites: names of sites in SITES or Site tuples
+    start, years, freq, seed, columns: see generate()
+    dtype: dtype of the value columns (np.float32 halves the file size)
+
+    Returns
+    -------
+    rows : int: number of rows written; the file has the columns timestamp, site and the requested
+         columns, and the generator settings as JSON in the schema metadata (key owefe.synthetic)
+
+    """
+    _require_pyarrow()
+    columns = list(columns)
+    value_type = pa.from_numpy_dtype(np.dtype(dtype))
+    schema = pa.schema([pa.field("timestamp", pa.timestamp("ns")), pa.field("site", pa.string())]
+                       + [pa.field(column, value_type) for column in columns])
+    settings = {"sites": [_site(site).name for site in sites], "start": str(pd.Timestamp(start)),
+                "years": years, "freq": freq, "seed": seed}
+    schema = schema.with_metadata({"owefe.synthetic": json.dumps(settings)})
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for name, chunk in _chunks(sites, start, years, freq, seed, columns):
+            arrays = [pa.array(chunk.index.values),
+                      pa.array(np.full(len(chunk), name, dtype=object), pa.string())]
+            arrays += [pa.array(chunk[column].to_numpy(dtype=dtype)) for column in columns]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def read_inputs(path, site=None, columns=None):
+
+    r"""
+    Reads synthetic input series written by write_inputs()
+    ----
+    Parameters
+    ----------
+    path: parquet file
+    site: name of the site to read, by default the first one of the file
+    columns: columns to read, by default all
+
+    Returns
+    -------
+    data : pd.DataFrame:
+         the requested columns, indexed by timestamp
+
+    """
+    _require_pyarrow()
+    if site is None:
+        site = read_settings(path)["sites"][0]
+    read_columns = None if columns is None else ["timestamp", "site"] + list(columns)
+    table = pq.read_table(path, columns=read_columns, filters=[("site", "=", site)],
+                          memory_map=True)
+    data = table.to_pandas().set_index("timestamp")
+    data.index.name = None
+    return data.drop(columns="site", errors="ignore")
+
+
+def read_settings(path):
+
+    r"""
+    Reads the generator settings of a parquet file written by write_inputs()
+    ----
+    Parameters
+    ----------
+    path: parquet file
+
+    Returns
+    -------
+    settings : dict:
+         sites, start, years, freq (time step of the rows of every site) and seed
+
+    """
+    _require_pyarrow()
+    metadata = pq.read_schema(path).metadata or {}
+    if b"owefe.synthetic" not in metadata:
+        raise ValueError("{0} was not written by owefe.synthetic.write_inputs".format(path))
+    return json.loads(metadata[b"owefe.synthetic"])
+
+
+def _chunks(sites, start, years, freq, seed, columns):
+    # yields (site name, data) per site and year; the AR(1) states are handed over to the next year
+    start = pd.Timestamp(start)
+    try:
+        step = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+    except ValueError:
+        step = None  # anchored or calendar frequencies such as W or M
+    if step is None or pd.Timedelta(days=1) % step:
+        # longer steps would not line up with the years the series are generated in
+        raise ValueError("The time step {0} must divide one day, e.g. 15min, 1h, 3h or 1D".format(
+            freq))
+    base = min(step, pd.Timedelta(hours=1))
+    if step % base:
+        raise ValueError("The time step {0} must be a multiple of one hour or shorter than one "
+                         "hour".format(freq))
+    for site in sites:
+        site = _site(site)
+        state = {}
+        for year in range(years):
+            chunk_start = start + pd.DateOffset(years=year)
+            chunk_end = start + pd.DateOffset(years=year + 1)
+            index = pd.date_range(chunk_start, chunk_end, freq=base)
+            index = index[index < chunk_end]
+            rng = np.random.default_rng([seed, zlib.crc32(site.name.encode()), year])
+            data = _series(site, index, rng, state)
+            if step != base:
+                # mean over the base steps of every time step, rates keep their unit
+                position = (index - chunk_start) // step
+                data = data.groupby(position).mean()
+                data.index = chunk_start + data.index * step
+            yield site.name, data[list(columns)]
+
+
+def _series(site, index, rng, state):
+    # generates all columns for the time steps of index (one year at most)
+    hours = (index.hour + index.minute / 60).to_numpy()
+    day = ((index - index[0].normalize()) // pd.Timedelta(days=1)).to_numpy()
+    days = day[-1] + 1
+    doy = index.dayofyear.to_numpy()
+    # seasons of the southern hemisphere are shifted by half a year
+    season_doy = doy + (182 if site.latitude < 0 else 0)
+
+    def anomalies(name, sd):
+        # daily AR(1) anomalies, continued from the state of the previous year, one value per step
+        initial = state[name] if name in state else rng.standard_normal()
+        values = _ar1(rng, days, PERSISTENCE[name], initial)
+        state[name] = values[-1]
+        return sd * values[day]
+
+    # +1 in the cold, -1 in the warm season
+    seasonal = np.cos(2 * np.pi * (season_doy - 20) / 365.25)
+    t_air = (site.t_mean - site.t_seasonal * seasonal
+             - site.t_daily * np.cos(2 * np.pi * (hours - 3) / 24)
+             + anomalies("t_air", site.t_noise) + rng.normal(0, 0.5, len(index)))
+
+    clearness = np.clip(site.clearness + anomalies("clearness", site.clearness_noise)
+                        + rng.normal(0, 0.05, len(index)), 0.05, 1)
+    ghi = _clear_sky_ghi(site, doy, hours) * clearness
+
+    # evaporation within each time step [m], accumulated from 00 UTC like the ERA5 values
+    step_hours = (index[1] - index[0]) / pd.Timedelta(hours=1) if len(index) > 1 else 1
+    evaporation = -(site.pev_scale * ghi / 1000 * np.clip(1 + 0.03 * (t_air - 10), 0.1, None)
+                    + 1e-6) * step_hours
+    accumulation_day = (index - pd.Timedelta(1, "ns")).normalize().asi8
+    pev = pd.Series(evaporation).groupby(accumulation_day).cumsum().to_numpy()
+    if state.get("pev_day") == accumulation_day[0]:
+        # the day started in the previous year
+        pev[accumulation_day == accumulation_day[0]] += state["pev"]
+    state["pev_day"], state["pev"] = accumulation_day[-1], pev[-1]
+    vwc = np.clip(site.vwc_mean + site.vwc_seasonal * seasonal
+                  + anomalies("vwc_rzd", site.vwc_noise), 0.1, 0.45)
+
+    sludge = site.sludge_mean * np.clip(
+        1 - site.sludge_seasonal * seasonal
+        + anomalies("dewatered_sludge", site.sludge_noise), 0.1, None)
+    electricity = site.electricity_mean * np.clip(
+        1 + site.electricity_seasonal * seasonal
+        + anomalies("demand_electricity", site.electricity_noise), 0.5, None)
+    return pd.DataFrame({
+        "dewatered_sludge": sludge,
+        "temperature": t_air,
+        "demand_electricity": electricity,
+        "ghi": ghi,
+        "t_air": t_air,
+        "pev": pev,
+        "vwc_rzd": vwc,
+    }, index=index)
+
+
+def _clear_sky_ghi(site, doy, hours):
+    # clear-sky global horizontal irradiance [W/m²] (Haurwitz model) for UTC hours
+    declination = np.radians(23.44) * np.sin(2 * np.pi * (284 + doy) / 365)
+    hour_angle = np.radians(15 * (hours + site.longitude / 15 - 12))
+    latitude = np.radians(site.latitude)
+    cos_zenith = (np.sin(latitude) * np.sin(declination)
+                  + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle))
+    ghi = np.zeros_like(cos_zenith)
+    day = cos_zenith > 0.01
+    ghi[day] = 1098 * cos_zenith[day] * np.exp(-0.057 / cos_zenith[day])
+    return ghi
+
+
+def _ar1(rng, n, phi, initial):
+    # standard normal AR(1) process of n values starting after initial
+    noise = rng.standard_normal(n) * np.sqrt(1 - phi ** 2)
+    values = np.empty(n)
+    previous = initial
+    for i in range(n):
+        previous = values[i] = phi * previous + noise[i]
+    return values
+
+
+def _site(site):
+    # Site of a name in SITES
+    if isinstance(site, Site):
+        return site
+    try:
+        return SITES[site]
+    except KeyError:
+        raise ValueError("Unknown site '{0}', choose from {1} or pass a Site".format(
+            site, sorted(SITES)))
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Writing and reading the synthetic inputs requires pyarrow, install it "
+                          "with 'pip install pyarrow'")
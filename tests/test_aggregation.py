@@ -0,0 +1,175 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.aggregation import aggregate_energysystem, aggregate_periods, solve_typical_periods
+
+requires_cbc = pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+
+HOURS = np.arange(24)
+# two kinds of days: cheap, windy days and expensive ones; each hour has a price of its own
+CHEAP_DAY = 10 + 2 * np.sin(2 * np.pi * HOURS / 24) + 0.01 * HOURS
+EXPENSIVE_DAY = 30 + 5 * np.sin(2 * np.pi * (HOURS - 6) / 24) + 0.01 * HOURS
+DAYS = [CHEAP_DAY, CHEAP_DAY, EXPENSIVE_DAY, EXPENSIVE_DAY, CHEAP_DAY, EXPENSIVE_DAY]
+TIMEINDEX = pd.date_range("2020-01-01", periods=24 * len(DAYS), freq="H")
+INPUTS = pd.DataFrame({"price": np.concatenate(DAYS),
+                       "demand": np.tile(1 + 0.5 * (HOURS >= 17), len(DAYS))}, index=TIMEINDEX)
+# prices that differ from day to day, so that the optimal operation is unique
+DISTINCT_INPUTS = INPUTS.assign(price=INPUTS["price"] + 0.001 * np.arange(len(TIMEINDEX)))
+
+
+def build(timeindex, inputs, loss_rate=0.001):
+    # grid supply at a varying price, a fixed demand and a storage that may shift energy over days
+    energysystem = solph.EnergySystem(timeindex=timeindex)
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bel)
+    energysystem.add(solph.Source(label="grid", outputs={bel: solph.Flow(
+        variable_costs=inputs["price"].to_numpy())}))
+    energysystem.add(solph.Sink(label="demand", inputs={bel: solph.Flow(
+        fix=inputs["demand"].to_numpy(), nominal_value=1)}))
+    energysystem.add(solph.components.GenericStorage(
+        label="storage", nominal_storage_capacity=60, inputs={bel: solph.Flow(nominal_value=10)},
+        outputs={bel: solph.Flow(nominal_value=10)}, loss_rate=loss_rate,
+        initial_storage_level=0.2))
+    return energysystem
+
+
+def solve_full(inputs=INPUTS, loss_rate=0.001):
+    energysystem = build(TIMEINDEX, inputs, loss_rate)
+    model = solph.Model(energysystem)
+    model.solve(solver="cbc")
+    return model.objective(), _storage_content(solph.processing.results(model), energysystem)
+
+
+def _storage_content(results, energysystem):
+    nodes = {str(nd.label): nd for nd in energysystem.nodes}
+    return results[nodes["storage"], None]["sequences"]["storage_content"].to_numpy()
+
+
+def test_aggregate_periods_of_repeated_days():
+    typical = aggregate_periods(INPUTS, n_periods=2, period_length=24)
+    assert list(typical.weights) == [3, 3]
+    assert list(typical.assignment) == [0, 0, 1, 1, 0, 1]
+    assert typical.error.max() == pytest.approx(0)
+    assert len(typical.timeindex) == 48
+    np.testing.assert_array_equal(typical.disaggregate(typical.profiles["price"]), INPUTS["price"])
+
+
+def test_aggregate_periods_checks_its_arguments():
+    with pytest.raises(ValueError, match="multiple"):
+        aggregate_periods(INPUTS.iloc[:30], n_periods=1)
+    with pytest.raises(ValueError, match="n_periods"):
+        aggregate_periods(INPUTS, n_periods=7)
+
+
+@requires_cbc
+def test_one_typical_period_per_period_equals_the_full_model():
+    # every period is represented by itself, so only the storage linking differs from the full model
+    full_objective, full_content = solve_full(DISTINCT_INPUTS, loss_rate=0)
+    typical = aggregate_periods(DISTINCT_INPUTS, n_periods=len(DAYS), period_length=24)
+    assert list(typical.weights) == [1] * len(DAYS)
+    energysystem = build(typical.timeindex, typical.profiles, loss_rate=0)
+    results = solve_typical_periods(energysystem, typical)
+    assert energysystem.results["meta"]["objective"] == pytest.approx(full_objective, rel=1e-6)
+    content = _storage_content(results, energysystem)
+    assert len(content) == len(TIMEINDEX)
+    np.testing.assert_allclose(content, full_content, atol=1e-4)
+    # the cheap energy is carried over the period boundaries
+    assert content[47] > 50
+
+
+@requires_cbc
+def test_typical_periods_bound_the_full_model():
+    # all occurrences of a typical period share its operation, which can only cost more than the
+    # full model
+    full_objective, full_content = solve_full()
+    typical = aggregate_periods(INPUTS, n_periods=2, period_length=24)
+    energysystem = build(typical.timeindex, typical.profiles)
+    results = solve_typical_periods(energysystem, typical)
+    objective = energysystem.results["meta"]["objective"]
+    assert full_objective - 1e-6 <= objective <= 1.2 * full_objective
+    content = _storage_content(results, energysystem)
+    assert content.min() >= -1e-6 and content.max() <= 60 + 1e-6
+    np.testing.assert_allclose(content[23::24], full_content[23::24], atol=15)
+    assert energysystem.results["meta"]["aggregation"] == {
+        "typical_periods": 2, "period_length": 24, "time_steps": len(TIMEINDEX),
+        "input_error": {"price": 0.0, "demand": 0.0}}
+    # the storage keeps its setting
+    assert {str(nd.label): nd for nd in energysystem.nodes}["storage"].balanced
+
+
+@requires_cbc
+def test_single_time_step():
+    typical = aggregate_periods(INPUTS.iloc[:1], n_periods=1, period_length=1)
+    energysystem = build(typical.timeindex, typical.profiles, loss_rate=0)
+    solve_typical_periods(energysystem, typical)
+    assert energysystem.results["meta"]["objective"] == pytest.approx(INPUTS["price"].iloc[0])
+
+
+@requires_cbc
+def test_storage_losses_keep_the_bound():
+    # the storage bounds account for the losses conservatively
+    full_objective, full_content = solve_full(DISTINCT_INPUTS)
+    typical = aggregate_periods(DISTINCT_INPUTS, n_periods=len(DAYS), period_length=24)
+    energysystem = build(typical.timeindex, typical.profiles)
+    results = solve_typical_periods(energysystem, typical)
+    objective = energysystem.results["meta"]["objective"]
+    assert full_objective - 1e-6 <= objective <= full_objective * 1.001
+    content = _storage_content(results, energysystem)
+    assert content.min() >= -1e-6 and content.max() <= 60 + 1e-6
+    np.testing.assert_allclose(content, full_content, atol=1)
+
+
+@requires_cbc
+def test_aggregate_energysystem_equals_the_full_model():
+    full_objective, full_content = solve_full(DISTINCT_INPUTS, loss_rate=0)
+    energysystem = build(TIMEINDEX, DISTINCT_INPUTS, loss_rate=0)
+    typical = aggregate_energysystem(energysystem, n_periods=len(DAYS), period_length=24)
+    assert len(energysystem.timeindex) == len(TIMEINDEX)
+    results = solve_typical_periods(energysystem, typical)
+    assert energysystem.results["meta"]["objective"] == pytest.approx(full_objective, rel=1e-6)
+    np.testing.assert_allclose(_storage_content(results, energysystem), full_content, atol=1e-4)
+
+
+@requires_cbc
+def test_aggregate_energysystem_reduces_the_time_series():
+    energysystem = build(TIMEINDEX, INPUTS)
+    typical = aggregate_energysystem(energysystem, n_periods=2, period_length=24)
+    assert len(energysystem.timeindex) == 48
+    nodes = {str(nd.label): nd for nd in energysystem.nodes}
+    costs = nodes["grid"].outputs[nodes["electricity"]].variable_costs
+    np.testing.assert_array_equal(costs, np.concatenate([CHEAP_DAY, EXPENSIVE_DAY]))
+    assert list(typical.weights) == [3, 3]
+    solve_typical_periods(energysystem, typical)
+    assert energysystem.results["meta"]["objective"] >= solve_full()[0] - 1e-6
+
+
+def build_scenario(timeindex, loss_rate=0.001):
+    # build function of the scenario file test
+    return build(timeindex, INPUTS.reindex(timeindex), loss_rate)
+
+
+@requires_cbc
+def test_scenario_file_aggregation(tmp_path):
+    from owefe.scenarios import run_scenario_file
+
+    spec = {"build": "{0}:build_scenario".format(os.path.abspath(__file__)), "start": "2020-01-01",
+            "horizon": len(TIMEINDEX), "scenarios": {"losses": {}, "lossless": {"loss_rate": 0}}}
+    full_file, typical_file = tmp_path / "full.json", tmp_path / "typical.json"
+    full_file.write_text(json.dumps(spec))
+    typical_file.write_text(json.dumps(dict(spec, aggregation={"n_periods": 2,
+                                                               "period_length": 24})))
+    full, _ = run_scenario_file(str(full_file))
+    typical, summary = run_scenario_file(str(typical_file))
+    assert summary["failed"] == 0
+    assert summary["aggregation"] == {"n_periods": 2, "period_length": 24}
+    assert (typical["objective"] >= full["objective"] - 1e-6).all()
+    assert (typical["objective"] != full["objective"]).all()
+    # the flow sums are taken over the full horizon
+    assert (typical["electricity|demand"].to_numpy()
+            == pytest.approx(full["electricity|demand"].to_numpy()))
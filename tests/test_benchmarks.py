@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                                "benchmarks"))
+
+import suite  # noqa: E402
+
+BASELINES = {"threshold": 0.3, "benchmarks": {
+    "kernels.calc_te[1000]": {"value": 0.01},
+    "end_to_end.tibnine[1W].model": {"value": 1.0, "threshold": 1.0},
+    "end_to_end.tibnine[1W].peak_rss": {"value": 100.0},
+}}
+
+
+def statuses(results, threshold=None):
+    return {row[0]: row[4] for row in suite.compare(results, BASELINES, threshold)}
+
+
+def test_compare_with_the_baselines():
+    assert statuses({"kernels.calc_te[1000]": 0.0101, "kernels.calc_hi[1000]": 0.01,
+                     "end_to_end.tibnine[1W].peak_rss": 150.0}) == {
+        "kernels.calc_te[1000]": "ok", "kernels.calc_hi[1000]": "new",
+        "end_to_end.tibnine[1W].peak_rss": "REGRESSION"}
+    assert statuses({"kernels.calc_te[1000]": 0.02})["kernels.calc_te[1000]"] == "REGRESSION"
+    assert statuses({"kernels.calc_te[1000]": 0.005})["kernels.calc_te[1000]"] == "faster"
+
+
+def test_thresholds_of_the_entries_and_the_arguments():
+    # the 1 week run may take twice its baseline
+    assert statuses({"end_to_end.tibnine[1W].model": 1.9}) == {"end_to_end.tibnine[1W].model": "ok"}
+    assert statuses({"end_to_end.tibnine[1W].model": 1.9}, threshold=0.5) == {
+        "end_to_end.tibnine[1W].model": "REGRESSION"}
+
+
+def test_differences_below_the_noise_floor_are_ignored():
+    baselines = {"threshold": 0.3, "benchmarks": {"kernels.calc_te[10]": {"value": 1e-5},
+                                                  "end_to_end.tibnine[1W].build": {"value": 0.01}}}
+    rows = suite.compare({"kernels.calc_te[10]": 5e-5, "end_to_end.tibnine[1W].build": 0.04},
+                         baselines)
+    assert [row[4] for row in rows] == ["ok", "ok"]
+    assert rows[0][3] == pytest.approx(5)
+
+
+def test_saved_baselines_keep_the_thresholds(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    with open(path, "w") as f:
+        json.dump(BASELINES, f)
+    suite.save_baselines({"end_to_end.tibnine[1W].model": 2.0, "kernels.calc_hi[1000]": 0.5},
+                         path=path)
+    baselines = suite.load_baselines(path)
+    assert baselines["benchmarks"]["end_to_end.tibnine[1W].model"] == {"value": 2.0,
+                                                                       "threshold": 1.0}
+    assert baselines["benchmarks"]["kernels.calc_hi[1000]"] == {"value": 0.5}
+    assert baselines["machine"]["cpus"] == os.cpu_count()
+    assert suite.load_baselines(str(tmp_path / "missing.json"))["benchmarks"] == {}
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe import cache as cache_module
+from owefe.cache import SUFFIX, ResultCache
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=24, freq="H")
+SUPPLY = np.linspace(1, 2, 24)
+
+
+def build(supply=SUPPLY, efficiency=0.35, timeindex=TIMEINDEX):
+    # a fixed gas supply converted to electricity; fully determined, so no solver is needed
+    energysystem = solph.EnergySystem(timeindex=timeindex)
+    bgas = solph.Bus(label="gas")
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bgas, bel)
+    energysystem.add(solph.Source(label="gas supply", outputs={bgas: solph.Flow(
+        fix=supply, nominal_value=10, variable_costs=30)}))
+    energysystem.add(solph.Transformer(label="chp", inputs={bgas: solph.Flow()},
+                                       outputs={bel: solph.Flow()},
+                                       conversion_factors={bel: efficiency}))
+    energysystem.add(solph.Sink(label="demand", inputs={bel: solph.Flow()}))
+    return energysystem
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(cache_dir=str(tmp_path))
+
+
+def test_equal_systems_have_equal_keys(cache):
+    assert cache.key(build()) == cache.key(build())
+    assert cache.key(build(supply=list(SUPPLY))) == cache.key(build())
+
+
+@pytest.mark.parametrize("changes", [
+    {"supply": SUPPLY * 1.01},
+    {"efficiency": 0.36},
+    {"timeindex": pd.date_range("2021-01-01", periods=24, freq="H")},
+])
+def test_changed_systems_have_other_keys(cache, changes):
+    assert cache.key(build(**changes)) != cache.key(build())
+
+
+def test_solver_options_are_part_of_the_key(cache):
+    energysystem = build()
+    assert cache.key(energysystem, solver="glpk") != cache.key(energysystem)
+    assert cache.key(energysystem, solve_kwargs={"tee": True}) != cache.key(energysystem)
+
+
+def test_package_sources_are_part_of_the_key(cache, monkeypatch):
+    key = cache.key(build())
+    monkeypatch.setattr(cache_module, "_source_digest", lambda: "edited")
+    assert cache.key(build()) != key
+
+
+def test_unsupported_parameters_are_rejected(cache):
+    energysystem = build()
+    node = next(nd for nd in energysystem.nodes if str(nd.label) == "chp")
+    node.custom = object.__new__(type("Slotted", (), {"__slots__": ()}))
+    with pytest.raises(TypeError, match="Slotted"):
+        cache.key(energysystem)
+
+
+def test_parameter_objects_are_hashed_by_content(cache):
+    first, second = build(), build()
+    for energysystem, value in ((first, 1), (second, 2)):
+        node = next(nd for nd in energysystem.nodes if str(nd.label) == "chp")
+        node.custom = solph.Investment(ep_costs=value)
+    assert cache.key(first) != cache.key(second)
+
+
+def test_cached_results_equal_the_simulation(cache):
+    energysystem = build()
+    results = cache.simulate(energysystem)
+    assert cache.stats()["misses"] == 1 and cache.stats()["entries"] == 1
+    again = build()
+    cached = cache.simulate(again)
+    assert cache.stats()["hits"] == 1
+    objective = energysystem.results["meta"]["objective"]
+    assert again.results["meta"]["objective"] == pytest.approx(objective)
+    nodes = {str(nd.label): nd for nd in again.nodes}
+    original = {str(nd.label): nd for nd in energysystem.nodes}
+    pd.testing.assert_frame_equal(cached[nodes["chp"], nodes["electricity"]]["sequences"],
+                                  results[original["chp"], original["electricity"]]["sequences"])
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for supply in (SUPPLY, SUPPLY * 2, SUPPLY * 3):
+        cache.simulate(build(supply=supply))
+    size = cache.stats()["size"]
+    paths = sorted((os.path.join(cache.cache_dir, name) for name in os.listdir(cache.cache_dir)
+                    if name.endswith(SUFFIX)), key=os.path.getmtime)
+    assert len(paths) == 3
+    # the first entry is used last and kept; the second one is the least recently used
+    for age, path in zip((3, 1, 2), paths):
+        os.utime(path, (1000 * age, 1000 * age))
+    cache.max_size = size * 2 // 3 + 1
+    cache.evict()
+    assert sorted(os.path.exists(path) for path in paths) == [False, True, True]
+    assert not os.path.exists(paths[1])
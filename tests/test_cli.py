@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.cli import main
+from owefe.synthetic import read_inputs, read_settings
+
+
+def build(timeindex, supply=1.0):
+    # a fixed gas supply converted to electricity; fully determined, so no solver is needed
+    energysystem = solph.EnergySystem(timeindex=timeindex)
+    bgas = solph.Bus(label="gas")
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bgas, bel)
+    energysystem.add(solph.Source(label="gas supply", outputs={bgas: solph.Flow(
+        fix=np.full(len(timeindex), supply), nominal_value=10, variable_costs=30)}))
+    energysystem.add(solph.Transformer(label="chp", inputs={bgas: solph.Flow()},
+                                       outputs={bel: solph.Flow()}, conversion_factors={bel: 0.35}))
+    energysystem.add(solph.Sink(label="demand", inputs={bel: solph.Flow()}))
+    return energysystem
+
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps({"build": "{0}:build".format(os.path.abspath(__file__)),
+                                "start": "2020-01-01", "horizon": 24,
+                                "scenarios": {"low": {"supply": 1.0}, "high": {"supply": 2.0}}}))
+    return str(path)
+
+
+def test_run_writes_the_summary_and_the_table(scenario_file, tmp_path):
+    output, table = str(tmp_path / "summary.json"), str(tmp_path / "table.csv")
+    assert main(["run", scenario_file, "--horizon", "1W", "--resolution", "3h", "--output", output,
+                 "--table", table]) == 0
+    with open(output) as f:
+        summary = json.load(f)
+    assert summary["failed"] == 0
+    results = pd.read_csv(table, index_col="scenario")
+    assert list(results.index) == ["low", "high"]
+    # one week of 168 hours in 3 hour steps
+    assert results.loc["high", "gas supply|gas"] == pytest.approx(2 * 10 * 168)
+
+
+def test_flow_sums_do_not_depend_on_the_resolution(scenario_file, tmp_path):
+    totals = {}
+    for resolution in ("1h", "3h"):
+        table = str(tmp_path / "table_{0}.csv".format(resolution))
+        assert main(["run", scenario_file, "--horizon", "1W", "--resolution", resolution,
+                     "--table", table, "--output", str(tmp_path / "summary.json")]) == 0
+        totals[resolution] = pd.read_csv(table, index_col="scenario")
+    for column in ("gas supply|gas", "chp|electricity", "electricity|demand"):
+        assert totals["3h"][column].to_numpy() == pytest.approx(totals["1h"][column].to_numpy())
+
+
+def test_run_writes_the_profile(scenario_file, tmp_path, capsys):
+    prefix = str(tmp_path / "profile")
+    assert main(["run", scenario_file, "--profile", prefix, "--profile-interval", "0.01"]) == 0
+    assert json.loads(capsys.readouterr().out)["failed"] == 0
+    with open(prefix + ".json") as f:
+        names = {phase["name"] for phase in json.load(f)["phases"]}
+    assert {"import", "scenario low", "scenario high"} <= names
+    assert os.path.getsize(prefix + ".folded") > 0
+
+
+def test_failed_scenarios_set_the_exit_code(tmp_path, capsys):
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps({"build": "{0}:build".format(os.path.abspath(__file__)),
+                                "horizon": 24, "scenarios": {"bad": {"unknown": 1}}}))
+    assert main(["run", str(path)]) == 1
+    assert json.loads(capsys.readouterr().out)["failed"] == 1
+
+
+def test_generate(tmp_path, capsys):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "inputs.parquet")
+    assert main(["generate", path, "--sites", "tibnine", "hegelbach", "--resolution", "1D",
+                 "--seed", "1", "--float32"]) == 0
+    assert "Wrote 732 rows" in capsys.readouterr().out
+    assert read_settings(path)["freq"] == "1D"
+    data = read_inputs(path, site="hegelbach")
+    assert len(data) == 366 and (data.dtypes == np.float32).all()
+
+
+def test_unknown_commands_are_rejected():
+    with pytest.raises(SystemExit):
+        main(["solve"])
+
+
+@pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+def test_solver_option(scenario_file, capsys):
+    assert main(["run", scenario_file, "--solver", "cbc"]) == 0
+    assert json.loads(capsys.readouterr().out)["failed"] == 0
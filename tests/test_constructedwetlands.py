@@ -0,0 +1,85 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.specs.constructedwetlands import (Constructed_wetlands, calc_effluent_series,
+                                             exceedance_hours, size_wetland)
+
+INDEX = pd.date_range("2020-01-01", periods=48, freq="H")
+INFLUENT = pd.Series(10 + 4 * np.sin(np.linspace(0, 4 * np.pi, 48)), index=INDEX)
+EFFLUENT = INFLUENT * 0.9
+
+
+def test_effluent_series_of_mean_flows_equals_compute(caplog):
+    influent, effluent = float(INFLUENT.mean()), float(EFFLUENT.mean())
+    with caplog.at_level(logging.INFO):
+        wetland = Constructed_wetlands(influent, effluent)
+        _, cw_area, _, BOD_effluent, COD_effluent, NO3_effluent = wetland.compute()
+    assert "within the WHO allowable limit" in caplog.text
+    quality = calc_effluent_series([influent] * 3, [effluent] * 3)
+    np.testing.assert_allclose(quality["BOD_effluent"], BOD_effluent)
+    np.testing.assert_allclose(quality["COD_effluent"], COD_effluent)
+    np.testing.assert_allclose(quality["NO3_effluent"], NO3_effluent)
+    np.testing.assert_allclose(quality["hrt"], 4)
+    assert cw_area == pytest.approx((influent + effluent) / 2 * 4 / 0.24)
+
+
+def test_effluent_series_follows_the_discharge():
+    quality = calc_effluent_series(INFLUENT, EFFLUENT, cw_area=50)
+    assert quality.index.equals(INDEX)
+    # peaks of the discharge shorten the retention time and raise the effluent concentrations
+    peak = int(np.argmax(INFLUENT.to_numpy()))
+    assert quality["COD_effluent"].iloc[peak] == quality["COD_effluent"].max()
+    np.testing.assert_allclose(quality["hrt"], 0.24 * 50 / ((INFLUENT + EFFLUENT) / 2))
+    assert exceedance_hours(quality["COD_effluent"], COD_limit=0) == 48
+
+
+def test_effluent_series_averages_over_the_window():
+    quality = calc_effluent_series(INFLUENT, EFFLUENT, cw_area=50, window=4)
+    discharge = ((INFLUENT + EFFLUENT) / 2).rolling(4, min_periods=1).mean()
+    np.testing.assert_allclose(quality["avg_discharge"], discharge)
+
+
+def test_effluent_series_needs_equal_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        calc_effluent_series(INFLUENT, EFFLUENT.iloc[:-1])
+
+
+def test_sized_wetland_meets_its_targets():
+    design = size_wetland(40, 30)
+    assert design.limiting == "NO3"
+    assert design.NO3_effluent == pytest.approx(50)
+    assert design.COD_effluent <= 250
+    assert design.cw_area == pytest.approx(40 * design.hrt / 0.24)
+    quality = calc_effluent_series([40.0], [40.0], cw_area=design.cw_area, temperature=30)
+    assert quality["NO3_effluent"].iloc[0] == pytest.approx(50)
+
+
+def test_cod_limits_the_wetland_without_nitrate_target():
+    design = size_wetland(40, 30, COD_target=10, NO3_target=None)
+    assert design.limiting == "COD"
+    assert design.COD_effluent == pytest.approx(10)
+
+
+def test_no_treatment_needed():
+    design = size_wetland(40, 30, COD_target=5000, NO3_target=None)
+    assert design.limiting is None
+    assert design.hrt == 0 and design.cw_area == 0
+    assert design.COD_effluent == pytest.approx(1800)
+
+
+def test_grid_of_designs_equals_scalar_designs():
+    flows = np.array([20.0, 40.0, 60.0])[:, None]
+    temperatures = np.array([15.0, 25.0, 35.0])[None, :]
+    COD_targets = np.array([250.0, 5000.0, 5.0])[None, :]
+    grid = size_wetland(flows, temperatures, COD_target=COD_targets, NO3_target=None)
+    assert grid.cw_area.shape == (3, 3)
+    for i in range(3):
+        for j in range(3):
+            design = size_wetland(flows[i, 0], temperatures[0, j], COD_target=COD_targets[0, j],
+                                  NO3_target=None)
+            assert grid.cw_area[i, j] == pytest.approx(design.cw_area)
+            assert grid.limiting[i, j] == design.limiting
+    assert list(grid.limiting[0]) == ["COD", None, "COD"]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from owefe.specs import digester_CSTR, digester_KT
+from owefe.specs.digester import BaseDigester, DigesterDesign, get_digester
+
+CSTR = dict(retention_time=30, design_mass_flow=40, sludge_density=997,
+            sludge_specific_gravity=1.02, dry_solid_concentration=0.15,
+            volatile_solid_concentration=0.7, biomethane_potential=0.3403)
+
+
+def test_base_digester_is_abstract():
+    with pytest.raises(TypeError):
+        BaseDigester()
+
+    class Incomplete(BaseDigester):
+        parameters = ("retention_time",)
+
+    with pytest.raises(TypeError, match="compute"):
+        Incomplete()
+
+
+def test_scalar_design():
+    design = digester_CSTR.Digester(**CSTR).compute()
+    assert isinstance(design, DigesterDesign)
+    assert design.volumetric_flow == pytest.approx(40 * 24 / (997 * 1.02))
+    assert design.volume == pytest.approx(design.volumetric_flow * 30)
+    assert np.ndim(design.diameter) == 0
+
+
+@pytest.mark.parametrize("retention_time, yield_factor", [(20, 8.0), (40, 10.59)])
+def test_scalar_yield_factor(retention_time, yield_factor):
+    digester = digester_KT.Digester(retention_time, 40, 997, 1.02, yield_factor=8.0)
+    assert type(digester.yield_factor) is float and digester.yield_factor == yield_factor
+
+
+def test_sweep_equals_scalar_designs():
+    retention_times = np.arange(15, 41)[:, None]
+    flows = np.linspace(20, 60, 5)[None, :]
+    sweep = digester_CSTR.Digester.sweep(**dict(CSTR, retention_time=retention_times,
+                                                design_mass_flow=flows))
+    assert sweep.volume.shape == (26, 5)
+    for i, j in [(0, 0), (10, 3), (25, 4)]:
+        design = digester_CSTR.Digester(**dict(CSTR, retention_time=int(retention_times[i, 0]),
+                                               design_mass_flow=flows[0, j])).compute()
+        for field in DigesterDesign._fields:
+            assert getattr(sweep, field)[i, j] == pytest.approx(getattr(design, field))
+    assert len(sweep.to_frame()) == 26 * 5
+
+
+def test_sweep_needs_all_parameters():
+    with pytest.raises(TypeError, match="biomethane_potential"):
+        digester_CSTR.Digester.sweep(**{k: v for k, v in CSTR.items()
+                                        if k != "biomethane_potential"})
+
+
+def test_get_digester():
+    assert get_digester("CSTR") is digester_CSTR.Digester
+    assert all(issubclass(get_digester(name), BaseDigester) for name in ("KT", "floating_drum"))
+    with pytest.raises(ValueError, match="Unknown digester type"):
+        get_digester("UASB")
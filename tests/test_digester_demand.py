@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.digester_demand import (ElectricityCalculation, HeatCalculation, calc_electricity_demand,
+                                   calc_heat_demand)
+
+TEMPERATURE = pd.Series(np.linspace(-5, 35, 48),
+                        index=pd.date_range("2020-01-01", periods=48, freq="H"))
+HEAT = dict(heat_transfer_coefficient=0.6, temp_digester=37, surface_area=500, heat_capacity=4200,
+            average_mass_flow=1100)
+
+
+def test_heat_demand_equals_the_hourly_calculation():
+    hourly = [HeatCalculation(temp_ambient=t, **HEAT).compute() for t in TEMPERATURE]
+    demand = calc_heat_demand(TEMPERATURE, **HEAT)
+    assert isinstance(demand, pd.Series)
+    assert demand.index.equals(TEMPERATURE.index)
+    np.testing.assert_allclose(demand, hourly)
+
+
+@pytest.mark.parametrize("series", [list(TEMPERATURE), TEMPERATURE.to_numpy()])
+def test_heat_demand_keeps_the_input_type(series):
+    demand = calc_heat_demand(series, **HEAT)
+    assert type(demand) is type(series)
+    np.testing.assert_allclose(demand, calc_heat_demand(TEMPERATURE, **HEAT))
+
+
+def test_scalar_inputs_give_scalars():
+    assert np.isscalar(calc_heat_demand(10, **HEAT))
+    expected = 2.0 * (0.0079 + 1.2 * 24)
+    assert calc_electricity_demand(2.0, active_volume=800) == pytest.approx(expected)
+
+
+def test_electricity_demand_equals_the_hourly_calculation():
+    flows = pd.Series(np.linspace(0.5, 3, 24))
+    hourly = [ElectricityCalculation(flow, active_volume=800).compute() for flow in flows]
+    demand = calc_electricity_demand(flows, active_volume=800)
+    assert isinstance(demand, pd.Series)
+    np.testing.assert_allclose(demand, hourly)
+
+
+def test_unsupported_series_are_rejected():
+    with pytest.raises(TypeError, match="temp_ambient"):
+        calc_heat_demand((1, 2, 3), **HEAT)
+    with pytest.raises(TypeError, match="average_volumetric_flow"):
+        calc_electricity_demand({"a": 1}, active_volume=800)
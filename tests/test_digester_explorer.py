@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.digester_demand import calc_electricity_demand, calc_heat_demand
+from owefe.digester_explorer import (CHP_EFFICIENCY, CHP_ELECTRICAL_SHARE, METHANE_HEATING_VALUE,
+                                     TIBNINE_FEEDSTOCK, explore, pareto_front)
+from owefe.specs import digester_CSTR
+
+HOURS = np.arange(24 * 7)
+MASS_FLOW = 40 + 5 * np.sin(2 * np.pi * HOURS / 24)
+TEMP_AMBIENT = 20 + 8 * np.sin(2 * np.pi * (HOURS - 9) / 24)
+ARGUMENTS = dict(retention_time=[20, 30], temp_digester=[30, 37],
+                 feedstocks={"tibnine": TIBNINE_FEEDSTOCK}, mass_flow=MASS_FLOW,
+                 temp_ambient=TEMP_AMBIENT)
+
+
+def test_all_design_points_are_evaluated():
+    designs = explore(["CSTR", "KT", "floating_drum"], processes=1, **ARGUMENTS)
+    assert len(designs) == 3 * 2 * 2
+    assert set(designs["digester_type"]) == {"CSTR", "KT", "floating_drum"}
+    points = designs[["digester_type", "retention_time", "temp_digester"]].drop_duplicates()
+    assert len(points) == 12
+
+
+def test_process_pool_equals_one_process():
+    pd.testing.assert_frame_equal(explore(["CSTR", "KT"], processes=2, chunksize=1, **ARGUMENTS),
+                                  explore(["CSTR", "KT"], processes=1, **ARGUMENTS))
+
+
+def test_energy_balance_of_a_design():
+    designs = explore(["CSTR"], processes=1, **ARGUMENTS)
+    row = designs[(designs["retention_time"] == 30) & (designs["temp_digester"] == 37)].iloc[0]
+    design = digester_CSTR.Digester(30, MASS_FLOW.mean(), 997, 1.02, 0.15, 0.7, 0.3403).compute()
+    assert row["volume"] == pytest.approx(design.volume)
+    heat_demand = calc_heat_demand(TEMP_AMBIENT, 0.6, 37, design.surface_area, 4200,
+                                   MASS_FLOW.mean())
+    assert row["heat_demand"] == pytest.approx(np.maximum(heat_demand, 0).sum())
+    electricity_demand = calc_electricity_demand(design.volumetric_flow / 24, design.active_volume)
+    assert row["electricity_demand"] == pytest.approx(electricity_demand * len(HOURS))
+    methane = design.conversion_factor * MASS_FLOW.sum()
+    assert row["electricity_production"] == pytest.approx(
+        methane * METHANE_HEATING_VALUE * CHP_EFFICIENCY * CHP_ELECTRICAL_SHARE)
+    # a warmer digester needs more heat for the same geometry
+    same_geometry = designs[designs["retention_time"] == 30].set_index("temp_digester")
+    warm, cold = same_geometry.loc[37], same_geometry.loc[30]
+    assert warm["heat_demand"] > cold["heat_demand"] and warm["volume"] == cold["volume"]
+
+
+def test_arguments_are_checked():
+    with pytest.raises(ValueError, match="Unknown digester type"):
+        explore(["UASB"], processes=1, **ARGUMENTS)
+    with pytest.raises(ValueError, match="same length"):
+        explore(["CSTR"], processes=1, **dict(ARGUMENTS, temp_ambient=TEMP_AMBIENT[:-1]))
+
+
+def test_pareto_front():
+    designs = pd.DataFrame({"volume": [100, 200, 200, 300, 400, 50],
+                            "net_energy_yield": [10, 30, 20, 25, 40, 5]})
+    front = pareto_front(designs)
+    assert list(front["volume"]) == [50, 100, 200, 400]
+    assert list(front["net_energy_yield"]) == [5, 10, 30, 40]
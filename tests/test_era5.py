@@ -0,0 +1,87 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# feedinlib and geopandas are only needed to download files and to select geometries
+xr = pytest.importorskip("xarray")
+pytest.importorskip("scipy")  # netCDF3 engine of the test file
+
+ERA5 = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "examples",
+                    "agrivoltaics hegelbach", "era5.py")
+# the ERA5 time stamps mark the end of the hourly intervals
+TIME = pd.date_range("2020-01-01 01:00", periods=72, freq="H")
+LATITUDE = np.array([47.75, 47.5, 47.25])
+LONGITUDE = np.array([8.0, 8.25, 8.5])
+
+
+def load_era5():
+    # the example directory is no package, so the module is loaded from its file
+    spec = importlib.util.spec_from_file_location("era5", ERA5)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def era5():
+    return load_era5()
+
+
+@pytest.fixture(scope="module")
+def era5_file(tmp_path_factory):
+    # hourly values of all variables, written as netCDF3 so that scipy suffices
+    shape = (len(TIME), len(LATITUDE), len(LONGITUDE))
+    values = np.arange(np.prod(shape), dtype=float).reshape(shape)
+    units = {"fdir": "J m**-2", "ssrd": "J m**-2", "t2m": "K", "u10": "m s**-1", "v10": "m s**-1",
+             "u100": "m s**-1", "v100": "m s**-1", "sp": "Pa", "fsr": "m"}
+    ds = xr.Dataset(
+        {name: (("time", "latitude", "longitude"), values + i, {"units": unit})
+         for i, (name, unit) in enumerate(units.items())},
+        coords={"time": TIME, "latitude": LATITUDE, "longitude": LONGITUDE})
+    ds["ssrd"] = ds["fdir"] * 2 + 3600
+    path = str(tmp_path_factory.mktemp("era5") / "era5.nc")
+    ds.to_netcdf(path, engine="scipy")
+    return path
+
+
+def test_single_location_for_the_pvlib(era5, era5_file):
+    df = era5.weather_df_from_era5(era5_file, "pvlib", area=[8.25, 47.5])
+    assert list(df.columns) == ["wind_speed", "temp_air", "ghi", "dhi"]
+    assert df.index.equals((TIME - pd.Timedelta(minutes=30)).tz_localize("UTC"))
+    with xr.open_dataset(era5_file) as ds:
+        point = ds.sel(latitude=47.5, longitude=8.25)
+        np.testing.assert_allclose(df["temp_air"], point["t2m"].values - 273.15)
+        np.testing.assert_allclose(df["ghi"], point["ssrd"].values / 3600)
+        np.testing.assert_allclose(df["dhi"], (point["ssrd"] - point["fdir"]).values / 3600)
+
+
+def test_dates_cover_their_whole_period(era5, era5_file):
+    df = era5.weather_df_from_era5(era5_file, "pvlib", start="2020-01-02", end="2020-01-02",
+                                   area=[8.0, 47.75])
+    expected = pd.date_range("2020-01-02 00:30", periods=24, freq="H", tz="UTC")
+    assert df.index.equals(expected)
+
+
+def test_rectangular_area_for_the_windpowerlib(era5, era5_file):
+    df = era5.weather_df_from_era5(era5_file, "windpowerlib",
+                                   area=[(7.9, 8.25), (47.2, 47.5)])
+    # the west and south boundaries are exclusive, the east and north ones inclusive
+    assert df.index.names == ["time", "latitude", "longitude"]
+    assert len(df) == len(TIME) * 2 * 2
+    assert ("wind_speed", 100) in df.columns and ("roughness_length", 0) in df.columns
+    assert df.index.get_level_values("time")[0] == pd.Timestamp("2020-01-01", tz="UTC")
+
+
+def test_chunked_reading_equals_reading_at_once(era5, era5_file):
+    pytest.importorskip("dask")
+    pd.testing.assert_frame_equal(
+        era5.weather_df_from_era5(era5_file, "pvlib", area=[8.5, 47.25], chunks={"time": 24}),
+        era5.weather_df_from_era5(era5_file, "pvlib", area=[8.5, 47.25]))
+
+
+def test_unknown_libs_are_rejected(era5, era5_file):
+    with pytest.raises(ValueError, match="Unknown value for `lib`"):
+        era5.weather_df_from_era5(era5_file, "windrose")
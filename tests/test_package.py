@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import owefe
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+
+def imported_modules(code):
+    # top-level modules imported by code in a fresh interpreter
+    script = code + "\nimport sys\nprint(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                            text=True, env=dict(os.environ, PYTHONPATH=SRC)).stdout
+    return set(output.split())
+
+
+def test_import_loads_no_heavy_dependencies():
+    modules = imported_modules("import owefe")
+    assert not modules & {"oemof", "pyomo", "pandas", "numpy"}
+
+
+def test_specs_load_with_numpy_alone():
+    modules = imported_modules("import owefe\nowefe.specs.plant.calc_te([10.0, 20.0], 25, 5, 1.2)")
+    assert "numpy" in modules
+    assert not modules & {"oemof", "pyomo", "pandas"}
+
+
+def test_submodules_are_imported_on_access():
+    assert owefe.simulation.simulate is not None
+    assert set(dir(owefe)) >= {"__version__", "simulation", "specs"}
+    with pytest.raises(AttributeError, match="no_such_module"):
+        owefe.no_such_module
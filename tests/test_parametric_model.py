@@ -0,0 +1,83 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.parametric_model import ParametricModel
+
+pytestmark = pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=24, freq="H")
+DEMAND = 1 + 0.5 * np.sin(np.linspace(0, 2 * np.pi, 24))
+PRICE = np.linspace(20, 40, 24)
+
+
+def build(demand=DEMAND, efficiency=0.35):
+    # gas bought at a varying price and converted to electricity for a fixed demand
+    energysystem = solph.EnergySystem(timeindex=TIMEINDEX)
+    bgas = solph.Bus(label="gas")
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bgas, bel)
+    energysystem.add(solph.Source(label="gas supply",
+                                  outputs={bgas: solph.Flow(variable_costs=PRICE)}))
+    energysystem.add(solph.Sink(label="demand",
+                                inputs={bel: solph.Flow(fix=demand, nominal_value=10)}))
+    energysystem.add(solph.Transformer(label="chp", inputs={bgas: solph.Flow()},
+                                       outputs={bel: solph.Flow()},
+                                       conversion_factors={bel: efficiency}))
+    return energysystem
+
+
+def fresh_objective(**kwargs):
+    model = solph.Model(build(**kwargs))
+    model.solve(solver="cbc")
+    return model.objective()
+
+
+@pytest.fixture
+def parametric():
+    model = ParametricModel(build(), profiles=["demand"], conversion_factors=["chp"])
+    model.solve(process_results=False)
+    return model
+
+
+def test_initial_solve_equals_a_fresh_model(parametric):
+    assert parametric.objective == pytest.approx(fresh_objective())
+
+
+def test_set_profile_changes_the_objective(parametric):
+    initial = parametric.objective
+    demand = DEMAND[::-1] * 2
+    parametric.set_profile("demand", demand)
+    parametric.solve(process_results=False)
+    assert parametric.objective > initial
+    assert parametric.objective == pytest.approx(fresh_objective(demand=demand))
+    np.testing.assert_allclose(parametric.flow("electricity", "demand"), demand * 10)
+
+
+def test_set_conversion_factor_changes_the_objective(parametric):
+    initial = parametric.objective
+    parametric.set_conversion_factor("chp", 0.5)
+    parametric.solve(process_results=False)
+    assert parametric.objective == pytest.approx(initial * 0.35 / 0.5)
+    assert parametric.objective == pytest.approx(fresh_objective(efficiency=0.5))
+
+
+def test_both_changes_and_processed_results(parametric):
+    efficiency = np.linspace(0.3, 0.4, 24)
+    parametric.set_profile("demand", DEMAND + 0.2)
+    parametric.set_conversion_factor("chp", efficiency)
+    results = parametric.solve()
+    expected = fresh_objective(demand=DEMAND + 0.2, efficiency=efficiency)
+    assert parametric.objective == pytest.approx(expected)
+    gas = parametric.flow("gas supply", "gas")
+    np.testing.assert_allclose(gas, (DEMAND + 0.2) * 10 / efficiency, rtol=1e-6)
+    nodes = {str(nd.label): nd for nd in parametric.energysystem.nodes}
+    np.testing.assert_allclose(results[nodes["gas supply"], nodes["gas"]]["sequences"]["flow"], gas)
+
+
+def test_profile_needs_one_fixed_flow():
+    with pytest.raises(ValueError, match="fixed flow"):
+        ParametricModel(build(), profiles=["gas supply"])
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.specs.photovoltaic_panel import calc_pv_te, calc_pv_te_batch, calc_pv_te_chunks
+
+HOURS = np.arange(72)
+T_AIR = pd.Series(15 + 10 * np.sin(2 * np.pi * (HOURS - 9) / 24),
+                  index=pd.date_range("2020-06-01", periods=72, freq="H"))
+GHI = pd.Series(np.clip(900 * np.sin(2 * np.pi * (HOURS - 6) / 24), 0, None), index=T_AIR.index)
+# datasheet values of five panel types
+MODULES = dict(p_rpv=np.array([250.0, 300.0, 320.0, 400.0, 450.0]),
+               n_t=np.array([-0.0045, -0.004, -0.0038, -0.0035, -0.0029]),
+               t_c_ref=25.0, noct=np.array([45.0, 44.0, 46.0, 43.0, 42.0]))
+
+
+def pv_te_loop(t_air, ghi, p_rpv, r_ref, n_t, t_c_ref, noct):
+    # one calc_pv_te call per panel type, the loop calc_pv_te_batch replaces
+    parameters = np.broadcast_arrays(p_rpv, r_ref, n_t, t_c_ref, noct)
+    return np.array([calc_pv_te(t_air, ghi, *values) for values in zip(*parameters)])
+
+
+def test_calc_pv_te():
+    pv_te = calc_pv_te(T_AIR, GHI, p_rpv=300, r_ref=1000, n_t=-0.004, t_c_ref=25, noct=45)
+    assert isinstance(pv_te, pd.Series) and pv_te.index.equals(T_AIR.index)
+    t_c = T_AIR + (45 - 20) / 800 * GHI
+    np.testing.assert_allclose(pv_te, 300 / 1000 * (1 - 0.004 * (t_c - 25)))
+
+
+def test_batch_equals_one_call_per_panel_type():
+    batch = calc_pv_te_batch(T_AIR, GHI, r_ref=1000, **MODULES)
+    assert batch.shape == (5, 72)
+    np.testing.assert_allclose(batch, pv_te_loop(T_AIR, GHI, r_ref=1000, **MODULES))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 10])
+def test_chunk_size_does_not_change_the_result(chunk_size):
+    expected = calc_pv_te_batch(T_AIR, GHI, r_ref=1000, **MODULES)
+    batch = calc_pv_te_batch(T_AIR, GHI, r_ref=1000, chunk_size=chunk_size, **MODULES)
+    np.testing.assert_array_equal(batch, expected)
+    chunks = list(calc_pv_te_chunks(T_AIR, GHI, r_ref=1000, chunk_size=chunk_size, **MODULES))
+    assert [start for start, _ in chunks] == list(range(0, 5, chunk_size))
+    np.testing.assert_array_equal(np.concatenate([block for _, block in chunks]), expected)
+
+
+def test_float32_batch():
+    batch = calc_pv_te_batch(T_AIR, GHI, r_ref=1000, dtype=np.float32, **MODULES)
+    assert batch.dtype == np.float32
+    expected = calc_pv_te_batch(T_AIR, GHI, r_ref=1000, **MODULES)
+    np.testing.assert_allclose(batch, expected, rtol=1e-5)
+
+
+def test_missing_values_stay_in_place():
+    t_air = T_AIR.copy()
+    t_air.iloc[10] = np.nan
+    batch = calc_pv_te_batch(t_air, GHI, r_ref=1000, **MODULES)
+    assert np.isnan(batch[:, 10]).all()
+    assert np.isnan(batch).sum() == 5
+
+
+def test_length_mismatch_is_rejected():
+    with pytest.raises(ValueError, match="same length"):
+        calc_pv_te(T_AIR, GHI.iloc[:-1], p_rpv=300, r_ref=1000, n_t=-0.004, t_c_ref=25, noct=45)
+    with pytest.raises(ValueError, match="equal length"):
+        calc_pv_te_batch(T_AIR, GHI.iloc[:-1], r_ref=1000, **MODULES)
+    with pytest.raises(ValueError):
+        calc_pv_te_batch(T_AIR, GHI, r_ref=1000, **dict(MODULES, noct=np.array([45.0, 44.0])))
@@ -0,0 +1,164 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.specs.plant import calc_arid, calc_arid_stream, calc_growth, calc_hi, calc_te
+
+TEMPERATURE = pd.Series(np.linspace(-10, 45, 221),
+                        index=pd.date_range("2020-06-01", periods=221, freq="H"))
+# ERA5 potential evaporation is negative, 0 at night
+ET_O = pd.Series(-np.clip(np.sin(np.linspace(0, 18 * np.pi, 221)), 0, None) * 4e-4,
+                 index=TEMPERATURE.index)
+VWC = pd.Series(np.linspace(0.05, 0.4, 221), index=TEMPERATURE.index)
+PLANT = dict(t_opt=25, t_base=5, RUE=1.2, t_heat=30, t_ext=40, s_water=0.4, rzd=1.5)
+
+
+def te_loop(t_air, t_opt, t_base, RUE):
+    # former implementation of calc_te
+    te = []
+    for t in t_air:
+        if t < t_base:
+            te.append(0)
+        elif t_base <= t <= t_opt:
+            te.append((t - t_base) / (t_opt - t_base) * RUE * 3.6e-3)
+        elif t > t_opt:
+            te.append(1 * RUE * 3.6e-3)
+    return te
+
+
+def hi_loop(t_max, t_heat, t_ext):
+    # former implementation of calc_hi
+    hi = []
+    for t in t_max:
+        if t <= t_heat:
+            hi.append(1)
+        elif t_heat < t <= t_ext:
+            hi.append((t - t_heat) / (t_ext - t_heat))
+        elif t > t_ext:
+            hi.append(0)
+    return hi
+
+
+def arid_loop(et_o, vwc, s_water, rzd):
+    # former calc_arid formula, evaluated per time step; no evaporative demand means no stress
+    return [1 if e == 0 else 1 - s_water * (1 - min(abs(e), (0.096 / 24) * m * rzd) / abs(e))
+            for e, m in zip(et_o, vwc)]
+
+
+def test_calc_te_equals_the_loop():
+    te = calc_te(TEMPERATURE, t_opt=25, t_base=5, RUE=1.2)
+    assert isinstance(te, pd.Series) and te.index.equals(TEMPERATURE.index)
+    np.testing.assert_allclose(te, te_loop(TEMPERATURE, t_opt=25, t_base=5, RUE=1.2))
+
+
+def test_calc_hi_equals_the_loop():
+    hi = calc_hi(TEMPERATURE, t_heat=30, t_ext=40)
+    assert isinstance(hi, pd.Series) and hi.index.equals(TEMPERATURE.index)
+    np.testing.assert_allclose(hi, hi_loop(TEMPERATURE, t_heat=30, t_ext=40))
+
+
+@pytest.mark.parametrize("series", [list(TEMPERATURE), TEMPERATURE.to_numpy()])
+def test_results_keep_the_input_type(series):
+    for result in (calc_te(series, t_opt=25, t_base=5, RUE=1.2),
+                   calc_hi(series, t_heat=30, t_ext=40)):
+        assert type(result) is type(series)
+        assert len(result) == len(series)
+
+
+def test_missing_values_stay_in_place():
+    # the loops skipped missing values and shifted all later ones; the kernels keep them as nan
+    temperature = TEMPERATURE.copy()
+    temperature.iloc[[3, 100]] = np.nan
+    for result in (calc_te(temperature, t_opt=25, t_base=5, RUE=1.2),
+                   calc_hi(temperature, t_heat=30, t_ext=40)):
+        assert len(result) == len(temperature)
+        assert list(np.flatnonzero(result.isna())) == [3, 100]
+    valid = temperature.dropna()
+    np.testing.assert_allclose(calc_hi(temperature, t_heat=30, t_ext=40).dropna(),
+                               hi_loop(valid, t_heat=30, t_ext=40))
+
+
+def test_input_does_not_change():
+    temperature = TEMPERATURE.to_numpy().copy()
+    calc_te(temperature, t_opt=25, t_base=5, RUE=1.2)
+    calc_hi(temperature, t_heat=30, t_ext=40)
+    np.testing.assert_array_equal(temperature, TEMPERATURE.to_numpy())
+
+
+def test_unsupported_types_are_rejected():
+    with pytest.raises(TypeError, match="t_air"):
+        calc_te((1, 2), t_opt=25, t_base=5, RUE=1.2)
+    with pytest.raises(TypeError, match="t_max"):
+        calc_hi("30", t_heat=30, t_ext=40)
+
+
+def test_calc_arid_is_evaluated_per_time_step():
+    wi = calc_arid(ET_O, VWC, s_water=0.4, rzd=1.5)
+    assert isinstance(wi, pd.Series) and len(wi) == len(ET_O)
+    np.testing.assert_allclose(wi, arid_loop(ET_O, VWC, s_water=0.4, rzd=1.5))
+    assert (wi[ET_O == 0] == 1).all()
+    assert 0.6 <= wi.min() < wi.max() <= 1
+
+
+def test_calc_arid_needs_equal_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        calc_arid(ET_O, VWC.iloc[:-1], s_water=0.4, rzd=1.5)
+
+
+def test_calc_arid_keeps_missing_values():
+    et_o = ET_O.copy()
+    et_o.iloc[50] = np.nan
+    wi = calc_arid(et_o, VWC, s_water=0.4, rzd=1.5)
+    assert list(np.flatnonzero(wi.isna())) == [50]
+
+
+def test_calc_arid_stream_equals_calc_arid():
+    chunks = [slice(0, 100), slice(100, 200), slice(200, None)]
+    stream = calc_arid_stream((ET_O.iloc[c] for c in chunks), (VWC.iloc[c] for c in chunks),
+                              s_water=0.4, rzd=1.5)
+    np.testing.assert_array_equal(np.concatenate(list(stream)),
+                                  calc_arid(ET_O.to_numpy(), VWC.to_numpy(), s_water=0.4, rzd=1.5))
+    with pytest.raises(ValueError, match="number of chunks"):
+        list(calc_arid_stream([ET_O], [VWC, VWC], s_water=0.4, rzd=1.5))
+
+
+def test_calc_growth_combines_the_factors():
+    growth = calc_growth(TEMPERATURE, TEMPERATURE + 5, ET_O, VWC, **PLANT)
+    assert list(growth.columns) == ["ti", "hi", "wi", "growth_factor"]
+    assert growth.index.equals(TEMPERATURE.index)
+    np.testing.assert_allclose(growth["ti"], calc_te(TEMPERATURE, t_opt=25, t_base=5, RUE=1.2))
+    np.testing.assert_allclose(growth["hi"], calc_hi(TEMPERATURE + 5, t_heat=30, t_ext=40))
+    np.testing.assert_allclose(growth["wi"], calc_arid(ET_O, VWC, s_water=0.4, rzd=1.5))
+    np.testing.assert_allclose(growth["growth_factor"], growth["ti"] * growth["hi"] * growth["wi"])
+    with pytest.raises(ValueError, match="same length"):
+        calc_growth(TEMPERATURE, TEMPERATURE.iloc[:-1], ET_O, VWC, **PLANT)
+
+
+@pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+def test_one_plant_transformer_equals_the_chain():
+    # the former Plant_ti -> Plant_hi -> Plant_arid chain and one transformer give the same biomass
+    growth = calc_growth(TEMPERATURE, TEMPERATURE + 5, ET_O, VWC, **PLANT)
+    irradiance = np.clip(np.sin(np.linspace(0, 18 * np.pi, len(TEMPERATURE))), 0, None) * 800
+
+    def biomass(factors):
+        energysystem = solph.EnergySystem(timeindex=TEMPERATURE.index)
+        buses = [solph.Bus(label="bus {0}".format(i)) for i in range(len(factors) + 1)]
+        energysystem.add(*buses)
+        energysystem.add(solph.Source(label="sun", outputs={buses[0]: solph.Flow(
+            fix=irradiance, nominal_value=1)}))
+        for i, factor in enumerate(factors):
+            energysystem.add(solph.Transformer(
+                label="plant {0}".format(i), inputs={buses[i]: solph.Flow()},
+                outputs={buses[i + 1]: solph.Flow()}, conversion_factors={buses[i + 1]: factor}))
+        energysystem.add(solph.Sink(label="biomass", inputs={buses[-1]: solph.Flow()}))
+        model = solph.Model(energysystem)
+        model.solve(solver="cbc")
+        results = solph.processing.results(model)
+        return results[buses[-1], energysystem.groups["biomass"]]["sequences"]["flow"].to_numpy()
+
+    chain = biomass([growth["ti"].to_numpy(), growth["hi"].to_numpy(), growth["wi"].to_numpy()])
+    np.testing.assert_allclose(biomass([growth["growth_factor"].to_numpy()]), chain, atol=1e-9)
+    assert chain.sum() > 0
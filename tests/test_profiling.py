@@ -0,0 +1,96 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from owefe import profiling
+from owefe.profiling import Profiler
+
+
+def record(name, stack, duration):
+    return {"name": name, "stack": stack, "pid": 1, "start": 0.0, "duration": duration,
+            "rss_start": 0.0, "rss_end": 0.0, "rss_peak": 0.0, "children_peak_rss": 0.0}
+
+
+def test_disabled_phases_record_nothing():
+    profiler = Profiler()
+    with profiler.phase("build") as first, profiler.phase("solve") as second:
+        pass
+    assert first is second
+    assert profiler.records == []
+
+
+def test_phases_are_nested():
+    profiler = Profiler(enabled=True)
+    with profiler.phase("run"):
+        with profiler.phase("build"):
+            assert profiler.open_phases() == ["run", "build"]
+        with profiler.phase("solve"):
+            time.sleep(0.01)
+    assert [(r["name"], r["stack"]) for r in profiler.records] == [
+        ("build", ["run"]), ("solve", ["run"]), ("run", [])]
+    durations = {r["name"]: r["duration"] for r in profiler.records}
+    assert durations["run"] >= durations["build"] + durations["solve"]
+    assert durations["solve"] >= 0.01
+    assert profiler.open_phases() == []
+
+
+def test_failed_phases_are_recorded():
+    profiler = Profiler(enabled=True)
+    with pytest.raises(RuntimeError):
+        with profiler.phase("run"), profiler.phase("solve"):
+            raise RuntimeError("infeasible")
+    assert [r["name"] for r in profiler.records] == ["solve", "run"]
+    assert profiler.open_phases() == []
+
+
+def test_folded_stacks_report_self_time():
+    profiler = Profiler()
+    profiler.extend([record("build", ["run"], 1.0), record("solve", ["run"], 2.5),
+                     record("solve", ["run"], 0.5), record("run", [], 5.0)])
+    assert sorted(profiler.folded()) == ["run 1000000", "run;build 1000000", "run;solve 3000000"]
+
+
+def test_worker_records_are_nested_below_the_open_phases(tmp_path):
+    worker = Profiler(enabled=True)
+    with worker.phase("scenario a"):
+        pass
+    parent = Profiler(enabled=True)
+    with parent.phase("scenarios"):
+        parent.extend(worker.drain(), stack=parent.open_phases())
+    assert worker.records == []
+    assert [(r["name"], r["stack"]) for r in parent.records] == [("scenario a", ["scenarios"]),
+                                                                 ("scenarios", [])]
+    parent.write_json(str(tmp_path / "profile.json"))
+    parent.write_folded(str(tmp_path / "profile.folded"))
+    with open(tmp_path / "profile.json") as f:
+        assert [phase["name"] for phase in json.load(f)["phases"]] == ["scenario a", "scenarios"]
+    lines = (tmp_path / "profile.folded").read_text().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["scenarios;scenario a", "scenarios"]
+
+
+def test_sampler_records_the_peak_memory():
+    profiler = Profiler(enabled=True, sample_interval=0.005)
+    with profiler.phase("allocate"):
+        values = np.ones(50 * 2 ** 20 // 8)  # 50 MB
+        time.sleep(0.05)
+        del values
+    profiler.disable()
+    allocate = profiler.records[0]
+    assert allocate["rss_peak"] >= allocate["rss_start"] + 40
+    assert allocate["rss_peak"] >= allocate["rss_end"]
+
+
+def test_memory_is_none_without_resource_and_psutil(monkeypatch):
+    # Windows has no resource module
+    monkeypatch.setattr(profiling, "resource", None)
+    monkeypatch.setattr(profiling, "psutil", None)
+    profiler = Profiler(enabled=True, sample_interval=0.005)
+    with profiler.phase("run"):
+        time.sleep(0.02)
+    profiler.disable()
+    run = profiler.records[0]
+    assert run["duration"] >= 0.02
+    assert [run[field] for field in ("rss_start", "rss_end", "rss_peak", "children_peak_rss")] == [
+        None, None, None, None]
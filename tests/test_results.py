@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.results import (load_results, node_sequences, results_table, run_directory,
+                           save_results, scalars_frame, sequences_frame)
+
+pytestmark = pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=24, freq="H")
+PRICE = 10 + 5 * np.sin(2 * np.pi * (np.arange(24) - 9) / 24)
+
+
+@pytest.fixture(scope="module")
+def energysystem():
+    # grid supply at a varying price, a fixed demand and a battery
+    energysystem = solph.EnergySystem(timeindex=TIMEINDEX)
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bel)
+    energysystem.add(solph.Source(label="grid", outputs={bel: solph.Flow(variable_costs=PRICE)}))
+    energysystem.add(solph.Sink(label="demand", inputs={bel: solph.Flow(fix=np.ones(24),
+                                                                        nominal_value=2)}))
+    energysystem.add(solph.components.GenericStorage(
+        label="battery", nominal_storage_capacity=10, inputs={bel: solph.Flow(nominal_value=2)},
+        outputs={bel: solph.Flow(nominal_value=2)}, loss_rate=0.01, initial_storage_level=0.5))
+    model = solph.Model(energysystem)
+    model.solve(solver="cbc")
+    energysystem.results["main"] = solph.processing.results(model)
+    energysystem.results["meta"] = solph.processing.meta_results(model)
+    return energysystem
+
+
+def test_sequences_frame_equals_the_node_views(energysystem):
+    results = energysystem.results["main"]
+    sequences = sequences_frame(results)
+    assert sequences.index.equals(TIMEINDEX)
+    for label in ("electricity", "battery"):
+        view = solph.views.node(results, label)["sequences"]
+        selected = node_sequences(sequences, label)
+        assert len(selected.columns) == len(view.columns)
+        # the views name the columns ((from, to), variable) with to "None" for node variables
+        expected = {"{0}|{1}|{2}".format(source, "" if target == "None" else target, variable):
+                    view[(source, target), variable].to_numpy()
+                    for (source, target), variable in view.columns}
+        for column in selected.columns:
+            np.testing.assert_array_equal(selected[column].to_numpy(), expected[column])
+    assert "battery||storage_content" in sequences.columns
+
+
+def test_scalars_frame(energysystem):
+    scalars = scalars_frame(energysystem.results["main"])
+    assert list(scalars.columns) == ["from", "to", "variable", "value"]
+    assert (scalars["from"] == "battery").any()
+
+
+def test_runs_are_stored_in_directories_of_their_own(energysystem, tmp_path):
+    first = save_results(energysystem, base_dir=str(tmp_path))
+    second = save_results(energysystem, base_dir=str(tmp_path))
+    assert first != second
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in (first, second))
+    assert run_directory("fixed", base_dir=str(tmp_path)) == str(tmp_path / "fixed")
+
+
+def test_results_table(energysystem):
+    pytest.importorskip("pyarrow")
+    results, meta = energysystem.results["main"], energysystem.results["meta"]
+    table = results_table(results, meta, {"scenario": "a"})
+    sequences = sequences_frame(energysystem.results["main"])
+    assert table.column_names == ["timestamp"] + list(sequences.columns)
+    field = table.schema.field("battery||storage_content")
+    assert str(field.type) == "double"
+    assert field.metadata == {b"from": b"battery", b"to": b"", b"variable": b"storage_content"}
+
+
+def test_stored_results_round_trip(energysystem, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = save_results(energysystem, run_id="run", base_dir=str(tmp_path),
+                        run_metadata={"scenario": "a"})
+    sequences, scalars, meta = load_results(path)
+    expected = sequences_frame(energysystem.results["main"])
+    pd.testing.assert_frame_equal(sequences, expected, check_names=False, check_freq=False)
+    pd.testing.assert_frame_equal(scalars, scalars_frame(energysystem.results["main"]),
+                                  check_dtype=False)
+    assert meta["objective"] == pytest.approx(energysystem.results["meta"]["objective"])
+    assert meta["run"] == {"scenario": "a"}
+    # only the requested columns are read
+    selected, _, _ = load_results(path, columns=["grid|electricity|flow"])
+    assert list(selected.columns) == ["grid|electricity|flow"]
+    np.testing.assert_array_equal(selected["grid|electricity|flow"],
+                                  expected["grid|electricity|flow"])
@@ -0,0 +1,102 @@
+import functools
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.rolling_horizon import solve_rolling_horizon
+
+pytestmark = pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=72, freq="H")
+HOURS = np.arange(len(TIMEINDEX))
+# distinct prices, cheap at night, and a demand peak in the evening
+PRICE = 10 + 5 * np.sin(2 * np.pi * (HOURS - 9) / 24) + 0.01 * HOURS
+DEMAND = 1 + 0.5 * (HOURS % 24 >= 17)
+
+
+def build(steps=slice(None), balanced=False, initial_storage_level=0):
+    energysystem = solph.EnergySystem(timeindex=TIMEINDEX[steps])
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bel)
+    energysystem.add(solph.Source(label="grid",
+                                  outputs={bel: solph.Flow(variable_costs=PRICE[steps])}))
+    energysystem.add(solph.Sink(label="demand",
+                                inputs={bel: solph.Flow(fix=DEMAND[steps], nominal_value=1)}))
+    energysystem.add(solph.components.GenericStorage(
+        label="battery",
+        nominal_storage_capacity=10,
+        inputs={bel: solph.Flow(nominal_value=2)},
+        outputs={bel: solph.Flow(nominal_value=2)},
+        loss_rate=0.001,
+        initial_storage_level=initial_storage_level,
+        balanced=balanced,
+    ))
+    return energysystem
+
+
+def grid_costs(results, energysystem):
+    nodes = {str(nd.label): nd for nd in energysystem.nodes}
+    flow = results[nodes["grid"], nodes["electricity"]]["sequences"]["flow"].to_numpy()
+    return float(flow @ PRICE), flow
+
+
+def test_stitched_result_equals_full_solve():
+    full_system = build()
+    model = solph.Model(full_system)
+    model.solve(solver="cbc")
+    full = solph.processing.results(model)
+
+    energysystem = build()
+    results, window_stats = solve_rolling_horizon(build, len(TIMEINDEX), window=24,
+                                                  overlap=len(TIMEINDEX), energysystem=energysystem)
+    nodes = {str(nd.label): nd for nd in energysystem.nodes}
+    full_nodes = {str(nd.label): nd for nd in full_system.nodes}
+    assert len(window_stats) == 3
+    assert grid_costs(results, energysystem)[0] == pytest.approx(grid_costs(full, full_system)[0])
+    np.testing.assert_allclose(results[nodes["battery"], None]["sequences"]["storage_content"],
+                               full[full_nodes["battery"], None]["sequences"]["storage_content"],
+                               atol=1e-6)
+
+
+def test_meta_objective_counts_the_kept_steps_only():
+    energysystem = build()
+    results, window_stats = solve_rolling_horizon(build, len(TIMEINDEX), window=24, overlap=24,
+                                                  energysystem=energysystem)
+    objective = energysystem.results["meta"]["objective"]
+    assert objective == pytest.approx(grid_costs(results, energysystem)[0])
+    assert window_stats["objective"].sum() > objective + 1
+
+
+def test_balanced_storages_end_at_their_initial_level():
+    balanced_build = functools.partial(build, balanced=True, initial_storage_level=0.5)
+    energysystem = balanced_build()
+    results, _ = solve_rolling_horizon(balanced_build, len(TIMEINDEX), window=24, overlap=6,
+                                       energysystem=energysystem)
+    nodes = {str(nd.label): nd for nd in energysystem.nodes}
+    content = results[nodes["battery"], None]["sequences"]["storage_content"]
+    assert content.iloc[-1] == pytest.approx(5)
+
+
+def test_short_look_ahead_costs_more():
+    # without look-ahead, no window charges the battery at night for the evening of the next one
+    full_costs = grid_costs(*_solve(overlap=len(TIMEINDEX)))[0]
+    assert grid_costs(*_solve(overlap=0))[0] > full_costs + 1e-6
+
+
+def test_window_stats_report_the_memory_of_each_window():
+    _, window_stats = solve_rolling_horizon(build, len(TIMEINDEX), window=24, overlap=6,
+                                            sample_interval=0.01)
+    assert list(window_stats["start"]) == [0, 24, 48]
+    assert list(window_stats["time_steps"]) == [30, 30, 24]
+    assert (window_stats["peak_rss"] > 0).all()
+    assert (window_stats["wall_time"] > 0).all()
+
+
+def _solve(overlap):
+    energysystem = build()
+    results, _ = solve_rolling_horizon(build, len(TIMEINDEX), window=12, overlap=overlap,
+                                       energysystem=energysystem)
+    return results, energysystem
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.scenario_runner import run_scenarios
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=24, freq="H")
+
+
+def build(supply=1.0, efficiency=0.35):
+    # a fixed gas supply converted to electricity; fully determined, so no solver is needed
+    energysystem = solph.EnergySystem(timeindex=TIMEINDEX)
+    bgas = solph.Bus(label="gas")
+    bel = solph.Bus(label="electricity")
+    energysystem.add(bgas, bel)
+    energysystem.add(solph.Source(label="gas supply", outputs={bgas: solph.Flow(
+        fix=np.full(len(TIMEINDEX), supply), nominal_value=10, variable_costs=30)}))
+    energysystem.add(solph.Transformer(label="chp", inputs={bgas: solph.Flow()},
+                                       outputs={bel: solph.Flow()},
+                                       conversion_factors={bel: efficiency}))
+    energysystem.add(solph.Sink(label="demand", inputs={bel: solph.Flow()}))
+    return energysystem
+
+
+def electricity(energysystem):
+    # metric of the scenarios
+    return {"electricity": 1.0}
+
+
+SCENARIOS = {"low": {"supply": 1.0}, "high": {"supply": 2.0, "efficiency": 0.4}}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_scenarios(processes):
+    table = run_scenarios(build, SCENARIOS, processes=processes, metrics=electricity)
+    assert list(table.index) == ["low", "high"]
+    assert table["error"].isna().all()
+    assert table.loc["low", "supply"] == 1.0 and table.loc["high", "efficiency"] == 0.4
+    assert table.loc["low", "objective"] == pytest.approx(30 * 10 * 24)
+    assert table.loc["high", "chp|electricity"] == pytest.approx(2 * 10 * 24 * 0.4)
+    assert (table["electricity"] == 1.0).all()
+
+
+def test_failed_scenarios_are_reported():
+    table = run_scenarios(build, [{"supply": 1.0}, {"unknown": 1}], processes=1)
+    assert table.loc[0, "error"] is None
+    assert table.loc[1, "error"].startswith("TypeError")
+
+
+@pytest.mark.parametrize("name", ["objective", "error", "scenario", "worker"])
+def test_parameters_named_like_row_fields_are_rejected(name):
+    with pytest.raises(ValueError, match=name):
+        run_scenarios(build, {"bad": {name: 1}}, processes=1)
+
+
+def test_parameters_named_like_metrics_are_rejected():
+    def build_with_metric_name(supply=1.0, electricity=0):
+        return build(supply)
+
+    with pytest.raises(ValueError, match="electricity"):
+        run_scenarios(build_with_metric_name, {"bad": {"electricity": 1}}, processes=1,
+                      metrics=electricity)
+
+
+def objective(energysystem):
+    # metric named like a column of the result table
+    return {"objective": 0.0}
+
+
+def test_metrics_named_like_row_fields_are_rejected():
+    with pytest.raises(ValueError, match="objective"):
+        run_scenarios(build, SCENARIOS, processes=1, metrics=objective)
+
+
+def build_with_flow_name(supply=1.0, **parameters):
+    return build(supply)
+
+
+def test_parameters_named_like_flow_sums_stop_the_pool():
+    scenarios = [{"chp|electricity": 1}] * 8
+    with pytest.raises(ValueError, match=r"chp\|electricity"):
+        run_scenarios(build_with_flow_name, scenarios, processes=2)
@@ -0,0 +1,65 @@
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+
+import pytest
+
+from owefe.scenario_store import ScenarioStore
+from owefe.specs.digester import DigesterDesign
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScenarioStore(str(tmp_path / "scenarios.sqlite"))
+    yield store
+    store.close()
+
+
+def add_runs(store, worker, n):
+    # records n runs from one process; the store is sent to the worker and reconnects there
+    return [store.add_run("tibnine", {"retention_time": 10 * worker + i, "worker": worker},
+                          meta={"objective": float(i)}, metrics={"methane": float(10 * worker + i)})
+            for i in range(n)]
+
+
+def test_top_runs(store):
+    for retention_time in (20, 30, 40):
+        store.add_run("tibnine", {"retention_time": retention_time, "digester": "CSTR"},
+                      metrics={"methane": retention_time * 1.5})
+    store.add_run("hegelbach", {"retention_time": 50, "digester": "KT"}, metrics={"methane": 100.0})
+
+    top = store.top("methane", n=2)
+    assert list(top["methane"]) == [100.0, 60.0]
+    assert list(top["scenario"]) == ["hegelbach", "tibnine"]
+    assert list(top["digester"]) == ["KT", "CSTR"]
+    assert list(store.top("methane", n=1, ascending=True)["retention_time"]) == [20]
+    assert list(store.top("methane", scenario="tibnine")["methane"]) == [60.0, 45.0, 30.0]
+    assert store.top("unknown").empty
+
+
+def test_designs_and_objectives_are_recorded(store):
+    design = DigesterDesign(diameter=10.0, volume=800.0, conversion_factor=0.1, surface_area=400.0,
+                            active_volume=700.0, olr=2.0, volumetric_flow=25.0)
+    run_id = store.add_run("tibnine", {"retention_time": 30}, design=design,
+                           meta={"objective": 12.5}, results_path="runs/1")
+    assert list(store.top("design.volume")["run_id"]) == [run_id]
+    runs = store.query("SELECT objective, results_path FROM runs WHERE run_id = ?", (run_id,))
+    assert runs.iloc[0].tolist() == [12.5, "runs/1"]
+
+
+def test_concurrent_writers(store):
+    with ProcessPoolExecutor(4) as executor:
+        run_ids = sum(executor.map(add_runs, [store] * 4, range(4), [25] * 4), [])
+    assert len(set(run_ids)) == 100
+    assert store.query("SELECT COUNT(*) AS n FROM runs")["n"][0] == 100
+    assert store.query("SELECT COUNT(*) AS n FROM metrics")["n"][0] == 100
+    top = store.top("methane", n=3)
+    assert list(top["methane"]) == [54.0, 53.0, 52.0]
+    assert list(top["worker"]) == [3, 3, 3]
+
+
+def test_store_is_picklable(store):
+    store.add_run("tibnine", {"retention_time": 30}, metrics={"methane": 1.0})
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.path == store.path
+    assert list(copy.top("methane")["retention_time"]) == [30]
+    copy.close()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.scenarios import fit_profiles, make_timeindex
+
+
+@pytest.fixture
+def hourly_day():
+    return pd.DataFrame({"flow": np.arange(24, dtype=float), "temperature": np.linspace(5, 28, 24)})
+
+
+def test_make_timeindex():
+    timeindex = make_timeindex("2020-01-01", "1W", "3h")
+    assert len(timeindex) == 56
+    assert timeindex[-1] == pd.Timestamp("2020-01-07 21:00")
+    assert len(make_timeindex("2020-01-01", "1Y", "1h")) == 8784
+    assert len(make_timeindex("2020-01-01", 48, "1h")) == 48
+
+
+def test_fit_profiles_equal_step(hourly_day):
+    timeindex = make_timeindex("2020-01-01", 60, "1h")
+    profiles = fit_profiles(hourly_day, timeindex)
+    assert profiles.index.equals(timeindex)
+    np.testing.assert_array_equal(profiles["flow"], np.arange(60) % 24)
+
+
+def test_fit_profiles_coarser_step(hourly_day):
+    timeindex = make_timeindex("2020-01-01", "2D", "3h")
+    profiles = fit_profiles(hourly_day, timeindex)
+    assert profiles.index.equals(timeindex)
+    expected = np.tile(np.arange(24, dtype=float).reshape(8, 3).mean(axis=1), 2)
+    np.testing.assert_allclose(profiles["flow"], expected)
+
+
+def test_fit_profiles_finer_step(hourly_day):
+    timeindex = make_timeindex("2020-01-01", "1W", "15min")
+    profiles = fit_profiles(hourly_day, timeindex)
+    assert len(profiles) == 672
+    assert profiles.index.equals(timeindex)
+    np.testing.assert_array_equal(profiles["flow"], np.repeat(np.arange(168) % 24, 4))
+    # rates keep their unit: the means over the hours are those of the data
+    hourly = profiles.resample("1h").mean()
+    np.testing.assert_allclose(hourly["temperature"], np.tile(hourly_day["temperature"], 7))
+
+
+def test_fit_profiles_finer_input_step():
+    # a quarter-hourly series fitted to an hourly model
+    data = pd.Series(np.arange(96, dtype=float))
+    profiles = fit_profiles(data, make_timeindex("2020-01-01", 24, "1h"), freq="15min")
+    np.testing.assert_allclose(profiles, np.arange(96).reshape(24, 4).mean(axis=1))
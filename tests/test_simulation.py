@@ -0,0 +1,105 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof import solph
+
+from owefe.simulation import propagate_flows, simulate
+
+requires_cbc = pytest.mark.skipif(shutil.which("cbc") is None, reason="requires the CBC solver")
+
+TIMEINDEX = pd.date_range("2020-01-01", periods=48, freq="H")
+SLUDGE = 1 + 0.5 * np.sin(np.linspace(0, 4 * np.pi, 48))
+METHANE_YIELD = np.linspace(0.2, 0.3, 48)
+
+
+def build(storage=False, demand=None, export=None):
+    # sludge -> digester -> methane -> chp -> electricity and heat, all fixed by the sludge supply
+    energysystem = solph.EnergySystem(timeindex=TIMEINDEX)
+    bsludge, bmethane = solph.Bus(label="sludge"), solph.Bus(label="methane")
+    bel, bth = solph.Bus(label="electricity"), solph.Bus(label="heat")
+    energysystem.add(bsludge, bmethane, bel, bth)
+    energysystem.add(solph.Source(label="sludge supply", outputs={bsludge: solph.Flow(
+        fix=SLUDGE, nominal_value=100, variable_costs=0.5)}))
+    energysystem.add(solph.Transformer(label="digester", inputs={bsludge: solph.Flow()},
+                                       outputs={bmethane: solph.Flow()},
+                                       conversion_factors={bmethane: METHANE_YIELD}))
+    energysystem.add(solph.Transformer(
+        label="chp", inputs={bmethane: solph.Flow(variable_costs=0.1)},
+        outputs={bel: solph.Flow(variable_costs=-0.2), bth: solph.Flow()},
+        conversion_factors={bel: 0.35, bth: 0.5}))
+    if demand is None:
+        energysystem.add(solph.Sink(label="electricity export",
+                                    inputs={bel: solph.Flow(**(export or {}))}))
+    else:
+        energysystem.add(solph.Sink(label="electricity demand",
+                                    inputs={bel: solph.Flow(fix=demand, nominal_value=1)}))
+    energysystem.add(solph.Sink(label="excess heat", inputs={bth: solph.Flow()}))
+    if storage:
+        energysystem.add(solph.components.GenericStorage(
+            label="heat storage", nominal_storage_capacity=10,
+            inputs={bth: solph.Flow(nominal_value=5)}, outputs={bth: solph.Flow(nominal_value=5)}))
+    return energysystem
+
+
+def flows_by_label(results):
+    return {(str(o.label), None if i is None else str(i.label)): values["sequences"]
+            for (o, i), values in results.items()}
+
+
+def solve(energysystem):
+    model = solph.Model(energysystem)
+    model.solve(solver="cbc")
+    return solph.processing.results(model), model.objective()
+
+
+def test_determined_system_is_propagated():
+    flows = propagate_flows(build())
+    assert flows is not None
+    by_label = {(str(o.label), str(i.label)): values for (o, i), values in flows.items()}
+    methane = SLUDGE * 100 * METHANE_YIELD
+    np.testing.assert_allclose(by_label["digester", "methane"], methane)
+    np.testing.assert_allclose(by_label["chp", "electricity"], methane * 0.35)
+    np.testing.assert_allclose(by_label["heat", "excess heat"], methane * 0.5)
+
+
+@requires_cbc
+def test_simulation_equals_the_optimization():
+    energysystem = build()
+    results = simulate(energysystem)
+    assert energysystem.results["meta"]["solver"]["Termination condition"] == "simulated"
+    expected, objective = solve(build())
+    assert energysystem.results["meta"]["objective"] == pytest.approx(objective)
+    simulated, optimized = flows_by_label(results), flows_by_label(expected)
+    assert simulated.keys() == optimized.keys()
+    for key, sequences in simulated.items():
+        np.testing.assert_allclose(sequences["flow"].to_numpy(), optimized[key]["flow"].to_numpy(),
+                                   atol=1e-6, err_msg=str(key))
+        assert sequences.index.equals(TIMEINDEX)
+
+
+@requires_cbc
+def test_storages_are_left_to_the_solver():
+    energysystem = build(storage=True)
+    assert propagate_flows(energysystem) is None
+    simulate(energysystem)
+    assert energysystem.results["meta"]["solver"]["Termination condition"] != "simulated"
+    assert energysystem.results["meta"]["objective"] == pytest.approx(solve(build(storage=True))[1])
+
+
+def test_inconsistent_fixed_flows_are_left_to_the_solver():
+    # a fixed electricity demand next to the fixed supply over-determines the electricity bus
+    assert propagate_flows(build(demand=np.ones(48))) is None
+
+
+def test_flows_with_summed_limits_are_left_to_the_solver():
+    # the export of about 420 kWh in two days violates the summed_max of 10 kWh, although every
+    # time step is within the bounds of the flow
+    export = {"nominal_value": 1, "max": 100, "summed_max": 10}
+    assert propagate_flows(build(export=export)) is None
+
+
+def test_flows_with_gradients_are_left_to_the_solver():
+    export = {"nominal_value": 100, "positive_gradient": {"ub": 0.01, "costs": 0}}
+    assert propagate_flows(build(export=export)) is None
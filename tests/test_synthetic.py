@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.synthetic import COLUMNS, generate, read_inputs, read_settings, write_inputs
+
+
+def test_generate_is_deterministic():
+    first = generate("tibnine", start="2020-01-01", years=1, seed=7)
+    pd.testing.assert_frame_equal(first, generate("tibnine", start="2020-01-01", years=1, seed=7))
+    other = generate("tibnine", years=1, seed=8)
+    assert not np.allclose(first["temperature"], other["temperature"])
+    assert list(first.columns) == list(COLUMNS)
+    assert len(first) == 8784
+
+
+def test_more_years_keep_the_first_ones():
+    one = generate("hegelbach", start="2018-01-01", years=1, seed=3)
+    two = generate("hegelbach", start="2018-01-01", years=2, seed=3)
+    pd.testing.assert_frame_equal(one, two.iloc[:len(one)])
+    assert two.index.is_unique and two.index.is_monotonic_increasing
+
+
+def test_pev_is_accumulated_like_era5():
+    pev = generate("hegelbach", start="2018-01-01", years=1, seed=3)["pev"]
+    assert -2.5e-3 < pev.mean() < -1e-3
+    assert -1.5e-2 < pev.min() < -5e-3
+    # accumulated from 00 UTC: decreasing within the day, the value at 00 UTC closes the previous
+    # day
+    day = pev["2018-06-01 01:00":"2018-06-02 00:00"]
+    assert (np.diff(day) <= 0).all()
+    assert pev["2018-06-02 01:00"] > day.iloc[-1] / 10
+
+
+def test_coarser_steps_average_rates():
+    hourly = generate("tibnine", years=1, freq="1h", seed=1)
+    three_hourly = generate("tibnine", years=1, freq="3h", seed=1)
+    assert len(three_hourly) == len(hourly) // 3
+    np.testing.assert_allclose(three_hourly["ghi"].iloc[:8],
+                               hourly["ghi"].iloc[:24].to_numpy().reshape(8, 3).mean(1))
+
+
+@pytest.mark.parametrize("freq", ["2D", "1W", "1M", "7min", "90min"])
+def test_unsupported_steps_are_rejected(freq):
+    with pytest.raises(ValueError, match=freq):
+        generate("tibnine", freq=freq)
+
+
+def test_write_and_read_inputs(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "inputs.parquet")
+    rows = write_inputs(path, sites=["tibnine", "hegelbach"], years=1, freq="15min", seed=1,
+                        columns=["ghi", "t_air"])
+    assert rows == 2 * 35136
+    assert read_settings(path)["freq"] == "15min"
+    data = read_inputs(path, site="hegelbach")
+    expected = generate("hegelbach", years=1, freq="15min", seed=1, columns=["ghi", "t_air"])
+    pd.testing.assert_frame_equal(data, expected, check_freq=False)
+    # the first site is read by default
+    np.testing.assert_array_equal(read_inputs(path, columns=["ghi"])["ghi"],
+                                  generate("tibnine", years=1, freq="15min", seed=1)["ghi"])
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from owefe.specs.plant import calc_te
+from owefe.specs.timeseries import to_array, wrap_like
+
+VALUES = np.linspace(0, 30, 24)
+INDEX = pd.date_range("2020-01-01", periods=24, freq="H")
+
+
+def test_arrays_and_series_are_not_copied():
+    assert np.shares_memory(to_array(VALUES, "t_air"), VALUES)
+    series = pd.Series(VALUES, index=INDEX)
+    assert np.shares_memory(to_array(series, "t_air"), series.to_numpy())
+
+
+def test_other_dtypes_and_lists_are_converted():
+    values = to_array(VALUES.astype(np.float32), "t_air")
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(to_array(list(VALUES), "t_air"), VALUES)
+    assert to_array(VALUES, "t_air", dtype=np.float32).dtype == np.float32
+
+
+def test_unsupported_types_name_the_argument():
+    with pytest.raises(TypeError, match="'ghi'"):
+        to_array(tuple(VALUES), "ghi")
+
+
+def test_results_are_wrapped_like_the_input():
+    series = pd.Series(VALUES, index=INDEX)
+    wrapped = wrap_like(VALUES * 2, series)
+    assert isinstance(wrapped, pd.Series) and wrapped.index.equals(INDEX)
+    assert wrap_like(VALUES, list(VALUES)) == list(VALUES)
+    assert wrap_like(VALUES, VALUES) is VALUES
+
+
+def test_data_arrays_keep_their_coordinates():
+    xr = pytest.importorskip("xarray")
+    t_air = xr.DataArray(VALUES, coords={"time": INDEX}, dims="time", name="t2m")
+    assert np.shares_memory(to_array(t_air, "t_air"), t_air.values)
+    te = calc_te(t_air, t_opt=25, t_base=5, RUE=1.2)
+    assert isinstance(te, xr.DataArray)
+    assert te.dims == ("time",) and te.indexes["time"].equals(INDEX)
+    np.testing.assert_allclose(te.values, calc_te(VALUES, t_opt=25, t_base=5, RUE=1.2))
+    np.testing.assert_array_equal(t_air.values, VALUES)